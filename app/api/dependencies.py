@@ -1,13 +1,16 @@
 from typing import Annotated
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.infrastructure.database.session import get_db
+from app.infrastructure.database.session import get_db, replica_engine, ReplicaSessionLocal
+from app.infrastructure.database.read_your_writes import has_recent_write
 from app.core.repositories import UserRepository, EmailRepo, TokenRepository,TravellerProfileInterface, UserRolesPermissionsInterface, KycRepo, OnboardRepo, GuideProfileInterface, HostProfileInterface, PropertyRepo, UserManagementRepoInterface, TravellerHomePageRepositoryInterface
 from app.infrastructure.redis.redis_client import RedisClient
 from app.infrastructure.config.jwt_settings_adaptor import get_core_jwt_settings
 from app.infrastructure.config.redis_settings_adaptor import get_core_redis_settings
 from app.infrastructure.config.google_settings_adaptor import get_core_google_settings
-from app.core.entities import JWTSettingsEntity, RedisSettingsEntity, GoogleSettingsEntity
+from app.infrastructure.config.password_hashing_settings_adaptor import get_core_password_hashing_settings
+from app.infrastructure.password_hashing import PasswordHashingExecutor, get_password_hashing_executor
+from app.core.entities import JWTSettingsEntity, RedisSettingsEntity, GoogleSettingsEntity, PasswordHashingSettingsEntity
 from app.core.redis.redis_repo import RedisRepoInterface
 from app.infrastructure.repositories import TravellerProfileImpl, UserRolesPermissionsImpl, KycRepoImpl, OnboardRepoImpl, GuideProfileImpl, HostProfileImpl, SQLAlchemyUserRepository, CeleryEmailRepo, TokenRepositoryImpl, PropertyRepoImpl, UserManagementRepoImpl, HomePageRepositoryImpl
 
@@ -17,49 +20,79 @@ from app.infrastructure.repositories import TravellerProfileImpl, UserRolesPermi
 '''
 
 DbDep = Annotated[AsyncSession, Depends(get_db)]
-async def get_user_roles_permissions(
+
+async def get_read_db(
+        request: Request,
         db: DbDep
+):
+    """Session for read only queries, on the replica unless the user wrote something moments ago"""
+    user_id = getattr(request.state, 'user_id', None)
+    if replica_engine is None or (user_id and await has_recent_write(str(user_id))):
+        yield db
+        return
+    async with ReplicaSessionLocal() as session:
+        yield session
+ReadDbDep = Annotated[AsyncSession, Depends(get_read_db)]
+
+def get_redis_client(
+        redis_settings: Annotated[RedisSettingsEntity, Depends(get_core_redis_settings)]
+)->RedisClient:
+    return RedisClient(redis_settings)
+RedisRepoDep = Annotated[RedisRepoInterface, Depends(get_redis_client)]
+
+async def get_user_roles_permissions(
+        db: DbDep,
+        redis_repo: RedisRepoDep
 )->UserRolesPermissionsInterface:
-    return UserRolesPermissionsImpl(db)
+    return UserRolesPermissionsImpl(db, redis_repo)
+
+def get_password_hasher(
+        password_hashing_settings: Annotated[PasswordHashingSettingsEntity, Depends(get_core_password_hashing_settings)]
+)->PasswordHashingExecutor:
+    return get_password_hashing_executor(password_hashing_settings)
 
 async def get_user_repository(
         db: DbDep,
-        google_client: Annotated[GoogleSettingsEntity, Depends(get_core_google_settings)]
+        google_client: Annotated[GoogleSettingsEntity, Depends(get_core_google_settings)],
+        password_hasher: Annotated[PasswordHashingExecutor, Depends(get_password_hasher)]
 )-> UserRepository:
-    return SQLAlchemyUserRepository(db, google_client)
+    return SQLAlchemyUserRepository(db, google_client, password_hasher)
 
 async def get_guide_profile_repository(
-        db:DbDep
+        db:DbDep,
+        redis_repo: RedisRepoDep,
+        read_db: ReadDbDep
 )->GuideProfileInterface:
-    return GuideProfileImpl(db)
+    return GuideProfileImpl(db, redis_repo, read_db)
 
 async def get_host_profile_repository(
-        db:DbDep
+        db:DbDep,
+        redis_repo: RedisRepoDep,
+        read_db: ReadDbDep
 )->HostProfileInterface:
-    return HostProfileImpl(db)
+    return HostProfileImpl(db, redis_repo, read_db)
 
 async def get_onboard_repository(
         db:DbDep,
+        redis_repo: RedisRepoDep
 )->OnboardRepo:
-    return OnboardRepoImpl(db)
+    return OnboardRepoImpl(db, redis_repo)
 
 async def get_property_repository(
         db: DbDep,
+        redis_repo: RedisRepoDep
 )->PropertyRepo:
-    return PropertyRepoImpl(db)
+    return PropertyRepoImpl(db, redis_repo)
 
 def get_email_repository()->EmailRepo:
     return CeleryEmailRepo()
 
-def get_redis_client(
-        redis_settings: Annotated[RedisSettingsEntity, Depends(get_core_redis_settings)]
-)->RedisClient:
-    return RedisClient(redis_settings)
-
 async def get_traveller_profile_repo(
-        db: DbDep
+        db: DbDep,
+        redis_repo: RedisRepoDep,
+        read_db: ReadDbDep
 )->TravellerProfileInterface:
-    return TravellerProfileImpl(db)
+    return TravellerProfileImpl(db, redis_repo, read_db)
 
 async def get_kyc_repo(
         db: DbDep
@@ -67,21 +100,24 @@ async def get_kyc_repo(
     return KycRepoImpl(db)
 
 async def get_user_management_repo(
-        db: DbDep
+        db: DbDep,
+        redis_repo: RedisRepoDep,
+        read_db: ReadDbDep
 )->UserManagementRepoInterface:
-    return UserManagementRepoImpl(db)
+    return UserManagementRepoImpl(db, redis_repo, read_db)
 
 async def get_home_page_repository(
-        db: DbDep
+        db: DbDep,
+        redis_repo: RedisRepoDep,
+        read_db: ReadDbDep
 )->TravellerHomePageRepositoryInterface:
-    return HomePageRepositoryImpl(db)
+    return HomePageRepositoryImpl(db, redis_repo, read_db)
 
 PropertyRepoDepo = Annotated[PropertyRepo, Depends(get_property_repository)]
 HostProfileDep = Annotated[HostProfileInterface, Depends(get_host_profile_repository)]
 GuideProfileDep = Annotated[GuideProfileInterface, Depends(get_guide_profile_repository)]
 UserRepoDep = Annotated[UserRepository, Depends(get_user_repository)]
 EmailRepoDep = Annotated[EmailRepo, Depends(get_email_repository)]
-RedisRepoDep = Annotated[RedisRepoInterface, Depends(get_redis_client)]
 TravellerProfileDep = Annotated[TravellerProfileInterface, Depends(get_traveller_profile_repo)]
 KycRepoDep = Annotated[KycRepo, Depends(get_kyc_repo)]
 OnboardRepoDep = Annotated[OnboardRepo, Depends(get_onboard_repository)]
@@ -93,4 +129,5 @@ def get_token_repository(
         redis_client: RedisRepoDep
 )->TokenRepository:
     return TokenRepositoryImpl(jwt_settings, redis_client)
-TokenRepoDep = Annotated[TokenRepository, Depends(get_token_repository)]
\ No newline at end of file
+TokenRepoDep = Annotated[TokenRepository, Depends(get_token_repository)]
+UserRolesPermissionsDep = Annotated[UserRolesPermissionsInterface, Depends(get_user_roles_permissions)]
\ No newline at end of file
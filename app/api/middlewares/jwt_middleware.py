@@ -1,88 +1,99 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from typing import Optional, Callable
-from starlette.requests import Request
+from typing import Optional
+from starlette.requests import HTTPConnection
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 from app.core.redis.redis_repo import RedisRepoInterface
 from app.core.repositories import TokenRepository
+from app.infrastructure.redis.token_revocation_filter import TokenRevocationFilter
 import logging
 
 logger = logging.getLogger(__name__)
 
-class JWTMiddleware(BaseHTTPMiddleware):
+class JWTMiddleware:
+    '''Pure ASGI middleware, unlike BaseHTTPMiddleware it does not wrap the request and response in extra tasks
+    and memory streams, authenticated requests are handed straight to the app with the user in the request state
+    '''
     def __init__(
-            self, 
-            app,
+            self,
+            app: ASGIApp,
             token_repo: TokenRepository,
             redis_repo: RedisRepoInterface,
-            exempt_paths: Optional[list]= None
+            exempt_paths: Optional[list]= None,
+            revocation_filter: Optional[TokenRevocationFilter] = None
             ):
-        super().__init__(app)
+        self.app = app
         self.token_repo = token_repo
         self.redis_repo = redis_repo
+        self.revocation_filter = revocation_filter
         self.exempt_paths = exempt_paths or []
-    
+        #str.startswith with a tuple checks every prefix in a single call
+        self._exempt_prefixes = tuple(self.exempt_paths)
+
     def is_exempt_path(self, path:str)->bool:
         """Check if path should be exempt from JWT verification"""
-        return any(path.startswith(exempt_path) for exempt_path in self.exempt_paths)
-    
+        return bool(self._exempt_prefixes) and path.startswith(self._exempt_prefixes)
+
     async def verify_access_token(self, token:str)->Optional[dict]:
         """Verify JWT token and return payload if valid"""
         if not token:
             return None
 
-        if await self.redis_repo.is_token_blacklisted(token):
+        #the revocation filter answers locally for tokens that were never revoked
+        if self.revocation_filter is not None:
+            if await self.revocation_filter.is_revoked(token):
+                return None
+        elif await self.redis_repo.is_token_blacklisted(token):
             return None
-        
+
         return self.token_repo.verify_access_token(token)
-    
-    async def extract_user_id(self, token: str)->Optional[str]:
-        """Extract user_id from JWT token"""
-        payload = self.token_repo.decode_token(token)
+
+    def extract_user_id(self, payload: dict)->Optional[str]:
+        """Extract user_id from the verified token payload"""
         if payload and 'user_id' in payload:
             return payload['user_id']
-    
-    async def dispatch(self, request: Request, call_next: Callable):
-        logger.info('I am inside the dispatch in jwtmiddleware')
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send):
+        response = JSONResponse(
+            status_code=401,
+            content={
+                'status': 'error',
+                'message': 'Invalid Token, Log in again'
+            }
+        )
+        await response(scope, receive, send)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        #only http requests carry the access token cookie, lifespan and websocket events pass through
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
         #skip middleware for exempt paths
-        if self.is_exempt_path(request.url.path):
-            return await call_next(request)
-        
-        #Extract token from cookies 
-        token = request.cookies.get("access_token")
+        if self.is_exempt_path(scope['path']):
+            await self.app(scope, receive, send)
+            return
+
+        #Extract token from cookies
+        connection = HTTPConnection(scope)
+        token = connection.cookies.get("access_token")
         if not token:
-            return JSONResponse(
-                status_code=401,
-                content={
-                    'status': 'error',
-                    'message': 'Invalid Token, Log in again'
-                }
-            )
-        #Verify token
+            await self._reject(scope, receive, send)
+            return
+
+        #Verify token, the payload is decoded once and reused for the user id
         payload = await self.verify_access_token(token)
         if not payload:
-            return JSONResponse(
-                status_code=401,
-                content={
-                    'status': 'error',
-                    'message': 'Invalid Token, Log in again'
-                }
-            )
+            await self._reject(scope, receive, send)
+            return
 
         #extract user_id
-        user_id = await self.extract_user_id(token)
+        user_id = self.extract_user_id(payload)
         if not user_id:
-            return JSONResponse(
-                status_code = 401,
-                content={
-                    'status': 'error',
-                    'message': 'Invalid Token, Log in again'
-                }
-            )
-        
-        #Add user_id and token paylod to request state
-        request.state.user_id = user_id
-        request.state.token_payload = payload
-        request.state.token = token
-        response = await call_next(request)
-        return response
-        
\ No newline at end of file
+            await self._reject(scope, receive, send)
+            return
+
+        #Add user_id and token paylod to request state, it lives in the scope so the route's Request sees it
+        connection.state.user_id = user_id
+        connection.state.token_payload = payload
+        connection.state.token = token
+        await self.app(scope, receive, send)
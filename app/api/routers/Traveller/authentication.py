@@ -1,7 +1,8 @@
 from app.api.schemas import OtpDataSchema, EmailSchema, LoginSchema, UserRegisterSchema, TokenRequestSchema
-from app.api.dependencies import UserRepoDep, EmailRepoDep, RedisRepoDep, TokenRepoDep
+from app.api.dependencies import UserRepoDep, EmailRepoDep, RedisRepoDep, TokenRepoDep, UserRolesPermissionsDep
 from fastapi import APIRouter, HTTPException, status, Response, Request
 from app.core.use_cases import SignUpUseCases, LoginUseCases, GoogleLoginUseCase, TokenUseCases
+from app.core.exceptions import PasswordHashingBusyError, TaskOutboxFullError
 import logging
 
 logger = logging.getLogger(__name__)
@@ -20,7 +21,7 @@ async def initiate_signup(
     try:
         otp, email = await auth_uc.initiate_signup(user_data.model_dump())
         logger.info(otp)
-        auth_uc.send_email(email=email, otp=otp)
+        await auth_uc.send_email(email=email, otp=otp)
         return {
             "status": "success",
             "message": "OTP sent to email",
@@ -38,6 +39,14 @@ async def initiate_signup(
                 "code": "USER_ALREADY_EXISTS" if "already exists" in str(e) else "VALIDATION_ERROR"
             }
         )
+    except TaskOutboxFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                'status': 'error',
+                'message': str(e)
+            }
+        )
 
 
 @router.post("/signup/otp-verify", status_code=status.HTTP_201_CREATED)
@@ -72,6 +81,14 @@ async def otp_verify(
                 "message": str(e),
             }
         )
+    except PasswordHashingBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                'status': 'error',
+                'message': str(e)
+            }
+        )
 
 @router.post("/signup/otp-retry", status_code=status.HTTP_200_OK)
 async def retry_otp_send(
@@ -83,7 +100,7 @@ async def retry_otp_send(
     auth_uc = SignUpUseCases(user_repo, redis_client, email_repo)
     try:
         new_otp = await auth_uc.retry_otp(email_data.email)
-        auth_uc.send_email(email=email_data.email, otp = new_otp)
+        await auth_uc.send_email(email=email_data.email, otp = new_otp)
         return {
             "status": "success",
             "message": "OTP resent successfully",
@@ -100,6 +117,14 @@ async def retry_otp_send(
                 'message': str(e)
             }
         )
+    except TaskOutboxFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                'status': 'error',
+                'message': str(e)
+            }
+        )
     except Exception as e:
         raise HTTPException(
             status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -115,9 +140,11 @@ async def login(
     login_data: LoginSchema,
     user_repo: UserRepoDep,
     token_repo: TokenRepoDep,
+    redis_repo: RedisRepoDep,
+    user_roles_permissions_repo: UserRolesPermissionsDep,
     response: Response
 ):
-    login_uc = LoginUseCases(user_repo, token_repo)
+    login_uc = LoginUseCases(user_repo, token_repo, redis_repo, user_roles_permissions_repo)
 
     try:
         user_response, tokens = await login_uc.execute(login_data.email, login_data.password)
@@ -153,15 +180,30 @@ async def login(
                 'message': str(e)
             }
         )
+    except PasswordHashingBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                'status': 'error',
+                'message': str(e)
+            }
+        )
 
 @router.post('/google', status_code=status.HTTP_200_OK)
 async def google_login(
     data: TokenRequestSchema,
     user_repo: UserRepoDep,
     token_repo: TokenRepoDep,
+    redis_repo: RedisRepoDep,
+    user_roles_permissions_repo: UserRolesPermissionsDep,
     response: Response
 ):
-    google_uc = GoogleLoginUseCase(user_repo=user_repo, token_repo=token_repo)
+    google_uc = GoogleLoginUseCase(
+        user_repo=user_repo,
+        token_repo=token_repo,
+        redis_repo=redis_repo,
+        user_roles_permissions_repo=user_roles_permissions_repo
+    )
 
     try:
         user_response, tokens = await google_uc.execute(data.token)
@@ -216,6 +258,7 @@ async def refresh_token(
     response: Response,
     token_repo: TokenRepoDep, 
     redis_repo: RedisRepoDep,
+    user_roles_permissions_repo: UserRolesPermissionsDep,
 ):
     refresh_token = request.cookies.get("refresh_token")
     if not refresh_token:
@@ -224,7 +267,7 @@ async def refresh_token(
             detail={"status": "error", "message": "Refresh token not found"}
         )
     
-    token_uc = TokenUseCases(token_repo, redis_repo)
+    token_uc = TokenUseCases(token_repo, redis_repo, user_roles_permissions_repo)
 
     try:
         access_token, refresh_token = await token_uc.rotate_tokens(refresh_token)
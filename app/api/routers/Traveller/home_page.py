@@ -51,7 +51,10 @@ async def search_properties(
             children_onboard=query_params.childrenOnboard,
             all=query_params.all,
             page=query_params.page,
-            page_size=query_params.pageSize
+            page_size=query_params.pageSize,
+            cursor=query_params.cursor or None,
+            include_total=query_params.includeTotal,
+            radius_km=query_params.radiusKm
         )
         
         # Initialize use case with injected repository
@@ -100,11 +103,17 @@ async def search_properties(
             totalCount=result.total_count,
             page=result.page,
             pageSize=result.page_size,
+            nextCursor=result.next_cursor,
             message="Properties found successfully"
         )
         
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Error in search_properties endpoint: {str(e)}")
         raise HTTPException(
@@ -149,7 +158,8 @@ async def search_guides(
             children_onboard=query_params.childrenOnboard,
             all=query_params.all,
             page=query_params.page,
-            page_size=query_params.pageSize
+            page_size=query_params.pageSize,
+            include_total=query_params.includeTotal
         )
         
         # Initialize use case with injected repository
@@ -188,7 +198,8 @@ async def search_guides(
                 "firstName": guide.first_name,
                 "lastName": guide.last_name,
                 "profileImage": guide.profile_image,
-                "knownLanguages": guide.known_languages
+                "knownLanguages": guide.known_languages,
+                "distance": guide.distance
             }
             guides_response.append(guide_response)
         
@@ -221,28 +232,11 @@ async def get_guide_details(
     Get guide details by ID
     """
     try:
-        # Create a query to get the specific guide
-        query_entity = GuideSearchQueryEntity(
-            destination="",
-            latitude=None,
-            longitude=None,
-            all=True,  # Get all guides and filter by ID in the repository
-            page=1,
-            page_size=1
-        )
-        
         # Initialize use case with injected repository
         use_case = TravellerHomePageUseCase(home_page_repo)
         
-        # Get all guides and find the specific one
-        result = await use_case.search_guides(query_entity)
-        
-        # Find the guide with the matching ID
-        guide = None
-        for g in result.guides:
-            if g.id == guide_id:
-                guide = g
-                break
+        # Get the specific guide
+        guide = await use_case.get_guide_by_id(guide_id)
         
         if not guide:
             raise HTTPException(
@@ -4,6 +4,7 @@ from app.core.use_cases.admin.user_management_use_case import UserManagementUseC
 from app.api.schemas import TravellerUserSchema, GuideUserSchema, HostUserSchema, UserStatusUpdateRequestSchema, UserStatusUpdateResponseSchema
 from app.core.route_protection_validations.route_protection_dependencies import verify_admin
 from app.api.dependencies import UserManagementRepoDep
+from app.infrastructure.metrics import collect_metrics
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -98,3 +99,11 @@ async def update_host_status(
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/metrics", dependencies=[Depends(verify_admin)])
+async def get_runtime_metrics():
+    """
+    Get the in-process runtime metrics of this instance (caches, pools, queues)
+    """
+    return collect_metrics()
@@ -57,9 +57,10 @@ class PropertySearchResponseSchema(BaseModel):
 class PropertySearchResultSchema(BaseModel):
     """Schema for property search results response"""
     properties: List[PropertySearchResponseSchema]
-    totalCount: int
+    totalCount: Optional[int] = None
     page: int
     pageSize: int
+    nextCursor: Optional[str] = None
     message: str = "Properties found successfully"
 
     class Config:
@@ -69,6 +70,7 @@ class PropertySearchResultSchema(BaseModel):
                 "totalCount": 0,
                 "page": 1,
                 "pageSize": 10,
+                "nextCursor": None,
                 "message": "Properties found successfully"
             }
         }
@@ -86,6 +88,9 @@ class PropertySearchQueryParams(BaseModel):
     all: bool = Field(False, description="Get all properties without filtering")
     page: int = Field(1, ge=1, description="Page number for pagination")
     pageSize: int = Field(10, ge=1, le=100, description="Number of items per page")
+    cursor: Optional[str] = Field(None, description="Opaque cursor from nextCursor of the previous page, takes precedence over page")
+    includeTotal: bool = Field(True, description="Whether to count all matching properties, infinite-scroll clients can turn this off")
+    radiusKm: Optional[float] = Field(None, gt=0, description="Search radius in kilometres around the coordinates, capped by the server")
 
     @field_validator('latitude', 'longitude', mode='before')
     @classmethod
@@ -154,6 +159,7 @@ class GuideSearchResponseSchema(BaseModel):
     lastName: Optional[str]
     profileImage: Optional[str]
     knownLanguages: List[str] = []
+    distance: Optional[float] = None
 
     class Config:
         from_attributes = True
@@ -186,7 +192,7 @@ class GuideSearchResponseSchema(BaseModel):
 class GuideSearchResultSchema(BaseModel):
     """Schema for guide search results response"""
     guides: List[GuideSearchResponseSchema]
-    totalCount: int
+    totalCount: Optional[int] = None
     page: int
     pageSize: int
     message: str = "Guides found successfully"
@@ -212,6 +218,7 @@ class GuideSearchQueryParams(BaseModel):
     all: bool = Field(False, description="Get all guides without filtering")
     page: int = Field(1, ge=1, description="Page number for pagination")
     pageSize: int = Field(10, ge=1, le=100, description="Number of items per page")
+    includeTotal: bool = Field(True, description="Whether to count all matching guides, infinite-scroll clients can turn this off")
 
     @field_validator('latitude', 'longitude', mode='before')
     @classmethod
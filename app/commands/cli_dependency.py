@@ -1,7 +1,17 @@
-from app.infrastructure.repositories import SQLAlchemyUserRepository
+from app.infrastructure.repositories import SQLAlchemyUserRepository, PropertyRepoImpl
 from app.infrastructure.database.session import SessionLocal
+from app.infrastructure.config.password_hashing_settings_adaptor import get_core_password_hashing_settings
+from app.infrastructure.password_hashing import get_password_hashing_executor
+from app.infrastructure.config.redis_settings_adaptor import get_core_redis_settings
+from app.infrastructure.redis.redis_client import RedisClient
 
 async def get_cli_user_repository():
     """Create a session directly for CLI use"""
     session = SessionLocal()
-    return SQLAlchemyUserRepository(session=session)
\ No newline at end of file
+    password_hasher = get_password_hashing_executor(get_core_password_hashing_settings())
+    return SQLAlchemyUserRepository(session=session, password_hasher=password_hasher)
+
+async def get_cli_property_repository():
+    """Create a property repository with its own session for CLI use, with Redis so writes invalidate cached searches"""
+    session = SessionLocal()
+    return PropertyRepoImpl(session=session, redis_repo=RedisClient(get_core_redis_settings()))
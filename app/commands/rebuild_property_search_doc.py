@@ -0,0 +1,31 @@
+import typer
+import asyncio
+from app.core.use_cases import PropertyUseCase
+from app.commands.cli_dependency import get_cli_property_repository
+from app.infrastructure.redis.pool import close_redis_pool
+
+app = typer.Typer()
+
+@app.command()
+def rebuild_property_search_doc():
+    async def run_command():
+        property_repo = None
+        try:
+            property_repo = await get_cli_property_repository()
+            use_case = PropertyUseCase(property_repo=property_repo)
+
+            count = await use_case.rebuild_search_docs()
+            typer.echo(f"Rebuilt {count} property search documents")
+            return True
+        except Exception as e:
+            typer.echo(f"Unexpected  error: {e}")
+            return False
+        finally:
+            if property_repo:
+                await property_repo.session.close()
+            await close_redis_pool()
+    return asyncio.run(run_command())
+
+
+if __name__ == '__main__':
+    app()
@@ -4,7 +4,15 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class DatabaseSettings(BaseSettings):
     URL: str
     ECHO_LOG: bool = False
+    POOL_SIZE: int = 5
+    MAX_OVERFLOW: int = 10
+    POOL_TIMEOUT_SECONDS: float = 30
+    POOL_RECYCLE_SECONDS: int = 1800
+    POOL_PRE_PING: bool = True
+    STATEMENT_CACHE_SIZE: int = 100
+    REPLICA_URL: str | None = None
+    READ_YOUR_WRITES_SECONDS: float = 5
 
     model_config = SettingsConfigDict(env_prefix="DB_", env_file = ".env", extra="ignore") 
 
-db_settings = DatabaseSettings()
\ No newline at end of file
+db_settings = DatabaseSettings()
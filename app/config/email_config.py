@@ -7,6 +7,9 @@ class EmailSettings(BaseSettings):
     USERNAME: str
     PASSWORD: str
     FROM_EMAIL: str
+    POOL_SIZE: int = 2
+    MAX_IDLE_SECONDS: float = 60
+    TIMEOUT_SECONDS: float = 10
 
     model_config = SettingsConfigDict(env_prefix="SMTP_", env_file=".env", extra="ignore")
 
@@ -2,6 +2,7 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class GoogleSettings(BaseSettings):
     CLIENT_ID: str
+    JWKS_URL: str = 'https://www.googleapis.com/oauth2/v3/certs'
 
     model_config = SettingsConfigDict(env_prefix='GOOGLE_', env_file='.env', extra='ignore')
 
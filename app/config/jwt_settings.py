@@ -8,6 +8,7 @@ class JWTSettings(BaseSettings):
     ALGORITHM: str = 'HS256'
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7  
+    VERIFIED_TOKEN_CACHE_SIZE: int = 10000
 
     model_config = SettingsConfigDict(
         env_prefix='JWT_',
@@ -0,0 +1,9 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+class PasswordHashingSettings(BaseSettings):
+    WORKERS: int = 4
+    MAX_QUEUE: int = 64
+
+    model_config = SettingsConfigDict(env_prefix='PASSWORD_HASHING_', env_file='.env', extra='ignore')
+
+password_hashing_settings = PasswordHashingSettings()
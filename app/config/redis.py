@@ -8,6 +8,16 @@ class RedisSettings(BaseSettings):
     OTP_EXPIRE_SECONDS: int = 300
     MAX_OTP_ATTEMPTS: int = 3
     MAX_OTP_RETRY_ATTEMPTS: int = 3
+    GUIDE_CACHE_EXPIRE_SECONDS: int = 300
+    PROPERTY_SEARCH_CACHE_EXPIRE_SECONDS: int = 120
+    REPLICA_READ_CACHE_EXPIRE_SECONDS: int = 5
+    PROPERTY_SEARCH_GRID_DEGREES: float = 0.01
+    PERMISSIONS_CACHE_EXPIRE_SECONDS: int = 300
+    POOL_MAX_CONNECTIONS: int = 50
+    POOL_TIMEOUT_SECONDS: float = 5
+    SOCKET_CONNECT_TIMEOUT_SECONDS: float = 5
+    SOCKET_TIMEOUT_SECONDS: float = 5
+    HEALTH_CHECK_INTERVAL_SECONDS: int = 30
 
     model_config = SettingsConfigDict(env_prefix = "REDIS_", env_file = ".env", extra= "ignore")
 
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, date
 
 
 class PropertySearchEntity(BaseModel):
@@ -26,6 +26,8 @@ class PropertySearchEntity(BaseModel):
     latitude: Optional[float]
     longitude: Optional[float]
     primary_image_url: Optional[str] = None
+    distance: Optional[float] = None  # Exact distance in metres from the search point
+    knn_distance: Optional[float] = None  # Index-ordered (KNN) distance the search sorts by, used as the keyset sort key
 
     class Config:
         from_attributes = True
@@ -43,17 +45,34 @@ class PropertySearchQueryEntity(BaseModel):
     all: bool = False  # New parameter to get all properties
     page: int = Field(default=1, ge=1)
     page_size: int = Field(default=10, ge=1, le=100)
+    cursor: Optional[str] = None  # Opaque keyset cursor, takes precedence over page when present
+    include_total: bool = True  # Infinite-scroll clients can skip counting the matches
+    radius_km: Optional[float] = Field(default=None, gt=0)  # Search radius around the coordinates, capped by the repository
 
     class Config:
         from_attributes = True
 
+    def get_stay_dates(self) -> Optional[Tuple[date, date]]:
+        """Return the (check-in, check-out) dates of the stay, None when no dates were given"""
+        if not self.from_date and not self.to_date:
+            return None
+        if not self.from_date or not self.to_date:
+            raise ValueError("Both fromDate and toDate are required to filter by availability")
+        # Accept plain dates as well as full ISO timestamps from the client
+        check_in = date.fromisoformat(self.from_date.strip()[:10])
+        check_out = date.fromisoformat(self.to_date.strip()[:10])
+        if check_out <= check_in:
+            raise ValueError("toDate must be after fromDate")
+        return check_in, check_out
+
 
 class PropertySearchResultEntity(BaseModel):
     """Entity for property search results response"""
     properties: List[PropertySearchEntity]
-    total_count: int
+    total_count: Optional[int] = None
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -81,6 +100,7 @@ class GuideSearchEntity(BaseModel):
     last_name: Optional[str]
     profile_image: Optional[str]
     known_languages: List[str] = []
+    distance: Optional[float] = None  # Distance in metres from the search point, only set for searches with coordinates
 
     class Config:
         from_attributes = True
@@ -95,6 +115,7 @@ class GuideSearchQueryEntity(BaseModel):
     all: bool = False  # New parameter to get all guides
     page: int = Field(default=1, ge=1)
     page_size: int = Field(default=10, ge=1, le=100)
+    include_total: bool = True  # Infinite-scroll clients can skip counting the matches
 
     class Config:
         from_attributes = True
@@ -103,7 +124,7 @@ class GuideSearchQueryEntity(BaseModel):
 class GuideSearchResultEntity(BaseModel):
     """Entity for guide search results response"""
     guides: List[GuideSearchEntity]
-    total_count: int
+    total_count: Optional[int] = None
     page: int
     page_size: int
 
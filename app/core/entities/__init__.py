@@ -3,6 +3,7 @@ from .traveller.home_page import PropertySearchEntity, PropertySearchQueryEntity
 from .settings.jwt_settings import JWTSettingsEntity
 from .settings.redis_settings import RedisSettingsEntity
 from .settings.google_settings import GoogleSettingsEntity
+from .settings.password_hashing_settings import PasswordHashingSettingsEntity
 from .user_roles_and_permissions import UserRolesAndPermissionsEntity
 from .user import UserEntity, AdminCreationEntity
 from .kyc import KycEntity, KycListItemEntity
@@ -2,4 +2,5 @@ from dataclasses import dataclass
 
 @dataclass
 class GoogleSettingsEntity:
-    CLIENT_ID: str
\ No newline at end of file
+    CLIENT_ID: str
+    JWKS_URL: str = 'https://www.googleapis.com/oauth2/v3/certs'
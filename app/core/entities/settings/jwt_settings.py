@@ -9,3 +9,4 @@ class JWTSettingsEntity:
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: timedelta
     REFRESH_TOKEN_EXPIRE_DAYS: timedelta
+    VERIFIED_TOKEN_CACHE_SIZE: int = 10000
@@ -0,0 +1,6 @@
+from dataclasses import dataclass
+
+@dataclass
+class PasswordHashingSettingsEntity:
+    WORKERS: int
+    MAX_QUEUE: int
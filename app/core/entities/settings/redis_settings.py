@@ -10,4 +10,14 @@ class RedisSettingsEntity:
     PASSWORD: str | None
     OTP_EXPIRE_SECONDS: int
     MAX_OTP_ATTEMPTS: int
-    MAX_OTP_RETRY_ATTEMPTS: int
\ No newline at end of file
+    MAX_OTP_RETRY_ATTEMPTS: int
+    GUIDE_CACHE_EXPIRE_SECONDS: int
+    PROPERTY_SEARCH_CACHE_EXPIRE_SECONDS: int
+    REPLICA_READ_CACHE_EXPIRE_SECONDS: int
+    PROPERTY_SEARCH_GRID_DEGREES: float
+    PERMISSIONS_CACHE_EXPIRE_SECONDS: int
+    POOL_MAX_CONNECTIONS: int
+    POOL_TIMEOUT_SECONDS: float
+    SOCKET_CONNECT_TIMEOUT_SECONDS: float
+    SOCKET_TIMEOUT_SECONDS: float
+    HEALTH_CHECK_INTERVAL_SECONDS: int
\ No newline at end of file
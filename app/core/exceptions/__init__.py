@@ -1 +1,3 @@
-from .kyc_exceptions import KycNotAcceptedError
\ No newline at end of file
+from .kyc_exceptions import KycNotAcceptedError
+from .password_hashing_exceptions import PasswordHashingBusyError
+from .task_queue_exceptions import TaskOutboxFullError
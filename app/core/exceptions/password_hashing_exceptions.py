@@ -0,0 +1,2 @@
+class PasswordHashingBusyError(Exception):
+    pass
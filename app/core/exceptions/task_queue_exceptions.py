@@ -0,0 +1,2 @@
+class TaskOutboxFullError(Exception):
+    pass
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import AsyncContextManager, AsyncIterator
 
 class RedisRepoInterface(ABC):
     @abstractmethod
@@ -14,7 +15,23 @@ class RedisRepoInterface(ABC):
         pass
 
     @abstractmethod
-    async def update_signup_data(self, email: str, **updates)->None:
+    async def verify_signup_otp(self, email: str, otp: str)->tuple[str, dict | int | None]:
+        """Atomically check the otp, returns ('verified', user_data) and claims the signup, ('invalid', attempts left)
+        after counting the failed attempt, ('locked', None) once MAX_OTP_ATTEMPTS is reached or ('expired', None)"""
+        pass
+
+    @abstractmethod
+    async def restore_claimed_signup(self, email: str)->bool:
+        """Put a claimed signup back so its otp can be submitted again, False when it expired or was replaced"""
+        pass
+
+    @abstractmethod
+    async def delete_claimed_signup(self, email: str)->None:
+        pass
+
+    @abstractmethod
+    async def reset_signup_otp(self, email: str, otp: str)->int | None:
+        """Atomically replace the otp and reset its attempts keeping the ttl, returns the retry count or None when expired"""
         pass
 
 
@@ -25,6 +42,83 @@ class RedisRepoInterface(ABC):
     @abstractmethod
     async def is_token_blacklisted(self, token:str)->bool:
         pass
+
+    @abstractmethod
+    async def get_revoked_token_ids(self)->list[tuple[str, float]]:
+        pass
+
+    @abstractmethod
+    def subscribe_token_revocations(self)->AsyncContextManager[AsyncIterator[tuple[str, float]]]:
+        pass
+
+
+    @abstractmethod
+    async def get_cached_guide(self, guide_id: int)->dict | None:
+        pass
+
+    @abstractmethod
+    async def cache_guide(self, guide_id: int, guide_data: dict, from_replica: bool = False)->None:
+        pass
+
+    @abstractmethod
+    async def invalidate_cached_guide(self, guide_id: int)->None:
+        pass
+
+
+    @abstractmethod
+    async def get_cached_permissions(self, user_id: str)->dict | None:
+        pass
+
+    @abstractmethod
+    async def cache_permissions(self, user_id: str, permissions: dict, authz_version: int)->None:
+        pass
+
+    @abstractmethod
+    async def invalidate_cached_permissions(self, user_ids: list[str])->None:
+        pass
+
+    @abstractmethod
+    async def get_authz_version(self, user_id: str)->int | None:
+        """Current authz version of the user, None when it is not known (never set, or lost with Redis data)"""
+        pass
+
+    @abstractmethod
+    async def ensure_authz_version(self, user_id: str)->int:
+        """Current authz version of the user, starting a new one above any version issued before if it is not known"""
+        pass
+
+    @abstractmethod
+    async def bump_authz_versions(self, user_ids: list[str])->None:
+        pass
+
+    @abstractmethod
+    async def mark_recent_write(self, user_id: str, seconds: float)->None:
+        pass
+
+    @abstractmethod
+    async def has_recent_write(self, user_id: str)->bool:
+        pass
+
+
+    @abstractmethod
+    def get_property_search_grid_degrees(self)->float:
+        pass
+
+    @abstractmethod
+    async def get_property_search_versions(self, cells: list[str])->list[int]:
+        pass
+
+    @abstractmethod
+    async def bump_property_search_versions(self, cells: list[str])->None:
+        pass
+
+    @abstractmethod
+    async def get_cached_property_search(self, key: str)->dict | None:
+        pass
+
+    @abstractmethod
+    async def cache_property_search(self, key: str, search_data: dict, from_replica: bool = False)->None:
+        pass
     
 
 
@@ -3,5 +3,5 @@ from abc import ABC, abstractmethod
 class EmailRepo(ABC):
     #Core abstraction for email sending
     @abstractmethod
-    def send(self, email: str, otp: str)-> None:
+    async def send(self, email: str, otp: str)-> None:
         pass
\ No newline at end of file
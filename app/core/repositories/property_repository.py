@@ -25,4 +25,8 @@ class PropertyRepo(ABC):
 
     @abstractmethod
     async def update_property(self, property_id: str, property_data: PropertyUpdateEntity, host_id: int)->bool:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    async def rebuild_property_search_docs(self)->int:
+        pass
@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 
 class TokenRepository(ABC):
     @abstractmethod
-    def generate_access_token(self, user_id: str)->str:
+    def generate_access_token(self, user_id: str, authz_claims: dict | None = None)->str:
         pass
     
     @abstractmethod
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from app.core.entities.traveller.home_page import PropertySearchEntity, PropertySearchQueryEntity, GuideSearchEntity, GuideSearchQueryEntity
 
 
@@ -38,6 +38,40 @@ class TravellerHomePageRepositoryInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    async def search_properties_with_count(
+        self, 
+        query: PropertySearchQueryEntity
+    ) -> Tuple[List[PropertySearchEntity], int]:
+        """
+        Search properties and get the total count of matches in a single database round trip
+        
+        Args:
+            query: Property search query parameters (includes pagination)
+            
+        Returns:
+            Tuple of the PropertySearchEntity page and the total count of matching properties
+        """
+        pass
+
+    @abstractmethod
+    def encode_cursor(
+        self,
+        query: PropertySearchQueryEntity,
+        last_property: PropertySearchEntity
+    ) -> str:
+        """
+        Encode the sort key of the last property in a page as an opaque cursor
+
+        Args:
+            query: Property search query parameters the page was fetched with
+            last_property: Last property of the current page
+
+        Returns:
+            Cursor string to pass back to fetch the next page
+        """
+        pass
+
     @abstractmethod
     def convert_lat_lng_to_geography(self, latitude: float, longitude: float) -> str:
         """
@@ -81,6 +115,22 @@ class TravellerHomePageRepositoryInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    async def search_guides_with_count(
+        self, 
+        query: GuideSearchQueryEntity
+    ) -> Tuple[List[GuideSearchEntity], int]:
+        """
+        Search guides and get the total count of matches in a single database round trip
+        
+        Args:
+            query: Guide search query parameters (includes pagination)
+            
+        Returns:
+            Tuple of the GuideSearchEntity page and the total count of matching guides
+        """
+        pass
+
     @abstractmethod
     async def get_guides_count(
         self, 
@@ -96,3 +146,16 @@ class TravellerHomePageRepositoryInterface(ABC):
             Total count of matching guides
         """
         pass
+
+    @abstractmethod
+    async def get_guide_by_id(self, guide_id: int) -> Optional[GuideSearchEntity]:
+        """
+        Get a single non-blocked guide by id
+        
+        Args:
+            guide_id: Id of the guide
+            
+        Returns:
+            GuideSearchEntity if the guide exists and is not blocked, None otherwise
+        """
+        pass
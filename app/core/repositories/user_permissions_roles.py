@@ -3,5 +3,5 @@ from app.core.entities import UserRolesAndPermissionsEntity
 
 class UserRolesPermissionsInterface(ABC):
     @abstractmethod
-    async def get_user_roles_and_permissions(self, user_id: str)->UserRolesAndPermissionsEntity:
+    async def get_user_roles_and_permissions(self, user_id: str, use_cache: bool = True)->UserRolesAndPermissionsEntity:
         pass
@@ -1,13 +1,40 @@
 from app.core.repositories import UserRolesPermissionsInterface
+from app.core.entities import UserRolesAndPermissionsEntity
+from app.core.redis.redis_repo import RedisRepoInterface
 from fastapi import Request,status,HTTPException, Depends
-from app.api.dependencies import get_user_roles_permissions
+from app.api.dependencies import get_user_roles_permissions, get_redis_client
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+async def get_request_roles_permissions(
+        request: Request,
+        user_id: str,
+        user_roles_permissions_repo: UserRolesPermissionsInterface,
+        redis_repo: RedisRepoInterface
+)->UserRolesAndPermissionsEntity:
+    '''Authorize from the role claims in the access token while its authz version is still current,
+    otherwise (claims missing, version bumped by a status change or unknown to Redis, Redis unavailable) look
+    the roles up
+    '''
+    payload = getattr(request.state, 'token_payload', None) or {}
+    roles = payload.get('roles')
+    authz_version = payload.get('authz_version')
+    if roles is not None and authz_version is not None:
+        try:
+            current_version = await redis_repo.get_authz_version(str(user_id))
+            #a missing version says nothing about the token, it may have been lost after the user was blocked
+            if current_version is not None and current_version == authz_version:
+                return UserRolesAndPermissionsEntity.model_validate(roles)
+        except Exception as e:
+            logger.warning(f"Could not check authz version for user {user_id}: {str(e)}")
+    return await user_roles_permissions_repo.get_user_roles_and_permissions(user_id)
+
 async def verify_traveller(
         request: Request,
-        user_roles_permissions_repo: UserRolesPermissionsInterface = Depends(get_user_roles_permissions)
+        user_roles_permissions_repo: UserRolesPermissionsInterface = Depends(get_user_roles_permissions),
+        redis_repo: RedisRepoInterface = Depends(get_redis_client)
 ):
     user_id = getattr(request.state, 'user_id', None)
     logger.info(f'user_id: {user_id}')
@@ -18,7 +45,7 @@ async def verify_traveller(
             detail='Authentication required'
         )
     
-    user_roles_permissions = await user_roles_permissions_repo.get_user_roles_and_permissions(user_id)
+    user_roles_permissions = await get_request_roles_permissions(request, user_id, user_roles_permissions_repo, redis_repo)
     logger.info(user_roles_permissions)
 
     if not user_roles_permissions.is_active:
@@ -30,7 +57,8 @@ async def verify_traveller(
 
 async def verify_admin(
         request: Request,
-        user_roles_permissions_repo: UserRolesPermissionsInterface = Depends(get_user_roles_permissions)
+        user_roles_permissions_repo: UserRolesPermissionsInterface = Depends(get_user_roles_permissions),
+        redis_repo: RedisRepoInterface = Depends(get_redis_client)
 ):
     user_id = getattr(request.state, 'user_id', None)
     logger.info(f'user_id: {user_id}')
@@ -39,7 +67,7 @@ async def verify_admin(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Authentication required'
         )
-    user_roles_permissions = await user_roles_permissions_repo.get_user_roles_and_permissions(user_id)
+    user_roles_permissions = await get_request_roles_permissions(request, user_id, user_roles_permissions_repo, redis_repo)
 
     if not user_roles_permissions.is_admin:
         raise HTTPException(
@@ -49,7 +77,8 @@ async def verify_admin(
 
 async def verify_guide(
         request: Request,
-        user_roles_permissions_repo: UserRolesPermissionsInterface = Depends(get_user_roles_permissions)
+        user_roles_permissions_repo: UserRolesPermissionsInterface = Depends(get_user_roles_permissions),
+        redis_repo: RedisRepoInterface = Depends(get_redis_client)
 ):
     user_id = getattr(request.state, 'user_id', None)
     logger.info(f'user_id: {user_id}')
@@ -58,7 +87,7 @@ async def verify_guide(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Authentication required'
         )
-    user_roles_permissions = await user_roles_permissions_repo.get_user_roles_and_permissions(user_id)
+    user_roles_permissions = await get_request_roles_permissions(request, user_id, user_roles_permissions_repo, redis_repo)
 
     logger.info(f'guide permissions: {user_roles_permissions}')
 
@@ -70,7 +99,8 @@ async def verify_guide(
 
 async def verify_host(
         request: Request,
-        user_roles_permissions_repo: UserRolesPermissionsInterface = Depends(get_user_roles_permissions)
+        user_roles_permissions_repo: UserRolesPermissionsInterface = Depends(get_user_roles_permissions),
+        redis_repo: RedisRepoInterface = Depends(get_redis_client)
 ):
     user_id = getattr(request.state, 'user_id', None)
     if not user_id:
@@ -78,7 +108,7 @@ async def verify_host(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Authentication required' 
         )
-    user_roles_permissions = await user_roles_permissions_repo.get_user_roles_and_permissions(user_id)
+    user_roles_permissions = await get_request_roles_permissions(request, user_id, user_roles_permissions_repo, redis_repo)
 
     if not user_roles_permissions.is_host and not user_roles_permissions.is_host_blocked:
         raise HTTPException(
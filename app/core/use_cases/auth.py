@@ -1,8 +1,9 @@
 from app.core.entities import UserEntity
 from app.api.schemas import UserRolesSchema,UserRegisterSchema, SafeUserResponseSchema
-from app.core.repositories import UserRepository, TokenRepository, EmailRepo
+from app.core.repositories import UserRepository, TokenRepository, EmailRepo, UserRolesPermissionsInterface
 from app.core.redis.redis_repo import RedisRepoInterface
-from typing import Dict, Any, Tuple
+from app.core.use_cases.token_use_cases import build_authz_claims
+from typing import Dict, Any, Tuple, Optional
 import random
 import string
 import logging
@@ -38,39 +39,45 @@ class SignUpUseCases:
         return otp, email
 
     async def verify_otp(self, email: str, otp: str)->dict:
-        data = await self.redis_client.get_signup_data(email)
-        if not data:
+        #check, count the attempt and claim the signup in one atomic step so concurrent submissions cannot race
+        status, result = await self.redis_client.verify_signup_otp(
+            email=email,
+            otp=otp
+        )
+        if status == 'expired':
             raise ValueError("You took too long hence expired")    
-        if data['attempts'] == 3:
+        if status == 'locked':
             raise ValueError("Max attempt reached! Validate with a new otp after countdown.")
-        if data["otp"] != otp:
-            attempts = data['attempts'] + 1
-            if attempts == 3:
+        if status == 'invalid':
+            if result == 0:
                 raise ValueError("Invalid OTP.Max attempt reached! Validate with a new otp after countdown.")
-            await self.redis_client.update_signup_data(email = email, attempts = attempts)
             raise ValueError("Invalid OTP")
 
-        await self.redis_client.delete_signup_data(email=email) 
-        return data["user_data"]
+        return result
     
     async def create_user(self, user_data: UserRegisterSchema)->UserEntity:
-        return await self.user_repo.create_user(user_data)
+        try:
+            created = await self.user_repo.create_user(user_data)
+        except Exception:
+            #the otp was right, hand the signup back so it can be submitted again (hashing busy, database hiccup)
+            try:
+                await self.redis_client.restore_claimed_signup(user_data.email)
+            except Exception as e:
+                logger.warning(f"Failed to restore the claimed signup for {user_data.email}: {str(e)}")
+            raise
+        #created, or the user already exists, either way the signup is finished
+        await self.redis_client.delete_claimed_signup(user_data.email)
+        return created
     
-    def send_email(self, email: str, otp: str)->None:
-        self.email_repo.send(email, otp)
+    async def send_email(self, email: str, otp: str)->None:
+        await self.email_repo.send(email, otp)
     
     async def retry_otp(self, email: str)->str:
-        data = await self.redis_client.get_signup_data(email)
-        if not data:
-            raise ValueError("You took too long hence expired")
-      #keeping the ttl same, increase the retry_attempts as necessary to complete the requirement for the retry otp endpoint.        
+        #keeping the ttl same, increase the retry_attempts as necessary to complete the requirement for the retry otp endpoint.        
         new_otp = self.generate_otp()
-        await self.redis_client.update_signup_data(
-            email=email,
-            otp= new_otp,
-            otp_retry_attempts = data['otp_retry_attempts'] + 1,
-            attempts = 0
-        )
+        retry_attempts = await self.redis_client.reset_signup_otp(email=email, otp=new_otp)
+        if retry_attempts is None:
+            raise ValueError("You took too long hence expired")
         return new_otp
         
 
@@ -79,9 +86,13 @@ class LoginUseCases:
             self,
             user_repo: UserRepository,
             token_repo: TokenRepository,
+            redis_repo: Optional[RedisRepoInterface] = None,
+            user_roles_permissions_repo: Optional[UserRolesPermissionsInterface] = None
     ):
         self.user_repo = user_repo
         self.token_repo = token_repo
+        self.redis_repo = redis_repo
+        self.user_roles_permissions_repo = user_roles_permissions_repo
     
     async def execute(self, email: str, password: str)->tuple:
         user = await self._validate_user(email)
@@ -94,7 +105,7 @@ class LoginUseCases:
             isTraveller=user.is_traveller,
             isActive = user.is_active,
         )
-        tokens = self._generate_tokens(user.id)
+        tokens = await self._generate_tokens(user.id)
         return user_response, tokens 
     async def _validate_user(self, email: str)->UserEntity:
         user = await self.user_repo.get_user_by_email(email)
@@ -113,8 +124,9 @@ class LoginUseCases:
             raise ValueError("You entered the wrong password")
     
 
-    def _generate_tokens(self,user_id: str)->dict:
-        access_token = self.token_repo.generate_access_token(user_id)
+    async def _generate_tokens(self,user_id: str)->dict:
+        authz_claims = await build_authz_claims(user_id, self.redis_repo, self.user_roles_permissions_repo)
+        access_token = self.token_repo.generate_access_token(user_id, authz_claims)
         refresh_token = self.token_repo.generate_refresh_token(user_id)
         return {'access_token': access_token, 'refresh_token': refresh_token}
 
@@ -135,10 +147,14 @@ class GoogleLoginUseCase:
     def __init__(
             self, 
             user_repo: UserRepository,
-            token_repo: TokenRepository
+            token_repo: TokenRepository,
+            redis_repo: Optional[RedisRepoInterface] = None,
+            user_roles_permissions_repo: Optional[UserRolesPermissionsInterface] = None
     ):
         self.user_repo = user_repo
         self.token_repo = token_repo
+        self.redis_repo = redis_repo
+        self.user_roles_permissions_repo = user_roles_permissions_repo
 
     async def execute(self, google_token: str)->Tuple[SafeUserResponseSchema, dict]:
         #Verify google token and get user info
@@ -172,7 +188,7 @@ class GoogleLoginUseCase:
             user = await self.user_repo.get_user_by_email(email)
         
         user_response =self._generate_user_response(user)
-        tokens = self._generate_tokens(user.id)
+        tokens = await self._generate_tokens(user.id)
 
         return user_response, tokens
 
@@ -196,8 +212,9 @@ class GoogleLoginUseCase:
             isActive = user.is_active
         )
     
-    def _generate_tokens(self, user_id: str)->dict:
-        access_token = self.token_repo.generate_access_token(user_id)
+    async def _generate_tokens(self, user_id: str)->dict:
+        authz_claims = await build_authz_claims(user_id, self.redis_repo, self.user_roles_permissions_repo)
+        access_token = self.token_repo.generate_access_token(user_id, authz_claims)
         refresh_token = self.token_repo.generate_refresh_token(user_id)
         return {'access_token': access_token, 'refresh_token': refresh_token}
 
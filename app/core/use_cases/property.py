@@ -46,5 +46,6 @@ class PropertyUseCase:
         """Get property details by ID with timestamps and host info"""
         return await self.property_repo.get_property_details_by_id(property_id)
 
-
-
+    async def rebuild_search_docs(self) -> int:
+        """Rebuild the denormalized property search documents, returns how many were written"""
+        return await self.property_repo.rebuild_property_search_docs()
@@ -1,15 +1,39 @@
-from app.core.repositories import TokenRepository
+from app.core.repositories import TokenRepository, UserRolesPermissionsInterface
 from app.core.redis.redis_repo import RedisRepoInterface
 from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def build_authz_claims(
+        user_id: str,
+        redis_repo: Optional[RedisRepoInterface],
+        user_roles_permissions_repo: Optional[UserRolesPermissionsInterface]
+)->Optional[dict]:
+    """Role flags and authz version to embed in an access token, None if they cannot be resolved"""
+    if not redis_repo or not user_roles_permissions_repo:
+        return None
+    try:
+        #read the version before the roles, a change landing in between then leaves the token with a stale version
+        authz_version = await redis_repo.ensure_authz_version(str(user_id))
+        roles = await user_roles_permissions_repo.get_user_roles_and_permissions(str(user_id), use_cache=False)
+        return {'roles': roles.model_dump(), 'authz_version': authz_version}
+    except Exception as e:
+        logger.warning(f"Issuing access token without role claims for user {user_id}: {str(e)}")
+        return None
+
 
 class TokenUseCases:
     def __init__(
             self,
             token_repo: TokenRepository,
-            redis_repo: RedisRepoInterface
+            redis_repo: RedisRepoInterface,
+            user_roles_permissions_repo: Optional[UserRolesPermissionsInterface] = None
     ):
         self.token_repo = token_repo
         self.redis_repo = redis_repo
+        self.user_roles_permissions_repo = user_roles_permissions_repo
 
     async def verify_access_token(self, token:str)->Optional[dict]:
         if not token:
@@ -35,8 +59,8 @@ class TokenUseCases:
             return payload['user_id']
         return None
     
-    def generate_access_token(self, user_id: str)->str:
-        return self.token_repo.generate_access_token(user_id)
+    def generate_access_token(self, user_id: str, authz_claims: Optional[dict] = None)->str:
+        return self.token_repo.generate_access_token(user_id, authz_claims)
     
     def generate_refresh_token(self, user_id:str)->str:
         return self.token_repo.generate_refresh_token(user_id)
@@ -52,7 +76,8 @@ class TokenUseCases:
         user_id = token_data.get('user_id')
         if not user_id:
             raise ValueError("Invalid refresh token")
-        access_token = self.generate_access_token(user_id)
+        authz_claims = await build_authz_claims(user_id, self.redis_repo, self.user_roles_permissions_repo)
+        access_token = self.generate_access_token(user_id, authz_claims)
         await self.blacklist_token(token, 30*24*60*60)
         refresh_token = self.generate_refresh_token(user_id)
         return access_token, refresh_token
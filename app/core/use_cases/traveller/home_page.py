@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from app.core.entities.traveller.home_page import PropertySearchEntity, PropertySearchQueryEntity, PropertySearchResultEntity, GuideSearchEntity, GuideSearchQueryEntity, GuideSearchResultEntity
 from app.core.repositories.traveller_home_page import TravellerHomePageRepositoryInterface
 import logging
@@ -28,18 +28,25 @@ class TravellerHomePageUseCase:
         try:
             logger.info(f"Searching properties with query: {query}")
             
-            # Get properties from repository
-            properties = await self.repository.search_properties(query)
+            # Get properties from repository, together with the total count for pagination when requested
+            if query.include_total:
+                properties, total_count = await self.repository.search_properties_with_count(query)
+            else:
+                properties = await self.repository.search_properties(query)
+                total_count = None
             
-            # Get total count for pagination
-            total_count = await self.repository.get_properties_count(query)
+            # A full page means there may be more rows after it, hand back a cursor for them
+            next_cursor = None
+            if properties and len(properties) == query.page_size:
+                next_cursor = self.repository.encode_cursor(query, properties[-1])
             
             # Create result entity
             result = PropertySearchResultEntity(
                 properties=properties,
                 total_count=total_count,
                 page=query.page,
-                page_size=query.page_size
+                page_size=query.page_size,
+                next_cursor=next_cursor
             )
             
             logger.info(f"Found {len(properties)} properties out of {total_count} total")
@@ -81,6 +88,13 @@ class TravellerHomePageUseCase:
                 if not (-90 <= query.latitude <= 90) or not (-180 <= query.longitude <= 180):
                     logger.warning("Invalid latitude or longitude coordinates")
                     return False
+
+            # Check that the stay dates, when provided, form a valid range
+            try:
+                query.get_stay_dates()
+            except ValueError as e:
+                logger.warning(f"Invalid stay dates: {str(e)}")
+                return False
             
             return True
             
@@ -104,11 +118,12 @@ class TravellerHomePageUseCase:
         try:
             logger.info(f"Searching guides with query: {query}")
             
-            # Get guides from repository
-            guides = await self.repository.search_guides(query)
-            
-            # Get total count for pagination
-            total_count = await self.repository.get_guides_count(query)
+            # Get guides from repository, together with the total count for pagination when requested
+            if query.include_total:
+                guides, total_count = await self.repository.search_guides_with_count(query)
+            else:
+                guides = await self.repository.search_guides(query)
+                total_count = None
             
             # Create result entity
             result = GuideSearchResultEntity(
@@ -125,6 +140,24 @@ class TravellerHomePageUseCase:
             logger.error(f"Error searching guides: {str(e)}")
             raise
 
+    async def get_guide_by_id(self, guide_id: int) -> Optional[GuideSearchEntity]:
+        """
+        Get guide details by id
+        
+        Args:
+            guide_id: Id of the guide
+            
+        Returns:
+            GuideSearchEntity if found, None otherwise
+        """
+        try:
+            logger.info(f"Getting guide details for guide_id: {guide_id}")
+            return await self.repository.get_guide_by_id(guide_id)
+            
+        except Exception as e:
+            logger.error(f"Error getting guide {guide_id}: {str(e)}")
+            raise
+
     def validate_guide_search_query(self, query: GuideSearchQueryEntity) -> bool:
         """
         Validate guide search query parameters
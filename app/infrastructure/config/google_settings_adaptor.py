@@ -3,5 +3,6 @@ from app.config.google_config import google_settings
 
 def get_core_google_settings()->GoogleSettingsEntity:
     return GoogleSettingsEntity(
-        CLIENT_ID=google_settings.CLIENT_ID
+        CLIENT_ID=google_settings.CLIENT_ID,
+        JWKS_URL=google_settings.JWKS_URL
     )
\ No newline at end of file
@@ -10,5 +10,6 @@ def get_core_jwt_settings()->JWTSettingsEntity:
         SECRET_KEY = infra_jwt_settings.SECRET_KEY,
         ALGORITHM=infra_jwt_settings.ALGORITHM,
         ACCESS_TOKEN_EXPIRE_MINUTES=timedelta(minutes=infra_jwt_settings.ACCESS_TOKEN_EXPIRE_MINUTES),
-        REFRESH_TOKEN_EXPIRE_DAYS=timedelta(days=infra_jwt_settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        REFRESH_TOKEN_EXPIRE_DAYS=timedelta(days=infra_jwt_settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        VERIFIED_TOKEN_CACHE_SIZE=infra_jwt_settings.VERIFIED_TOKEN_CACHE_SIZE
     )
\ No newline at end of file
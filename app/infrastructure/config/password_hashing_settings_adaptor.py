@@ -0,0 +1,8 @@
+from app.core.entities import PasswordHashingSettingsEntity
+from app.config.password_hashing import password_hashing_settings
+
+def get_core_password_hashing_settings()->PasswordHashingSettingsEntity:
+    return PasswordHashingSettingsEntity(
+        WORKERS=password_hashing_settings.WORKERS,
+        MAX_QUEUE=password_hashing_settings.MAX_QUEUE
+    )
@@ -10,5 +10,15 @@ def get_core_redis_settings()->RedisSettingsEntity:
         PASSWORD=infra_redis_settings.PASSWORD,
         OTP_EXPIRE_SECONDS=infra_redis_settings.OTP_EXPIRE_SECONDS,
         MAX_OTP_ATTEMPTS=infra_redis_settings.MAX_OTP_ATTEMPTS,
-        MAX_OTP_RETRY_ATTEMPTS=infra_redis_settings.MAX_OTP_RETRY_ATTEMPTS
+        MAX_OTP_RETRY_ATTEMPTS=infra_redis_settings.MAX_OTP_RETRY_ATTEMPTS,
+        GUIDE_CACHE_EXPIRE_SECONDS=infra_redis_settings.GUIDE_CACHE_EXPIRE_SECONDS,
+        PROPERTY_SEARCH_CACHE_EXPIRE_SECONDS=infra_redis_settings.PROPERTY_SEARCH_CACHE_EXPIRE_SECONDS,
+        REPLICA_READ_CACHE_EXPIRE_SECONDS=infra_redis_settings.REPLICA_READ_CACHE_EXPIRE_SECONDS,
+        PROPERTY_SEARCH_GRID_DEGREES=infra_redis_settings.PROPERTY_SEARCH_GRID_DEGREES,
+        PERMISSIONS_CACHE_EXPIRE_SECONDS=infra_redis_settings.PERMISSIONS_CACHE_EXPIRE_SECONDS,
+        POOL_MAX_CONNECTIONS=infra_redis_settings.POOL_MAX_CONNECTIONS,
+        POOL_TIMEOUT_SECONDS=infra_redis_settings.POOL_TIMEOUT_SECONDS,
+        SOCKET_CONNECT_TIMEOUT_SECONDS=infra_redis_settings.SOCKET_CONNECT_TIMEOUT_SECONDS,
+        SOCKET_TIMEOUT_SECONDS=infra_redis_settings.SOCKET_TIMEOUT_SECONDS,
+        HEALTH_CHECK_INTERVAL_SECONDS=infra_redis_settings.HEALTH_CHECK_INTERVAL_SECONDS
     )
\ No newline at end of file
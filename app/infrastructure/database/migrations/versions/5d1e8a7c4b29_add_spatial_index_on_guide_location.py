@@ -0,0 +1,29 @@
+"""add spatial index on guide location
+
+Revision ID: 5d1e8a7c4b29
+Revises: c928ac67559e
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1e8a7c4b29'
+down_revision: Union[str, Sequence[str], None] = 'c928ac67559e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # IF NOT EXISTS since geoalchemy2 may already have created it alongside the table on some databases
+    op.execute("CREATE INDEX IF NOT EXISTS idx_guide_location ON guide USING gist (location)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS idx_guide_location")
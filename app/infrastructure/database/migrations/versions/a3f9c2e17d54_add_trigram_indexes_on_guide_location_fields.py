@@ -0,0 +1,34 @@
+"""add trigram indexes on guide location fields
+
+Revision ID: a3f9c2e17d54
+Revises: 5d1e8a7c4b29
+Create Date: 2026-10-18 11:02:17.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f9c2e17d54'
+down_revision: Union[str, Sequence[str], None] = '5d1e8a7c4b29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pg_trgm GIN indexes let the leading-wildcard ILIKE destination filters use an index
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('idx_guide_district_trgm', 'guide', ['district'], unique=False, postgresql_using='gin', postgresql_ops={'district': 'gin_trgm_ops'})
+    op.create_index('idx_guide_state_trgm', 'guide', ['state'], unique=False, postgresql_using='gin', postgresql_ops={'state': 'gin_trgm_ops'})
+    op.create_index('idx_guide_country_trgm', 'guide', ['country'], unique=False, postgresql_using='gin', postgresql_ops={'country': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_guide_country_trgm', table_name='guide', postgresql_using='gin')
+    op.drop_index('idx_guide_state_trgm', table_name='guide', postgresql_using='gin')
+    op.drop_index('idx_guide_district_trgm', table_name='guide', postgresql_using='gin')
@@ -0,0 +1,101 @@
+"""add locations and link property address
+
+Revision ID: b7e41d9c3a62
+Revises: a3f9c2e17d54
+Create Date: 2026-10-18 12:14:36.271903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import geoalchemy2
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e41d9c3a62'
+down_revision: Union[str, Sequence[str], None] = 'a3f9c2e17d54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+LOCATION_LEVELS = (
+    ('country', 'country_location_id'),
+    ('state', 'state_location_id'),
+    ('district', 'district_location_id'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('locations',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('parent_id', sa.Integer(), nullable=True),
+    sa.Column('level', sa.String(length=20), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('normalized_name', sa.String(length=255), nullable=False),
+    sa.Column('centroid', geoalchemy2.types.Geography(geometry_type='POINT', srid=4326, dimension=2, spatial_index=False, from_text='ST_GeogFromText', name='geography'), nullable=True),
+    sa.ForeignKeyConstraint(['parent_id'], ['locations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('uq_locations_level_parent_name', 'locations', ['level', sa.text('COALESCE(parent_id, 0)'), 'normalized_name'], unique=True)
+    op.create_index('idx_locations_level_name', 'locations', ['level', 'normalized_name'], unique=False)
+
+    for level, column in LOCATION_LEVELS:
+        op.add_column('property_address', sa.Column(column, sa.Integer(), nullable=True))
+        op.create_foreign_key(f'fk_property_address_{column}', 'property_address', 'locations', [column], ['id'], ondelete='SET NULL')
+        op.create_index(f'ix_property_address_{column}', 'property_address', [column], unique=False)
+
+    # Backfill the hierarchy from the existing free text addresses, one level at a time
+    op.execute("""
+        INSERT INTO locations (parent_id, level, name, normalized_name)
+        SELECT DISTINCT ON (lower(trim(country))) NULL, 'country', trim(country), lower(trim(country))
+        FROM property_address
+        ORDER BY lower(trim(country))
+    """)
+    op.execute("""
+        INSERT INTO locations (parent_id, level, name, normalized_name)
+        SELECT DISTINCT ON (c.id, lower(trim(pa.state))) c.id, 'state', trim(pa.state), lower(trim(pa.state))
+        FROM property_address pa
+        JOIN locations c ON c.level = 'country' AND c.normalized_name = lower(trim(pa.country))
+        ORDER BY c.id, lower(trim(pa.state))
+    """)
+    op.execute("""
+        INSERT INTO locations (parent_id, level, name, normalized_name)
+        SELECT DISTINCT ON (s.id, lower(trim(pa.district))) s.id, 'district', trim(pa.district), lower(trim(pa.district))
+        FROM property_address pa
+        JOIN locations c ON c.level = 'country' AND c.normalized_name = lower(trim(pa.country))
+        JOIN locations s ON s.level = 'state' AND s.parent_id = c.id AND s.normalized_name = lower(trim(pa.state))
+        ORDER BY s.id, lower(trim(pa.district))
+    """)
+    op.execute("""
+        UPDATE property_address pa
+        SET country_location_id = c.id, state_location_id = s.id, district_location_id = d.id
+        FROM locations c, locations s, locations d
+        WHERE c.level = 'country' AND c.normalized_name = lower(trim(pa.country))
+          AND s.level = 'state' AND s.parent_id = c.id AND s.normalized_name = lower(trim(pa.state))
+          AND d.level = 'district' AND d.parent_id = s.id AND d.normalized_name = lower(trim(pa.district))
+    """)
+    for level, column in LOCATION_LEVELS:
+        op.execute(f"""
+            UPDATE locations l
+            SET centroid = sub.centroid
+            FROM (
+                SELECT {column} AS location_id, ST_Centroid(ST_Collect(location::geometry))::geography AS centroid
+                FROM property_address
+                WHERE {column} IS NOT NULL AND location IS NOT NULL
+                GROUP BY {column}
+            ) sub
+            WHERE l.id = sub.location_id
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for level, column in reversed(LOCATION_LEVELS):
+        op.drop_index(f'ix_property_address_{column}', table_name='property_address')
+        op.drop_constraint(f'fk_property_address_{column}', 'property_address', type_='foreignkey')
+        op.drop_column('property_address', column)
+    op.drop_index('idx_locations_level_name', table_name='locations')
+    op.drop_index('uq_locations_level_parent_name', table_name='locations')
+    op.drop_table('locations')
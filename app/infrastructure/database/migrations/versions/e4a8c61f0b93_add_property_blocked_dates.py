@@ -0,0 +1,40 @@
+"""add property blocked dates
+
+Revision ID: e4a8c61f0b93
+Revises: b7e41d9c3a62
+Create Date: 2026-10-18 13:05:48.519230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a8c61f0b93'
+down_revision: Union[str, Sequence[str], None] = 'b7e41d9c3a62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # btree_gist provides the GiST operator class for the integer equality part of the exclusion constraint
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.create_table('property_blocked_dates',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('property_id', sa.Integer(), nullable=False),
+    sa.Column('period', postgresql.DATERANGE(), nullable=False),
+    sa.Column('reason', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['property_id'], ['property.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    postgresql.ExcludeConstraint(('property_id', '='), ('period', '&&'), name='excl_property_blocked_dates_overlap', using='gist')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('property_blocked_dates')
@@ -0,0 +1,90 @@
+"""add property search doc
+
+Revision ID: f2c7d94b18e5
+Revises: e4a8c61f0b93
+Create Date: 2026-10-18 14:21:09.663184
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import geoalchemy2
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c7d94b18e5'
+down_revision: Union[str, Sequence[str], None] = 'e4a8c61f0b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('property_search_doc',
+    sa.Column('property_id', sa.Integer(), nullable=False),
+    sa.Column('host_id', sa.Integer(), nullable=False),
+    sa.Column('property_name', sa.String(length=255), nullable=False),
+    sa.Column('property_description', sa.TEXT(), nullable=False),
+    sa.Column('property_type', sa.String(length=255), nullable=False),
+    sa.Column('child_friendly', sa.Boolean(), nullable=False),
+    sa.Column('max_guests', sa.Integer(), nullable=False),
+    sa.Column('bedrooms', sa.Integer(), nullable=False),
+    sa.Column('price_per_night', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('house_name', sa.String(length=255), nullable=False),
+    sa.Column('landmark', sa.String(length=255), nullable=True),
+    sa.Column('pincode', sa.String(length=255), nullable=False),
+    sa.Column('district', sa.String(length=255), nullable=False),
+    sa.Column('state', sa.String(length=255), nullable=False),
+    sa.Column('country', sa.String(length=255), nullable=False),
+    sa.Column('country_location_id', sa.Integer(), nullable=True),
+    sa.Column('state_location_id', sa.Integer(), nullable=True),
+    sa.Column('district_location_id', sa.Integer(), nullable=True),
+    sa.Column('primary_image_url', sa.String(length=500), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('location', geoalchemy2.types.Geography(geometry_type='POINT', srid=4326, dimension=2, spatial_index=False, from_text='ST_GeogFromText', name='geography'), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['property_id'], ['property.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('property_id')
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS idx_property_search_doc_location ON property_search_doc USING gist (location)")
+    op.create_index('ix_property_search_doc_country_location_id', 'property_search_doc', ['country_location_id'], unique=False)
+    op.create_index('ix_property_search_doc_state_location_id', 'property_search_doc', ['state_location_id'], unique=False)
+    op.create_index('ix_property_search_doc_district_location_id', 'property_search_doc', ['district_location_id'], unique=False)
+    op.create_index(
+        'idx_property_search_doc_child_friendly_created_at',
+        'property_search_doc',
+        [sa.text('child_friendly DESC'), sa.text('created_at DESC'), sa.text('property_id DESC')],
+        unique=False
+    )
+
+    # Populate one document per existing property, the application keeps it in sync from here on
+    op.execute("""
+        INSERT INTO property_search_doc (
+            property_id, host_id, property_name, property_description, property_type, child_friendly,
+            max_guests, bedrooms, price_per_night, house_name, landmark, pincode, district, state, country,
+            country_location_id, state_location_id, district_location_id, primary_image_url,
+            latitude, longitude, location, created_at, updated_at
+        )
+        SELECT
+            p.id, p.host_id, p.property_name, p.property_description, p.property_type, p.child_friendly,
+            p.max_guests, p.bedrooms, p.price_per_night, pa.house_name, pa.landmark, pa.pincode, pa.district, pa.state, pa.country,
+            pa.country_location_id, pa.state_location_id, pa.district_location_id,
+            (SELECT pi.image_url FROM property_images pi WHERE pi.property_id = p.id AND pi.is_primary ORDER BY pi.id LIMIT 1),
+            ST_Y(pa.location::geometry), ST_X(pa.location::geometry), pa.location, p.created_at, p.updated_at
+        FROM property p
+        JOIN property_address pa ON pa.property_id = p.id
+        ON CONFLICT (property_id) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_property_search_doc_child_friendly_created_at', table_name='property_search_doc')
+    op.drop_index('ix_property_search_doc_district_location_id', table_name='property_search_doc')
+    op.drop_index('ix_property_search_doc_state_location_id', table_name='property_search_doc')
+    op.drop_index('ix_property_search_doc_country_location_id', table_name='property_search_doc')
+    op.drop_index('idx_property_search_doc_location', table_name='property_search_doc', postgresql_using='gist')
+    op.drop_table('property_search_doc')
@@ -1,7 +1,8 @@
 from app.infrastructure.database.session import Base
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, func, Numeric, TEXT
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, DateTime, func, Numeric, TEXT, Float
 from geoalchemy2 import Geography
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import UniqueConstraint, Index, text
+from sqlalchemy.dialects.postgresql import DATERANGE, ExcludeConstraint
 
 class Guide(Base):
     __tablename__ = 'guide'
@@ -23,6 +24,12 @@ class Guide(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    __table_args__ = (
+        Index('idx_guide_district_trgm', 'district', postgresql_using='gin', postgresql_ops={'district': 'gin_trgm_ops'}),
+        Index('idx_guide_state_trgm', 'state', postgresql_using='gin', postgresql_ops={'state': 'gin_trgm_ops'}),
+        Index('idx_guide_country_trgm', 'country', postgresql_using='gin', postgresql_ops={'country': 'gin_trgm_ops'}),
+    )
+
 class Languages(Base):
     __tablename__ = 'languages'
 
@@ -82,6 +89,79 @@ class PropertyAddress(Base):
     state = Column(String(255), nullable=False)
     country = Column(String(255), nullable=False)
     location = Column(Geography(geometry_type="POINT", srid=4326), nullable=True)
+    country_location_id = Column(Integer, ForeignKey('locations.id', ondelete='SET NULL'), nullable=True, index=True)
+    state_location_id = Column(Integer, ForeignKey('locations.id', ondelete='SET NULL'), nullable=True, index=True)
+    district_location_id = Column(Integer, ForeignKey('locations.id', ondelete='SET NULL'), nullable=True, index=True)
+
+class Location(Base):
+    '''Normalized country -> state -> district hierarchy that property addresses are linked to'''
+    __tablename__ = 'locations'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    parent_id = Column(Integer, ForeignKey('locations.id', ondelete='CASCADE'), nullable=True)
+    level = Column(String(20), nullable=False)
+    name = Column(String(255), nullable=False)
+    normalized_name = Column(String(255), nullable=False)
+    centroid = Column(Geography(geometry_type="POINT", srid=4326, spatial_index=False), nullable=True)
+
+    __table_args__ = (
+        Index('uq_locations_level_parent_name', 'level', text('COALESCE(parent_id, 0)'), 'normalized_name', unique=True),
+        Index('idx_locations_level_name', 'level', 'normalized_name'),
+    )
+
+class PropertyBlockedDates(Base):
+    '''Dates a property cannot be booked for, either taken by a booking or blocked by the host'''
+    __tablename__ = 'property_blocked_dates'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    property_id = Column(Integer, ForeignKey('property.id', ondelete='CASCADE'), nullable=False)
+    period = Column(DATERANGE, nullable=False)  # half open [check-in, check-out)
+    reason = Column(String(20), nullable=False, default='booking')  # 'booking' or 'blocked'
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # GiST index on (property_id, period) that rejects overlapping periods and serves the availability anti-join
+        ExcludeConstraint(
+            ('property_id', '='),
+            ('period', '&&'),
+            name='excl_property_blocked_dates_overlap',
+            using='gist'
+        ),
+    )
+
+class PropertySearchDoc(Base):
+    '''One denormalized row per property with everything the traveller search returns, kept in sync on write'''
+    __tablename__ = 'property_search_doc'
+
+    property_id = Column(Integer, ForeignKey('property.id', ondelete='CASCADE'), primary_key=True)
+    host_id = Column(Integer, nullable=False)
+    property_name = Column(String(255), nullable=False)
+    property_description = Column(TEXT, nullable=False)
+    property_type = Column(String(255), nullable=False)
+    child_friendly = Column(Boolean, nullable=False)
+    max_guests = Column(Integer, nullable=False)
+    bedrooms = Column(Integer, nullable=False)
+    price_per_night = Column(Numeric(10,2), nullable=False)
+    house_name = Column(String(255), nullable=False)
+    landmark = Column(String(255), nullable=True)
+    pincode = Column(String(255), nullable=False)
+    district = Column(String(255), nullable=False)
+    state = Column(String(255), nullable=False)
+    country = Column(String(255), nullable=False)
+    country_location_id = Column(Integer, nullable=True, index=True)
+    state_location_id = Column(Integer, nullable=True, index=True)
+    district_location_id = Column(Integer, nullable=True, index=True)
+    primary_image_url = Column(String(500), nullable=True)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    location = Column(Geography(geometry_type="POINT", srid=4326), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        # Serves the ordering of searches without coordinates
+        Index('idx_property_search_doc_child_friendly_created_at', child_friendly.desc(), created_at.desc(), property_id.desc()),
+    )
 
 class PropertyAmenities(Base):
     __tablename__ = 'property_amenities'
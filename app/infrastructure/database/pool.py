@@ -0,0 +1,47 @@
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+'''Queue pool that keeps the numbers needed to size it: how long checkouts wait for a connection, how often the
+pool has to open overflow connections beyond pool_size and how often a checkout times out. Every uvicorn worker has
+its own pool, so pool_size + max_overflow times the number of workers must stay below Postgres max_connections.
+'''
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.overflow_events = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        overflow_before = self.overflow()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        waited = time.perf_counter() - started
+        self.checkouts += 1
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        if self.overflow() > overflow_before and self.overflow() > 0:
+            self.overflow_events += 1
+        return connection
+
+    def metrics(self)->dict:
+        return {
+            'pool_size': self.size(),
+            'checked_out': self.checkedout(),
+            'checked_in': self.checkedin(),
+            'overflow': max(self.overflow(), 0),
+            'checkouts': self.checkouts,
+            'overflow_events': self.overflow_events,
+            'timeouts': self.timeouts,
+            'avg_wait_ms': (self.total_wait_seconds / self.checkouts) * 1000 if self.checkouts else 0.0,
+            'max_wait_ms': self.max_wait_seconds * 1000
+        }
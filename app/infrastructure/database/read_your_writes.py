@@ -0,0 +1,56 @@
+import asyncio
+from cachetools import TTLCache
+from app.config.database import db_settings
+from app.core.redis.redis_repo import RedisRepoInterface
+from app.infrastructure.config.redis_settings_adaptor import get_core_redis_settings
+from app.infrastructure.redis.redis_client import RedisClient
+import logging
+
+logger = logging.getLogger(__name__)
+
+'''Read your writes for requests served from the read replica.
+
+Every commit made on behalf of a user marks them as a recent writer for READ_YOUR_WRITES_SECONDS, and their reads
+go to the primary for that long so they never see the replica lagging behind their own change. The mark is kept in
+this process and in Redis, so the next request sees it whichever worker serves it.
+'''
+
+_recent_writers = TTLCache(maxsize=10000, ttl=db_settings.READ_YOUR_WRITES_SECONDS)
+_pending_marks: set[asyncio.Task] = set()
+_redis_repo: RedisRepoInterface | None = None
+
+
+def _get_redis_repo()->RedisRepoInterface:
+    global _redis_repo
+    if _redis_repo is None:
+        _redis_repo = RedisClient(get_core_redis_settings())
+    return _redis_repo
+
+
+async def _mark_in_redis(user_id: str)->None:
+    try:
+        await _get_redis_repo().mark_recent_write(user_id, db_settings.READ_YOUR_WRITES_SECONDS)
+    except Exception as e:
+        logger.warning(f"Failed to record recent write for user {user_id}: {str(e)}")
+
+
+def mark_recent_write(user_id: str)->None:
+    """Called from the commit hook, which is synchronous, so the Redis write runs as a task"""
+    _recent_writers[user_id] = True
+    try:
+        task = asyncio.get_running_loop().create_task(_mark_in_redis(user_id))
+    except RuntimeError:
+        return
+    _pending_marks.add(task)
+    task.add_done_callback(_pending_marks.discard)
+
+
+async def has_recent_write(user_id: str)->bool:
+    if user_id in _recent_writers:
+        return True
+    try:
+        return await _get_redis_repo().has_recent_write(user_id)
+    except Exception as e:
+        #without knowing, the primary is the safe choice
+        logger.warning(f"Failed to check recent writes for user {user_id}: {str(e)}")
+        return True
@@ -1,23 +1,73 @@
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import declarative_base, Session
 from app.config.database import db_settings
+from app.infrastructure.database.pool import InstrumentedQueuePool
+from app.infrastructure.database.read_your_writes import mark_recent_write
+from app.infrastructure.metrics import register_metrics
+
+
+def _create_engine(url: str):
+    #the prepared statement cache is an asyncpg connect option, other drivers do not accept it
+    connect_args = {}
+    if make_url(url).get_driver_name() == 'asyncpg':
+        connect_args['statement_cache_size'] = db_settings.STATEMENT_CACHE_SIZE
+
+    return create_async_engine(
+        url, 
+        echo = db_settings.ECHO_LOG,
+        poolclass = InstrumentedQueuePool,
+        pool_size = db_settings.POOL_SIZE,
+        max_overflow = db_settings.MAX_OVERFLOW,
+        pool_timeout = db_settings.POOL_TIMEOUT_SECONDS,
+        pool_recycle = db_settings.POOL_RECYCLE_SECONDS,
+        pool_pre_ping = db_settings.POOL_PRE_PING,
+        connect_args = connect_args
+    )
+
+engine = _create_engine(db_settings.URL)
+
+#looked up on every collection since disposing the engine replaces its pool
+register_metrics('database_pool', lambda: engine.sync_engine.pool.metrics())
+
+#read only queries go to the replica when one is configured, otherwise everything stays on the primary
+replica_engine = _create_engine(db_settings.REPLICA_URL) if db_settings.REPLICA_URL else None
+if replica_engine is not None:
+    register_metrics('database_replica_pool', lambda: replica_engine.sync_engine.pool.metrics())
+
+
+class PrimarySession(Session):
+    '''Sessions on the primary, commits made for a user send that user's reads to the primary for a while'''
+
+
+@event.listens_for(PrimarySession, 'after_commit')
+def _record_user_write(session: Session):
+    user_id = session.info.get('user_id')
+    if user_id and replica_engine is not None:
+        mark_recent_write(str(user_id))
 
-engine = create_async_engine(
-    db_settings.URL, 
-    echo = db_settings.ECHO_LOG
-)
 
 SessionLocal = async_sessionmaker(
     bind=engine,
     expire_on_commit = False,
     autocommit = False,
+    autoflush= True,
+    sync_session_class = PrimarySession
+    )
+
+ReplicaSessionLocal = async_sessionmaker(
+    bind=replica_engine or engine,
+    expire_on_commit = False,
+    autocommit = False,
     autoflush= True
     )
 
 Base = declarative_base()
 
-async def get_db():
+async def get_db(request: Request):
     async with SessionLocal() as session:
+        #the jwt middleware puts the user on the request, commits then count as that user's writes
+        session.info['user_id'] = getattr(request.state, 'user_id', None)
         yield session
-
-    
\ No newline at end of file
@@ -0,0 +1,173 @@
+import asyncio
+import re
+import time
+from typing import Optional
+import httpx
+from jose import jwt, JWTError
+from app.core.entities import GoogleSettingsEntity
+from app.infrastructure.metrics import register_metrics, unregister_metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+'''Verification of Google ID tokens against a process wide cache of Google's signing keys.
+
+The JWKS document is fetched asynchronously and kept for as long as its Cache-Control max-age allows. Shortly
+before it expires a background refresh is started while the cached keys keep serving, a token signed with a key id
+that is not cached (Google rotated its keys) forces a refresh, rate limited so forged key ids cannot hammer Google.
+The signature and claims check is CPU work and runs in a worker thread, off the event loop.
+'''
+
+GOOGLE_ISSUERS = ('accounts.google.com', 'https://accounts.google.com')
+DEFAULT_MAX_AGE_SECONDS = 3600
+REFRESH_AHEAD_SECONDS = 300
+REFRESH_AHEAD_MAX_FRACTION = 0.1  #of the max-age, a short lived key set is not refreshed on every call
+MIN_FORCED_REFRESH_INTERVAL_SECONDS = 30
+FETCH_TIMEOUT_SECONDS = 5
+
+_MAX_AGE_PATTERN = re.compile(r'max-age=(\d+)')
+
+
+def _max_age(response: httpx.Response)->int:
+    """Seconds the key set may be cached for, from Cache-Control less the Age the response already has"""
+    match = _MAX_AGE_PATTERN.search(response.headers.get('cache-control', ''))
+    if not match:
+        return DEFAULT_MAX_AGE_SECONDS
+    age = response.headers.get('age', '0')
+    return max(int(match.group(1)) - (int(age) if age.isdigit() else 0), 0)
+
+
+class GoogleIdTokenVerifier:
+    def __init__(self, client_id: str, jwks_url: str):
+        self.client_id = client_id
+        self.jwks_url = jwks_url
+        self._keys: dict[str, dict] = {}  # key id -> JWK
+        self._expires_at = 0.0
+        self._refresh_ahead = REFRESH_AHEAD_SECONDS
+        self._last_forced_refresh = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._http: Optional[httpx.AsyncClient] = None
+        self._fetches = 0
+        self._fetch_failures = 0
+        self._verifications = 0
+
+    async def _fetch_keys(self)->None:
+        if self._http is None:
+            self._http = httpx.AsyncClient(timeout=FETCH_TIMEOUT_SECONDS)
+        self._fetches += 1
+        try:
+            response = await self._http.get(self.jwks_url)
+            response.raise_for_status()
+            keys = {key['kid']: key for key in response.json()['keys']}
+        except Exception:
+            self._fetch_failures += 1
+            raise
+        max_age = _max_age(response)
+        self._keys = keys
+        self._expires_at = time.time() + max_age
+        self._refresh_ahead = min(REFRESH_AHEAD_SECONDS, max_age * REFRESH_AHEAD_MAX_FRACTION)
+        logger.info(f"Loaded {len(keys)} Google signing keys")
+
+    async def _refresh(self, force: bool = False)->None:
+        async with self._lock:
+            #another caller may have refreshed while this one waited for the lock
+            if not force and self._expires_at - time.time() > self._refresh_ahead:
+                return
+            await self._fetch_keys()
+
+    def _refresh_in_background(self)->None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(self._refresh())
+        self._refresh_task.add_done_callback(self._log_refresh_failure)
+
+    @staticmethod
+    def _log_refresh_failure(task: asyncio.Task)->None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background refresh of Google signing keys failed: {str(task.exception())}")
+
+    async def _get_key(self, key_id: str)->dict:
+        now = time.time()
+        if not self._keys:
+            #nothing is cached, the caller has to wait for the fetch
+            await self._refresh()
+        elif now >= self._expires_at:
+            try:
+                await self._refresh()
+            except Exception as e:
+                #Google rotates keys well ahead of retiring them, stale keys beat failing every login
+                logger.warning(f"Refreshing expired Google signing keys failed, using the cached ones: {str(e)}")
+        elif self._expires_at - now <= self._refresh_ahead:
+            self._refresh_in_background()
+
+        key = self._keys.get(key_id)
+        if key is None and time.time() - self._last_forced_refresh >= MIN_FORCED_REFRESH_INTERVAL_SECONDS:
+            self._last_forced_refresh = time.time()
+            await self._refresh(force=True)
+            key = self._keys.get(key_id)
+        if key is None:
+            raise ValueError("Invalid Google token: unknown signing key")
+        return key
+
+    def _decode(self, google_token: str, key: dict)->dict:
+        try:
+            return jwt.decode(
+                google_token,
+                key,
+                algorithms=[key.get('alg', 'RS256')],
+                audience=self.client_id,
+                issuer=GOOGLE_ISSUERS,
+                #at_hash can only be checked against an access token, which is not part of this flow
+                options={'verify_at_hash': False}
+            )
+        except JWTError as e:
+            raise ValueError(f"Invalid Google token: {str(e)}")
+
+    async def verify(self, google_token: str)->dict:
+        try:
+            key_id = jwt.get_unverified_header(google_token).get('kid')
+        except JWTError as e:
+            raise ValueError(f"Invalid Google token: {str(e)}")
+        if not key_id:
+            raise ValueError("Invalid Google token: missing key id")
+
+        key = await self._get_key(key_id)
+        self._verifications += 1
+        return await asyncio.to_thread(self._decode, google_token, key)
+
+    async def close(self)->None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def metrics(self)->dict:
+        return {
+            'cached_keys': len(self._keys),
+            'expires_in_seconds': max(self._expires_at - time.time(), 0),
+            'fetches': self._fetches,
+            'fetch_failures': self._fetch_failures,
+            'verifications': self._verifications
+        }
+
+
+_verifier: Optional[GoogleIdTokenVerifier] = None
+
+
+def get_google_id_token_verifier(google_settings: GoogleSettingsEntity)->GoogleIdTokenVerifier:
+    global _verifier
+    if _verifier is None:
+        _verifier = GoogleIdTokenVerifier(client_id=google_settings.CLIENT_ID, jwks_url=google_settings.JWKS_URL)
+        register_metrics('google_id_token', _verifier.metrics)
+    return _verifier
+
+
+async def close_google_id_token_verifier()->None:
+    global _verifier
+    if _verifier is not None:
+        await _verifier.close()
+        unregister_metrics('google_id_token')
+        _verifier = None
@@ -0,0 +1,29 @@
+from typing import Callable, Dict
+import logging
+
+logger = logging.getLogger(__name__)
+
+'''In-process registry of runtime metrics. Components register a provider returning a dict of their current
+counters and the admin metrics endpoint collects them all on demand, nothing is computed on the hot path.
+'''
+
+_providers: Dict[str, Callable[[], dict]] = {}
+
+
+def register_metrics(name: str, provider: Callable[[], dict])->None:
+    _providers[name] = provider
+
+
+def unregister_metrics(name: str)->None:
+    _providers.pop(name, None)
+
+
+def collect_metrics()->dict:
+    metrics = {}
+    for name, provider in list(_providers.items()):
+        try:
+            metrics[name] = provider()
+        except Exception as e:
+            logger.warning(f"Failed to collect metrics for {name}: {str(e)}")
+            metrics[name] = None
+    return metrics
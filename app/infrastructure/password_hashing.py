@@ -0,0 +1,94 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+from app.core.entities import PasswordHashingSettingsEntity
+from app.core.exceptions import PasswordHashingBusyError
+from app.infrastructure.metrics import register_metrics, unregister_metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+'''Bounded executor for bcrypt.
+
+A bcrypt hash or verify takes tens of milliseconds of CPU, run on the event loop it stalls every other request the
+worker is serving. The calls run on a small dedicated thread pool instead, bcrypt releases the GIL while hashing so
+the loop keeps serving. At most WORKERS calls run at once and MAX_QUEUE more may wait, past that callers get
+PasswordHashingBusyError straight away rather than queueing behind a login burst.
+'''
+
+T = TypeVar('T')
+
+
+class PasswordHashingExecutor:
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hashing')
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait_seconds = 0.0
+        self._total_hash_seconds = 0.0
+        self._max_hash_seconds = 0.0
+
+    async def run(self, func: Callable[..., T], *args)->T:
+        if self._pending >= self.workers + self.max_queue:
+            self._rejected += 1
+            raise PasswordHashingBusyError("Too many password checks in progress, please try again shortly")
+
+        submitted_at = time.perf_counter()
+
+        def timed_call():
+            started_at = time.perf_counter()
+            result = func(*args)
+            return result, started_at - submitted_at, time.perf_counter() - started_at
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, waited, took = await loop.run_in_executor(self._executor, timed_call)
+        finally:
+            self._pending -= 1
+
+        self._completed += 1
+        self._total_wait_seconds += waited
+        self._total_hash_seconds += took
+        self._max_hash_seconds = max(self._max_hash_seconds, took)
+        return result
+
+    def shutdown(self)->None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def metrics(self)->dict:
+        return {
+            'workers': self.workers,
+            'max_queue': self.max_queue,
+            'running': min(self._pending, self.workers),
+            'queue_depth': max(self._pending - self.workers, 0),
+            'completed': self._completed,
+            'rejected': self._rejected,
+            'avg_queue_wait_ms': (self._total_wait_seconds / self._completed) * 1000 if self._completed else 0.0,
+            'avg_hash_ms': (self._total_hash_seconds / self._completed) * 1000 if self._completed else 0.0,
+            'max_hash_ms': self._max_hash_seconds * 1000
+        }
+
+
+_executor: Optional[PasswordHashingExecutor] = None
+
+
+def get_password_hashing_executor(settings: PasswordHashingSettingsEntity)->PasswordHashingExecutor:
+    global _executor
+    if _executor is None:
+        _executor = PasswordHashingExecutor(workers=settings.WORKERS, max_queue=settings.MAX_QUEUE)
+        register_metrics('password_hashing', _executor.metrics)
+        logger.info(f"Created password hashing executor with {settings.WORKERS} workers")
+    return _executor
+
+
+def shutdown_password_hashing_executor()->None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        unregister_metrics('password_hashing')
+        _executor = None
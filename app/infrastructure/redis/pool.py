@@ -0,0 +1,90 @@
+import time
+from typing import Optional
+from redis import asyncio as aioredis
+from app.core.entities import RedisSettingsEntity
+from app.infrastructure.metrics import register_metrics, unregister_metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+'''Process wide Redis connection pool.
+
+Every RedisClient shares this pool instead of opening its own, so requests reuse warm connections. The pool is
+opened by the FastAPI lifespan handler and closed on shutdown; code running outside the app (CLI commands) gets
+it created on first use. When all connections are busy callers wait up to POOL_TIMEOUT_SECONDS for one to be
+released instead of opening more.
+'''
+
+
+class InstrumentedConnectionPool(aioredis.BlockingConnectionPool):
+    """Blocking pool that records how long callers wait to check out a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    async def get_connection(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await super().get_connection(*args, **kwargs)
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def metrics(self)->dict:
+        in_use = len(getattr(self, '_in_use_connections', ()))
+        idle = len([connection for connection in getattr(self, '_available_connections', ()) if connection is not None])
+        return {
+            'max_connections': self.max_connections,
+            'in_use': in_use,
+            'idle': idle,
+            'checkouts': self.checkouts,
+            'avg_wait_ms': (self.total_wait_seconds / self.checkouts) * 1000 if self.checkouts else 0.0,
+            'max_wait_ms': self.max_wait_seconds * 1000
+        }
+
+
+_pool: Optional[InstrumentedConnectionPool] = None
+
+
+def get_redis_pool(redis_settings: RedisSettingsEntity)->InstrumentedConnectionPool:
+    global _pool
+    if _pool is None:
+        _pool = InstrumentedConnectionPool(
+            host=redis_settings.HOST,
+            port=redis_settings.PORT,
+            db=redis_settings.DB,
+            password=redis_settings.PASSWORD or None,
+            decode_responses=True,
+            max_connections=redis_settings.POOL_MAX_CONNECTIONS,
+            timeout=redis_settings.POOL_TIMEOUT_SECONDS,
+            socket_connect_timeout=redis_settings.SOCKET_CONNECT_TIMEOUT_SECONDS,
+            socket_timeout=redis_settings.SOCKET_TIMEOUT_SECONDS,
+            health_check_interval=redis_settings.HEALTH_CHECK_INTERVAL_SECONDS
+        )
+        register_metrics('redis_pool', _pool.metrics)
+        logger.info(f"Created Redis connection pool with {redis_settings.POOL_MAX_CONNECTIONS} connections")
+    return _pool
+
+
+async def open_redis_pool(redis_settings: RedisSettingsEntity)->None:
+    """Create the pool and check Redis is reachable, called on application startup"""
+    pool = get_redis_pool(redis_settings)
+    try:
+        await aioredis.Redis(connection_pool=pool).ping()
+    except Exception as e:
+        #the app still starts, Redis backed features degrade until it is reachable
+        logger.warning(f"Redis is not reachable on startup: {str(e)}")
+
+
+async def close_redis_pool()->None:
+    """Disconnect every pooled connection, called on application shutdown"""
+    global _pool
+    if _pool is not None:
+        await _pool.disconnect()
+        unregister_metrics('redis_pool')
+        _pool = None
@@ -0,0 +1,79 @@
+import hashlib
+import json
+import math
+
+'''Helpers for the property search cache.
+
+Search results are keyed by the query with its coordinates snapped to a fine grid, so nearby searches share
+an entry. Invalidation works on coarse tiles instead: every cached search records the version counters of
+the tiles its radius touches, and a property write bumps the counter of the tile it sits in, which makes
+every search that could have returned it miss on the next read.
+'''
+
+#size of the invalidation tiles in degrees, kept at or above the search radius so a search touches few tiles
+INVALIDATION_TILE_DEGREES = 1.0
+#searches touching more tiles than this (very large radius or near the poles) only use the global version
+MAX_TILES_PER_SEARCH = 16
+#bumped on every property write, used by searches that are not bounded by coordinates
+GLOBAL_CELL = 'global'
+METERS_PER_DEGREE_LATITUDE = 111320
+
+
+def snap_coordinate(value: float, grid_degrees: float)->float:
+    return round(round(value / grid_degrees) * grid_degrees, 6)
+
+
+def _wrap_longitude_tile(tile: int)->int:
+    tiles_around = int(round(360 / INVALIDATION_TILE_DEGREES))
+    offset = int(round(180 / INVALIDATION_TILE_DEGREES))
+    return ((tile + offset) % tiles_around) - offset
+
+
+def cell_for_point(latitude: float, longitude: float)->str:
+    lat_tile = math.floor(latitude / INVALIDATION_TILE_DEGREES)
+    lon_tile = _wrap_longitude_tile(math.floor(longitude / INVALIDATION_TILE_DEGREES))
+    return f"{lat_tile}:{lon_tile}"
+
+
+def cells_for_radius(latitude: float, longitude: float, radius_meters: float)->list[str]:
+    """Tiles intersecting the bounding box of a search circle, or just the global cell if there are too many"""
+    lat_delta = radius_meters / METERS_PER_DEGREE_LATITUDE
+    min_lat = max(latitude - lat_delta, -90.0)
+    max_lat = min(latitude + lat_delta, 90.0)
+
+    #widest longitude span of the circle is at the latitude closest to a pole
+    widest_latitude = min(max(abs(min_lat), abs(max_lat)), 89.999)
+    lon_delta = radius_meters / (METERS_PER_DEGREE_LATITUDE * math.cos(math.radians(widest_latitude)))
+    if lon_delta >= 180:
+        return [GLOBAL_CELL]
+
+    lat_tiles = range(math.floor(min_lat / INVALIDATION_TILE_DEGREES), math.floor(max_lat / INVALIDATION_TILE_DEGREES) + 1)
+    lon_tiles = range(
+        math.floor((longitude - lon_delta) / INVALIDATION_TILE_DEGREES),
+        math.floor((longitude + lon_delta) / INVALIDATION_TILE_DEGREES) + 1
+    )
+    if len(lat_tiles) * len(lon_tiles) > MAX_TILES_PER_SEARCH:
+        return [GLOBAL_CELL]
+
+    return [f"{lat_tile}:{_wrap_longitude_tile(lon_tile)}" for lat_tile in lat_tiles for lon_tile in lon_tiles]
+
+
+def cells_for_property_write(*coordinates: dict | None)->list[str]:
+    """Cells to bump when a property at any of the given {'latitude', 'longitude'} locations changes"""
+    cells = [GLOBAL_CELL]
+    for coordinate in coordinates:
+        if coordinate and coordinate.get('latitude') is not None and coordinate.get('longitude') is not None:
+            cell = cell_for_point(float(coordinate['latitude']), float(coordinate['longitude']))
+            if cell not in cells:
+                cells.append(cell)
+    return cells
+
+
+def build_search_key(kind: str, params: dict, cells: list[str], versions: list[int])->str:
+    canonical = json.dumps(
+        {'kind': kind, 'params': params, 'cells': dict(zip(cells, versions))},
+        sort_keys=True,
+        separators=(',', ':'),
+        default=str
+    )
+    return f"property_search:{hashlib.sha1(canonical.encode('utf-8')).hexdigest()}"
@@ -1,71 +1,125 @@
 import json
+import time
+from contextlib import asynccontextmanager
 from redis import asyncio as aioredis
 from app.core.entities import RedisSettingsEntity
 from app.core.redis.redis_repo import RedisRepoInterface
+from app.infrastructure.redis.token_revocation_filter import TOKEN_REVOCATION_CHANNEL, revoked_token_id
+from app.infrastructure.redis.pool import get_redis_pool
 import logging
 logger = logging.getLogger(__name__)
 
+#signup state lives in a hash so the OTP transitions below run server side in a single atomic round trip, HSET and
+#HINCRBY leave the key's TTL untouched so the signup still expires OTP_EXPIRE_SECONDS after it was initiated
+#a signup key of another type (state written before the hash layout) is treated as expired, the user signs up again
+VERIFY_SIGNUP_OTP_SCRIPT = '''
+if redis.call('TYPE', KEYS[1]).ok ~= 'hash' then
+    return {'expired'}
+end
+local stored = redis.call('HMGET', KEYS[1], 'otp', 'attempts')
+if not stored[1] then
+    return {'expired'}
+end
+local attempts = tonumber(stored[2])
+if attempts >= tonumber(ARGV[2]) then
+    return {'locked', attempts}
+end
+if stored[1] ~= ARGV[1] then
+    return {'invalid', redis.call('HINCRBY', KEYS[1], 'attempts', 1)}
+end
+local user_data = redis.call('HGET', KEYS[1], 'user_data')
+redis.call('RENAME', KEYS[1], KEYS[2])
+return {'verified', user_data}
+'''
+
+RESET_SIGNUP_OTP_SCRIPT = '''
+if redis.call('TYPE', KEYS[1]).ok ~= 'hash' then
+    return nil
+end
+redis.call('HSET', KEYS[1], 'otp', ARGV[1], 'attempts', 0)
+return redis.call('HINCRBY', KEYS[1], 'otp_retry_attempts', 1)
+'''
+
+#how long a token revocation subscription waits for a message before polling again
+PUBSUB_POLL_SECONDS = 1.0
+
 class RedisClient(RedisRepoInterface):
     def __init__(self, redis_settings: RedisSettingsEntity):
         self.redis_settings = redis_settings
-        self.client = aioredis.Redis(
-            host = self.redis_settings.HOST,
-            port = self.redis_settings.PORT,
-            db = self.redis_settings.DB,
-            password = self.redis_settings.PASSWORD or None,
-            decode_responses= True,
-            socket_connect_timeout = 5,
-            )
+        self._client = None
+
+    @property
+    def client(self)->aioredis.Redis:
+        #bound to the process wide pool on first use, so constructing a client per request opens no connections
+        if self._client is None:
+            self._client = aioredis.Redis(connection_pool=get_redis_pool(self.redis_settings))
+            #scripts run with EVALSHA and are loaded into Redis only if it does not know them yet
+            self._verify_signup_otp = self._client.register_script(VERIFY_SIGNUP_OTP_SCRIPT)
+            self._reset_signup_otp = self._client.register_script(RESET_SIGNUP_OTP_SCRIPT)
+        return self._client
     
     async def store_signup_data(self, email: str, otp: str, user_data: dict) ->None:
         key = f"signup:{email}"
         data = {
             "otp": otp,
-            "user_data": user_data,
+            "user_data": json.dumps(user_data),
             "attempts": 0,
             "otp_retry_attempts": 0
         }
-        success = await self.client.setex(
-            name=key,
-            time=self.redis_settings.OTP_EXPIRE_SECONDS,
-            value = json.dumps(data)
-        )
-        logger.info(f"is the data saved: {success}")
+        #the delete drops state left by an earlier signup for the same email before the new one is written
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping=data)
+            pipe.expire(key, self.redis_settings.OTP_EXPIRE_SECONDS)
+            await pipe.execute()
+        logger.info(f"Signup data stored for: {email}")
 
     async def get_signup_data(self, email: str)->dict | None:
         key = f"signup:{email}"
-        value = await self.client.get(key)
-        if value is None:
-            logger.info("signup_data found for: %s",email)
+        value = await self.client.hgetall(key)
+        if not value:
+            logger.info("signup_data not found for: %s",email)
             return None
 
-        if isinstance(value, bytes):
-            value_str = value.decode("utf-8")
-        else:
-            value_str = value
-
-        logger.info(f"Signup data for {email}: {value_str}")
-        
-        return json.loads(value) if value else None
+        return {
+            "otp": value["otp"],
+            "user_data": json.loads(value["user_data"]),
+            "attempts": int(value["attempts"]),
+            "otp_retry_attempts": int(value["otp_retry_attempts"])
+        }
     
     async def delete_signup_data(self, email: str)-> None:
         key = f"signup:{email}"
-        self.client.delete(key)
-    
-    async def update_signup_data(self, email: str, **updates)-> None:
-        data = await self.get_signup_data(email)
-        if not data:
-            return
+        await self.client.delete(key)
 
-        #preserve existing ttl for the redis data stored
+    async def verify_signup_otp(self, email: str, otp: str)->tuple[str, dict | int | None]:
         key = f"signup:{email}"
-        ttl = await self.client.ttl(key)
+        client = self.client  #binds the pool and registers the scripts on first use
+        max_attempts = self.redis_settings.MAX_OTP_ATTEMPTS
+        result = await self._verify_signup_otp(keys=[key, f"signup_claimed:{email}"], args=[otp, max_attempts], client=client)
+        status = result[0]
+        if status == 'verified':
+            return status, json.loads(result[1])
+        if status == 'invalid':
+            return status, max(max_attempts - int(result[1]), 0)
+        return status, None
 
-        if ttl <= 0:
-            return
+    async def restore_claimed_signup(self, email: str)->bool:
+        #RENAMENX keeps the ttl and leaves alone a signup initiated again in the meantime
+        try:
+            return bool(await self.client.renamenx(f"signup_claimed:{email}", f"signup:{email}"))
+        except aioredis.ResponseError:
+            #the claimed signup expired
+            return False
 
-        data.update(updates)
-        await self.client.setex(key, ttl, json.dumps(data))
+    async def delete_claimed_signup(self, email: str)->None:
+        await self.client.delete(f"signup_claimed:{email}")
+
+    async def reset_signup_otp(self, email: str, otp: str)->int | None:
+        key = f"signup:{email}"
+        client = self.client
+        retry_attempts = await self._reset_signup_otp(keys=[key], args=[otp], client=client)
+        return int(retry_attempts) if retry_attempts is not None else None
 
 
     #token redis implementations
@@ -74,8 +128,137 @@ class RedisClient(RedisRepoInterface):
         return await self.client.exists(key) > 0
     
     async def store_blacklisted_token(self, token:str, expiry:int)->None:
-        key = f"blacklist{token}"
-        await self.client.setex(key, expiry, '1')
+        key = f"blacklist:{token}"
+        token_id = revoked_token_id(token)
+        now = time.time()
+        expires_at = now + expiry
+        #the index of revoked token ids lets instances load the revocations at startup without scanning keys
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.setex(key, expiry, '1')
+            pipe.zadd("blacklisted_token_ids", {token_id: expires_at})
+            pipe.zremrangebyscore("blacklisted_token_ids", '-inf', now)
+            pipe.publish(TOKEN_REVOCATION_CHANNEL, json.dumps({'id': token_id, 'exp': expires_at}))
+            await pipe.execute()
+
+    async def get_revoked_token_ids(self)->list[tuple[str, float]]:
+        return await self.client.zrangebyscore("blacklisted_token_ids", time.time(), '+inf', withscores=True)
+
+    @asynccontextmanager
+    async def subscribe_token_revocations(self):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(TOKEN_REVOCATION_CHANNEL)
+        try:
+            yield self._iter_token_revocations(pubsub)
+        finally:
+            await pubsub.aclose()
+
+    async def _iter_token_revocations(self, pubsub):
+        #polled with its own read timeout, the pool's socket_timeout would otherwise fail the idle subscription
+        #every few seconds and drop whatever is published while it resubscribes
+        while True:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=PUBSUB_POLL_SECONDS)
+            if message is None or message.get('type') != 'message':
+                continue
+            revocation = json.loads(message['data'])
+            yield revocation['id'], float(revocation['exp'])
+    
+    #guide details cache implementations
+    async def get_cached_guide(self, guide_id: int)->dict | None:
+        key = f"guide:{guide_id}"
+        value = await self.client.get(key)
+        return json.loads(value) if value else None
+
+    #an entry filled from the read replica may predate a write the replica has not applied yet, so it is only kept
+    #for about as long as the replica lags
+    def _cache_expire_seconds(self, expire_seconds: int, from_replica: bool)->int:
+        if from_replica:
+            return min(expire_seconds, self.redis_settings.REPLICA_READ_CACHE_EXPIRE_SECONDS)
+        return expire_seconds
+
+    async def cache_guide(self, guide_id: int, guide_data: dict, from_replica: bool = False)->None:
+        key = f"guide:{guide_id}"
+        expire_seconds = self._cache_expire_seconds(self.redis_settings.GUIDE_CACHE_EXPIRE_SECONDS, from_replica)
+        await self.client.setex(key, expire_seconds, json.dumps(guide_data))
+
+    async def invalidate_cached_guide(self, guide_id: int)->None:
+        key = f"guide:{guide_id}"
+        await self.client.delete(key)
+    
+    #role and permission cache implementations, an entry is tagged with the authz version it was read under and
+    #only served while that is still the user's version, so a read racing an invalidation cannot resurrect it
+    async def get_cached_permissions(self, user_id: str)->dict | None:
+        value, authz_version = await self.client.mget(f"permissions:{user_id}", f"authz_version:{user_id}")
+        if not value:
+            return None
+        cached = json.loads(value)
+        if authz_version is None or cached.get('authz_version') != int(authz_version):
+            return None
+        return cached['permissions']
+
+    async def cache_permissions(self, user_id: str, permissions: dict, authz_version: int)->None:
+        key = f"permissions:{user_id}"
+        value = json.dumps({'authz_version': authz_version, 'permissions': permissions})
+        await self.client.setex(key, self.redis_settings.PERMISSIONS_CACHE_EXPIRE_SECONDS, value)
+
+    async def invalidate_cached_permissions(self, user_ids: list[str])->None:
+        if user_ids:
+            await self.client.delete(*[f"permissions:{user_id}" for user_id in user_ids])
+
+    #authorization version counters, kept without expiry so a bumped version is never forgotten. A counter that is
+    #missing (never set, or lost to a flush, failover or eviction) is started from the current time in milliseconds,
+    #so it cannot come back to a version that tokens issued before were stamped with
+    async def get_authz_version(self, user_id: str)->int | None:
+        value = await self.client.get(f"authz_version:{user_id}")
+        return int(value) if value is not None else None
+
+    async def ensure_authz_version(self, user_id: str)->int:
+        key = f"authz_version:{user_id}"
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.set(key, int(time.time() * 1000), nx=True)
+            pipe.get(key)
+            _, value = await pipe.execute()
+        return int(value)
+
+    async def bump_authz_versions(self, user_ids: list[str])->None:
+        baseline = int(time.time() * 1000)
+        async with self.client.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.set(f"authz_version:{user_id}", baseline, nx=True)
+                pipe.incr(f"authz_version:{user_id}")
+            await pipe.execute()
+
+    #read your writes implementations
+    async def mark_recent_write(self, user_id: str, seconds: float)->None:
+        await self.client.set(f"recent_write:{user_id}", '1', px=int(seconds * 1000))
+
+    async def has_recent_write(self, user_id: str)->bool:
+        return await self.client.exists(f"recent_write:{user_id}") > 0
+
+    #property search cache implementations
+    def get_property_search_grid_degrees(self)->float:
+        return self.redis_settings.PROPERTY_SEARCH_GRID_DEGREES
+
+    async def get_property_search_versions(self, cells: list[str])->list[int]:
+        keys = [f"property_search_version:{cell}" for cell in cells]
+        values = await self.client.mget(keys)
+        return [int(value) if value else 0 for value in values]
+
+    async def bump_property_search_versions(self, cells: list[str])->None:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for cell in cells:
+                pipe.incr(f"property_search_version:{cell}")
+            await pipe.execute()
+
+    async def get_cached_property_search(self, key: str)->dict | None:
+        value = await self.client.get(key)
+        return json.loads(value) if value else None
+
+    async def cache_property_search(self, key: str, search_data: dict, from_replica: bool = False)->None:
+        await self.client.setex(
+            key,
+            self._cache_expire_seconds(self.redis_settings.PROPERTY_SEARCH_CACHE_EXPIRE_SECONDS, from_replica),
+            json.dumps(search_data, separators=(',', ':'))
+        )
     
     async def rotate_tokens(self, user_id: str)->None:
         access_token = self.token_repo.generate_access_token(user_id)
@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+import time
+from app.core.redis.redis_repo import RedisRepoInterface
+import logging
+
+logger = logging.getLogger(__name__)
+
+'''In-process view of the revoked (blacklisted) tokens.
+
+The filter holds the ids of every revoked token that has not expired yet. It is loaded from Redis once the
+pub/sub subscription is up and then kept current from the revocation messages, so the common case of a token
+that was never revoked is answered without any network I/O. A local hit is confirmed against Redis before the
+request is rejected. While the subscription is down the filter is not trusted and every check goes to Redis.
+'''
+
+TOKEN_REVOCATION_CHANNEL = 'token_revocations'
+RESUBSCRIBE_DELAY_SECONDS = 1
+MAX_RESUBSCRIBE_DELAY_SECONDS = 30
+
+
+def revoked_token_id(token: str)->str:
+    """Id a revoked token is published and stored under, avoids holding raw tokens in memory"""
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()[:32]
+
+
+class TokenRevocationFilter:
+    def __init__(self, redis_repo: RedisRepoInterface):
+        self.redis_repo = redis_repo
+        self._revoked: dict[str, float] = {}  # token id -> unix time the revocation expires
+        self._ready = False
+        self._listener: asyncio.Task | None = None
+        self._checks = 0
+        self._possible_hits = 0
+        self._confirmed_hits = 0
+        self._redis_fallbacks = 0
+
+    def add(self, token_id: str, expires_at: float)->None:
+        if expires_at > time.time():
+            self._revoked[token_id] = expires_at
+
+    def _might_be_revoked(self, token: str)->bool:
+        token_id = revoked_token_id(token)
+        expires_at = self._revoked.get(token_id)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            del self._revoked[token_id]
+            return False
+        return True
+
+    async def is_revoked(self, token: str)->bool:
+        self._checks += 1
+        if not self._ready:
+            self._redis_fallbacks += 1
+            return await self.redis_repo.is_token_blacklisted(token)
+
+        if not self._might_be_revoked(token):
+            return False
+
+        self._possible_hits += 1
+        revoked = await self.redis_repo.is_token_blacklisted(token)
+        if revoked:
+            self._confirmed_hits += 1
+        return revoked
+
+    async def load(self)->None:
+        """Replace the local revocations with the current ones in Redis"""
+        revoked = await self.redis_repo.get_revoked_token_ids()
+        now = time.time()
+        self._revoked = {token_id: expires_at for token_id, expires_at in revoked if expires_at > now}
+        logger.info(f"Loaded {len(self._revoked)} revoked tokens")
+
+    async def _listen(self)->None:
+        delay = RESUBSCRIBE_DELAY_SECONDS
+        while True:
+            try:
+                async with self.redis_repo.subscribe_token_revocations() as revocations:
+                    #load after subscribing so no revocation published in between is missed
+                    await self.load()
+                    self._ready = True
+                    delay = RESUBSCRIBE_DELAY_SECONDS
+                    async for token_id, expires_at in revocations:
+                        self.add(token_id, expires_at)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Token revocation subscription failed, checking Redis until it is back: {str(e)}")
+            self._ready = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RESUBSCRIBE_DELAY_SECONDS)
+
+    def start(self)->None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self)->None:
+        self._ready = False
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def metrics(self)->dict:
+        false_positives = self._possible_hits - self._confirmed_hits
+        return {
+            'ready': self._ready,
+            'revoked_tokens': len(self._revoked),
+            'checks': self._checks,
+            'redis_fallbacks': self._redis_fallbacks,
+            'possible_hits': self._possible_hits,
+            'confirmed_hits': self._confirmed_hits,
+            'false_positives': false_positives,
+            'hit_rate': self._confirmed_hits / self._checks if self._checks else 0.0,
+            'false_positive_rate': false_positives / self._possible_hits if self._possible_hits else 0.0
+        }
@@ -1,8 +1,9 @@
 from app.core.repositories import EmailRepo
+from app.infrastructure.task_queues.outbox import get_task_outbox
 
 
 class CeleryEmailRepo(EmailRepo):
-    #Adapter that delegates email sending to Celery
-    def send(self, email: str, otp: str)-> None:
+    #Adapter that delegates email sending to Celery, the task is published in the background by the outbox
+    async def send(self, email: str, otp: str)-> None:
         from app.infrastructure.task_queues.celery import send_otp_email
-        send_otp_email.delay(email, otp)
\ No newline at end of file
+        get_task_outbox().enqueue(send_otp_email, email, otp)
@@ -1,5 +1,6 @@
 from app.core.repositories import GuideProfileInterface
 from app.core.entities import GuideOnboardEntity
+from app.core.redis.redis_repo import RedisRepoInterface
 from app.api.schemas import GuideProfileSchema, AddressSchema
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.infrastructure.database.models.onboard import Guide, Languages
@@ -13,22 +14,56 @@ from typing import Optional
 import logging
 logger = logging.getLogger(__name__) 
 
+'''The guide:{id} cache holds the guide row together with the user's name, profile image and languages, so every
+write to any of those drops the cached entry. A failed invalidation is logged and the entry expires on its own.
+'''
+
+async def invalidate_cached_guides(redis_repo: Optional[RedisRepoInterface], guide_ids: list)->None:
+    """Drop the cached details of the given guides"""
+    if not redis_repo:
+        return
+    for guide_id in guide_ids:
+        try:
+            await redis_repo.invalidate_cached_guide(guide_id)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate cached guide {guide_id}: {e}")
+
+
+async def invalidate_cached_guide_of_user(session: AsyncSession, redis_repo: Optional[RedisRepoInterface], user_id: str)->None:
+    """Drop the cached guide details of a user whose name, profile image or languages changed"""
+    if not redis_repo:
+        return
+    try:
+        guide_id = await session.scalar(select(Guide.id).where(Guide.user_id == int(user_id)))
+    except Exception as e:
+        #the write is already committed, a failed lookup must not fail it
+        logger.warning(f"Failed to look up the guide of user {user_id} for cache invalidation: {e}")
+        return
+    if guide_id is not None:
+        await invalidate_cached_guides(redis_repo, [guide_id])
+
+
 class GuideProfileImpl(GuideProfileInterface):
     def __init__(
             self,
-            session: AsyncSession
+            session: AsyncSession,
+            redis_repo: Optional[RedisRepoInterface] = None,
+            read_session: Optional[AsyncSession] = None
     ):
         self.session = session
+        self.redis_repo = redis_repo
+        #profile reads may be served by the read replica
+        self.read_session = read_session or session
     
     async def get(self, user_id: str)->Optional[GuideProfileSchema]:
-        profile_data = await self.session.scalar(
+        profile_data = await self.read_session.scalar(
             select(Guide).where(Guide.user_id == int(user_id))
         )
 
         if not profile_data:
             return
 
-        languages_result = await self.session.scalars(
+        languages_result = await self.read_session.scalars(
             select(Languages.language).where(Languages.user_id == int(user_id))
         )
         known_languages = languages_result.all()
@@ -77,9 +112,11 @@ class GuideProfileImpl(GuideProfileInterface):
                     if guide_data.coordinates and 'lat' in guide_data.coordinates and 
                     'lon' in guide_data.coordinates else None
                 )
+                .returning(Guide.id)
             )
 
-            await self.session.execute(guide_update_stmt)
+            guide_result = await self.session.execute(guide_update_stmt)
+            guide_ids = guide_result.scalars().all()
 
             delete_languages_stmt = (
                 delete(Languages)
@@ -97,7 +134,8 @@ class GuideProfileImpl(GuideProfileInterface):
                 await self.session.execute(insert(Languages).values(languages_data))
             
             await self.session.commit()
+            await invalidate_cached_guides(self.redis_repo, guide_ids)
             return True
         except SQLAlchemyError as e:
             await self.session.rollback()
-            return False
\ No newline at end of file
+            return False
@@ -1,12 +1,17 @@
-from typing import List
+from typing import List, Tuple, Optional
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text, and_, or_, func
+from sqlalchemy import text, and_, or_, func, Float, false, exists, literal
 from sqlalchemy.future import select
 from geoalchemy2 import functions as geo_funcs
 from app.core.entities.traveller.home_page import PropertySearchEntity, PropertySearchQueryEntity, GuideSearchEntity, GuideSearchQueryEntity
 from app.core.repositories.traveller_home_page import TravellerHomePageRepositoryInterface
-from app.infrastructure.database.models.onboard import Property, PropertyAddress, PropertyImages, Guide, Languages
+from app.core.redis.redis_repo import RedisRepoInterface
+from app.infrastructure.redis.property_search_cache import GLOBAL_CELL, snap_coordinate, cells_for_radius, build_search_key
+from app.infrastructure.database.models.onboard import PropertySearchDoc, Guide, Languages, Location, PropertyBlockedDates
 from app.infrastructure.database.models.users.user import User
+import base64
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,10 +20,300 @@ logger = logging.getLogger(__name__)
 class HomePageRepositoryImpl(TravellerHomePageRepositoryInterface):
     """Implementation of traveller home page repository"""
 
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    # Property search orderings, each one is also the shape of the keyset cursor
+    SORT_CHILD_FRIENDLY_DISTANCE = 'child_friendly_distance'  # (child_friendly DESC, distance ASC, id ASC)
+    SORT_DISTANCE_CHILD_FRIENDLY = 'distance_child_friendly'  # (distance ASC, child_friendly DESC, id ASC)
+    SORT_CHILD_FRIENDLY_CREATED_AT = 'child_friendly_created_at'  # (child_friendly DESC, created_at DESC, id DESC)
 
-    async def search_properties(
+    # Property search radius around the search point, the requested radiusKm is capped server side
+    DEFAULT_SEARCH_RADIUS_KM = 100
+    MAX_SEARCH_RADIUS_KM = 200
+
+    # Location levels from most to least specific, with the property address column linking to each
+    LOCATION_LEVEL_COLUMNS = (
+        ('district', PropertySearchDoc.district_location_id),
+        ('state', PropertySearchDoc.state_location_id),
+        ('country', PropertySearchDoc.country_location_id),
+    )
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        redis_repo: Optional[RedisRepoInterface] = None,
+        read_db: Optional[AsyncSession] = None
+    ):
+        self.redis_repo = redis_repo
+        # Searches and guide details run on the read replica. read_db is the primary itself when there is no
+        # replica or the user wrote moments ago, otherwise a lagging replica result is cached only briefly so it
+        # cannot outlive the write that invalidated the cache by the full TTL
+        self.read_db = read_db or db
+        self.reads_replica = self.read_db is not db
+
+    def _get_search_radius_meters(self, query: PropertySearchQueryEntity) -> float:
+        """
+        Resolve the property search radius in metres, applying the default and the server side cap
+        """
+        radius_km = query.radius_km if query.radius_km is not None else self.DEFAULT_SEARCH_RADIUS_KM
+        return min(radius_km, self.MAX_SEARCH_RADIUS_KM) * 1000
+
+    def _has_coordinates(self, query: PropertySearchQueryEntity) -> bool:
+        return query.latitude is not None and query.longitude is not None
+
+    def _normalize_location_name(self, name: Optional[str]) -> Optional[str]:
+        """
+        Normalize a location name the same way it is stored in locations.normalized_name
+        """
+        if not name or not name.strip():
+            return None
+        return name.strip().lower()
+
+    async def _resolve_destination_location(self, destination: str) -> Optional[Tuple[str, Optional[int]]]:
+        """
+        Resolve a destination string to the most specific matching location
+
+        Returns:
+            (level, location id) of the match, (None, None) if the destination names no known location,
+            or None if there is nothing to resolve
+        """
+        hierarchy = self.parse_destination_hierarchy(destination)
+        names = {level: self._normalize_location_name(hierarchy.get(level)) for level in ('city', 'district', 'state', 'country')}
+        searched_names = {name for name in names.values() if name}
+        if not searched_names:
+            return None
+
+        locations_query = select(Location.id, Location.parent_id, Location.level, Location.normalized_name).where(
+            Location.level.in_([level for level, _ in self.LOCATION_LEVEL_COLUMNS]),
+            Location.normalized_name.in_(searched_names)
+        )
+        locations = (await self.read_db.execute(locations_query)).all()
+
+        # Walk the hierarchy down from the country so a district is only matched inside its own state
+        matched = None
+        parent_id = None
+        for level in ('country', 'state', 'district'):
+            if not names[level]:
+                continue
+            candidates = [
+                location for location in locations
+                if location.level == level and location.normalized_name == names[level]
+                and (parent_id is None or location.parent_id == parent_id)
+            ]
+            if not candidates:
+                break
+            matched = candidates[0]
+            parent_id = matched.id
+
+        if matched is None and locations:
+            # Shorter Mapbox strings ("State, Country") do not line up with the positional hierarchy,
+            # fall back to the most specific location named anywhere in the destination
+            for level, _ in self.LOCATION_LEVEL_COLUMNS:
+                candidates = [location for location in locations if location.level == level]
+                if candidates:
+                    matched = candidates[0]
+                    break
+
+        if matched is None:
+            logger.info(f"Destination '{destination}' does not match any known location")
+            return None, None
+        return matched.level, matched.id
+
+    async def _build_destination_filter(self, query: PropertySearchQueryEntity):
+        """
+        Build the location id predicate for text only searches, None when the search is not filtered by destination
+        """
+        if query.all or self._has_coordinates(query) or not query.destination:
+            return None
+
+        resolved = await self._resolve_destination_location(query.destination)
+        if resolved is None:
+            return None
+
+        level, location_id = resolved
+        if location_id is None:
+            return false()
+        return dict(self.LOCATION_LEVEL_COLUMNS)[level] == location_id
+
+    def _build_property_filters(self, query: PropertySearchQueryEntity, destination_filter=None):
+        """
+        Build the WHERE predicates and the distance expressions shared by the property search and count queries
+        """
+        filters = []
+        distance_calc = None
+        knn_distance = None
+
+        if query.all:
+            return filters, distance_calc, knn_distance
+
+        # Filter by guest capacity (only if guests is provided)
+        if query.guests is not None:
+            filters.append(PropertySearchDoc.max_guests >= query.guests)
+
+        # Exclude properties with a booking or blocked period overlapping the stay. The anti-join probes the
+        # (property_id, period) GiST index behind the exclusion constraint once per candidate property
+        stay_dates = query.get_stay_dates()
+        if stay_dates is not None:
+            check_in, check_out = stay_dates
+            filters.append(~exists().where(
+                PropertyBlockedDates.property_id == PropertySearchDoc.property_id,
+                PropertyBlockedDates.period.overlaps(func.daterange(check_in, check_out, '[)'))
+            ))
+
+        # Apply geographic search if coordinates are provided
+        if query.latitude is not None and query.longitude is not None:
+            # Convert coordinates to geography point
+            search_point = self.convert_lat_lng_to_geography(query.latitude, query.longitude)
+
+            # Exact geodesic distance, only evaluated for the rows that are returned
+            distance_calc = func.ST_Distance(
+                PropertySearchDoc.location,
+                func.ST_GeogFromText(search_point)
+            )
+
+            # KNN distance operator, lets Postgres walk idx_property_search_doc_location nearest-first
+            # instead of computing the exact distance for every candidate before sorting. Only an ordering that
+            # starts with the distance can be served by the index walk, see _build_property_search_query
+            knn_distance = PropertySearchDoc.location.op('<->', return_type=Float)(
+                func.ST_GeogFromText(search_point)
+            )
+
+            # Add distance-based search within the requested radius
+            distance_filter = func.ST_DWithin(
+                PropertySearchDoc.location,
+                func.ST_GeogFromText(search_point),
+                self._get_search_radius_meters(query)
+            )
+            filters.append(distance_filter)
+        elif destination_filter is not None:
+            # Text only search, an equality lookup on the indexed location link instead of a full scan
+            filters.append(destination_filter)
+
+        return filters, distance_calc, knn_distance
+
+    def _build_property_search_query(
+        self,
+        query: PropertySearchQueryEntity,
+        include_total: bool = False,
+        destination_filter=None
+    ):
+        """
+        Build the paginated property search statement, optionally carrying the total match count on every row.
+        The window count reads every match before the LIMIT, so callers only ask for it when the ordering is not
+        served by the KNN index walk (see _uses_window_total)
+        """
+        # Single table read, property_search_doc already carries the address, primary image and coordinates
+        base_query = select(
+            PropertySearchDoc.property_id.label('id'),
+            PropertySearchDoc.property_name,
+            PropertySearchDoc.property_description,
+            PropertySearchDoc.child_friendly,
+            PropertySearchDoc.max_guests,
+            PropertySearchDoc.bedrooms,
+            PropertySearchDoc.price_per_night,
+            PropertySearchDoc.property_type,
+            PropertySearchDoc.created_at,
+            PropertySearchDoc.updated_at,
+            PropertySearchDoc.host_id,
+            PropertySearchDoc.house_name,
+            PropertySearchDoc.landmark,
+            PropertySearchDoc.pincode,
+            PropertySearchDoc.district,
+            PropertySearchDoc.state,
+            PropertySearchDoc.country,
+            PropertySearchDoc.latitude,
+            PropertySearchDoc.longitude,
+            PropertySearchDoc.primary_image_url
+        )
+
+        filters, distance_calc, knn_distance = self._build_property_filters(query, destination_filter)
+        if query.all:
+            logger.info("Processing 'all' query - no filters applied")
+        elif distance_calc is not None:
+            base_query = base_query.add_columns(
+                distance_calc.label('distance'),
+                knn_distance.label('knn_distance')
+            )
+        else:
+            # If no coordinates, add a default distance of 0 for sorting
+            base_query = base_query.add_columns(literal(0.0, Float).label('distance'))
+
+        # Apply all filters
+        if filters:
+            base_query = base_query.filter(and_(*filters))
+
+        if include_total:
+            # Window count is evaluated before LIMIT/OFFSET so each row carries the full total
+            base_query = base_query.add_columns(func.count().over().label('total_count'))
+
+        # Apply sorting based on children_onboard and geographic proximity.
+        # Every ordering ends with the property id so the sort key is unique and can be used as a keyset cursor
+        sort_mode = self._get_sort_mode(query)
+        if sort_mode == self.SORT_CHILD_FRIENDLY_DISTANCE:
+            # When children are onboard, prioritize child-friendly properties
+            # Sort by: child_friendly DESC, then by distance ASC
+            # The leading child_friendly key keeps the GiST index from serving this order nearest-first, every
+            # candidate inside the (capped) search radius is sorted. <-> is still cheaper than ST_Distance per row
+            base_query = base_query.order_by(
+                PropertySearchDoc.child_friendly.desc(),
+                knn_distance.asc(),
+                PropertySearchDoc.property_id.asc()
+            )
+        elif sort_mode == self.SORT_DISTANCE_CHILD_FRIENDLY:
+            # When no children, sort primarily by distance
+            # Sort by: distance ASC, then by child_friendly DESC
+            base_query = base_query.order_by(
+                knn_distance.asc(),
+                PropertySearchDoc.child_friendly.desc(),
+                PropertySearchDoc.property_id.asc()
+            )
+        else:
+            # Without coordinates (or for 'all' query), sort by child_friendly and created_at
+            base_query = base_query.order_by(
+                PropertySearchDoc.child_friendly.desc(),
+                PropertySearchDoc.created_at.desc(),
+                PropertySearchDoc.property_id.desc()
+            )
+
+        # Add pagination, a cursor continues right after the last row of the previous page
+        if query.cursor:
+            cursor_key = self._decode_cursor(query.cursor, sort_mode)
+            base_query = base_query.filter(self._build_keyset_filter(sort_mode, cursor_key, knn_distance))
+            logger.info(f"Executing query with keyset pagination: limit={query.page_size}")
+            return base_query.limit(query.page_size)
+
+        offset = (query.page - 1) * query.page_size
+        logger.info(f"Executing query with pagination: offset={offset}, limit={query.page_size}")
+        return base_query.offset(offset).limit(query.page_size)
+
+    def _to_property_search_entity(self, prop) -> PropertySearchEntity:
+        """
+        Convert a property search row into an entity
+        """
+        return PropertySearchEntity(
+            id=prop.id,
+            property_name=prop.property_name,
+            property_description=prop.property_description,
+            child_friendly=prop.child_friendly,
+            max_guests=prop.max_guests,
+            bedrooms=prop.bedrooms,
+            price_per_night=prop.price_per_night,
+            property_type=prop.property_type,
+            created_at=prop.created_at,
+            updated_at=prop.updated_at,
+            host_id=prop.host_id,
+            house_name=prop.house_name,
+            landmark=prop.landmark,
+            pincode=prop.pincode,
+            district=prop.district,
+            state=prop.state,
+            country=prop.country,
+            latitude=prop.latitude,
+            longitude=prop.longitude,
+            primary_image_url=prop.primary_image_url,
+            distance=getattr(prop, 'distance', None),
+            knn_distance=getattr(prop, 'knn_distance', None)
+        )
+
+    async def _search_properties(
         self, 
         query: PropertySearchQueryEntity
     ) -> List[PropertySearchEntity]:
@@ -27,144 +322,15 @@ class HomePageRepositoryImpl(TravellerHomePageRepositoryInterface):
         """
         try:
             logger.info(f"Starting property search with query: all={query.all}, children_onboard={query.children_onboard}")
-            
-            # Build base query with primary image and distance calculation
-            base_query = select(
-                Property.id,
-                Property.property_name,
-                Property.property_description,
-                Property.child_friendly,
-                Property.max_guests,
-                Property.bedrooms,
-                Property.price_per_night,
-                Property.property_type,
-                Property.created_at,
-                Property.updated_at,
-                Property.host_id,
-                PropertyAddress.house_name,
-                PropertyAddress.landmark,
-                PropertyAddress.pincode,
-                PropertyAddress.district,
-                PropertyAddress.state,
-                PropertyAddress.country,
-                func.ST_AsText(PropertyAddress.location).label('location_wkt'),
-                PropertyImages.image_url.label('primary_image_url')
-            ).join(
-                PropertyAddress, Property.id == PropertyAddress.property_id
-            ).outerjoin(
-                PropertyImages, and_(
-                    Property.id == PropertyImages.property_id,
-                    PropertyImages.is_primary == True
-                )
-            )
-            
-            # Apply filters and sorting
-            if not query.all:
-                filters = []
-                
-                # Filter by guest capacity (only if guests is provided)
-                if query.guests is not None:
-                    filters.append(Property.max_guests >= query.guests)
-                
-                # Apply geographic search if coordinates are provided
-                if query.latitude is not None and query.longitude is not None:
-                    # Convert coordinates to geography point
-                    search_point = self.convert_lat_lng_to_geography(query.latitude, query.longitude)
-                    
-                    # Add distance calculation for sorting using proper column reference
-                    distance_calc = func.ST_Distance(
-                        PropertyAddress.location,
-                        func.ST_GeogFromText(search_point)
-                    )
-                    base_query = base_query.add_columns(distance_calc.label('distance'))
-                    
-                    # Add distance-based search (within 100km radius for better coverage)
-                    distance_filter = func.ST_DWithin(
-                        PropertyAddress.location,
-                        func.ST_GeogFromText(search_point),
-                        100000
-                    )
-                    filters.append(distance_filter)
-                else:
-                    # If no coordinates, add a default distance of 0 for sorting
-                    base_query = base_query.add_columns(func.cast(0, func.Float).label('distance'))
-                
-                # Apply all filters
-                if filters:
-                    base_query = base_query.filter(and_(*filters))
-                
-                # Apply sorting based on children_onboard and geographic proximity
-                if query.children_onboard is True:
-                    # When children are onboard, prioritize child-friendly properties
-                    # Sort by: child_friendly DESC, then by distance ASC
-                    if query.latitude is not None and query.longitude is not None:
-                        base_query = base_query.order_by(
-                            Property.child_friendly.desc(),
-                            distance_calc.asc()
-                        )
-                    else:
-                        base_query = base_query.order_by(
-                            Property.child_friendly.desc(),
-                            Property.created_at.desc()
-                        )
-                else:
-                    # When no children, sort primarily by distance
-                    # Sort by: distance ASC, then by child_friendly DESC
-                    if query.latitude is not None and query.longitude is not None:
-                        base_query = base_query.order_by(
-                            distance_calc.asc(),
-                            Property.child_friendly.desc()
-                        )
-                    else:
-                        base_query = base_query.order_by(
-                            Property.child_friendly.desc(),
-                            Property.created_at.desc()
-                        )
-            else:
-                # For 'all' query, just sort by child_friendly and created_at
-                logger.info("Processing 'all' query - no filters applied")
-                base_query = base_query.order_by(
-                    Property.child_friendly.desc(),
-                    Property.created_at.desc()
-                )
-            
-            # Add pagination
-            offset = (query.page - 1) * query.page_size
-            paginated_query = base_query.offset(offset).limit(query.page_size)
-            logger.info(f"Executing query with pagination: offset={offset}, limit={query.page_size}")
-            db_result = await self.db.execute(paginated_query)
+
+            destination_filter = await self._build_destination_filter(query)
+            paginated_query = self._build_property_search_query(query, destination_filter=destination_filter)
+            db_result = await self.read_db.execute(paginated_query)
             properties = db_result.all()
             logger.info(f"Query executed successfully, found {len(properties)} properties")
             
             # Convert to entities
-            result = []
-            for prop in properties:
-                # Extract coordinates from WKT string
-                coordinates = self._extract_coordinates_from_wkt(prop.location_wkt)
-                
-                entity = PropertySearchEntity(
-                    id=prop.id,
-                    property_name=prop.property_name,
-                    property_description=prop.property_description,
-                    child_friendly=prop.child_friendly,
-                    max_guests=prop.max_guests,
-                    bedrooms=prop.bedrooms,
-                    price_per_night=prop.price_per_night,
-                    property_type=prop.property_type,
-                    created_at=prop.created_at,
-                    updated_at=prop.updated_at,
-                    host_id=prop.host_id,
-                    house_name=prop.house_name,
-                    landmark=prop.landmark,
-                    pincode=prop.pincode,
-                    district=prop.district,
-                    state=prop.state,
-                    country=prop.country,
-                    latitude=coordinates.get('latitude'),
-                    longitude=coordinates.get('longitude'),
-                    primary_image_url=prop.primary_image_url
-                )
-                result.append(entity)
+            result = [self._to_property_search_entity(prop) for prop in properties]
             
             logger.info(f"Found {len(result)} properties matching search criteria")
             return result
@@ -173,7 +339,42 @@ class HomePageRepositoryImpl(TravellerHomePageRepositoryInterface):
             logger.error(f"Error searching properties: {str(e)}")
             raise
 
-    async def get_properties_count(
+    async def _search_properties_with_count(
+        self, 
+        query: PropertySearchQueryEntity
+    ) -> Tuple[List[PropertySearchEntity], int]:
+        """
+        Search properties and get the total count of matches, in the same statement when the count does not
+        defeat the index walk of the ordering
+        """
+        try:
+            logger.info(f"Starting property search with count, query: all={query.all}, children_onboard={query.children_onboard}")
+
+            destination_filter = await self._build_destination_filter(query)
+            window_total = self._uses_window_total(query)
+            paginated_query = self._build_property_search_query(query, include_total=window_total, destination_filter=destination_filter)
+            db_result = await self.read_db.execute(paginated_query)
+            properties = db_result.all()
+
+            if window_total and properties:
+                total_count = properties[0].total_count
+            elif window_total and query.page == 1:
+                total_count = 0
+            else:
+                # Nearest-first pages stop reading after LIMIT rows, and a page past the last match has no rows to
+                # carry the total, so the matches are counted by a statement of their own
+                total_count = await self._count_properties(query, destination_filter)
+
+            result = [self._to_property_search_entity(prop) for prop in properties]
+
+            logger.info(f"Found {len(result)} properties out of {total_count} matching search criteria")
+            return result, total_count
+
+        except Exception as e:
+            logger.error(f"Error searching properties with count: {str(e)}")
+            raise
+
+    async def _get_properties_count(
         self, 
         query: PropertySearchQueryEntity
     ) -> int:
@@ -181,51 +382,245 @@ class HomePageRepositoryImpl(TravellerHomePageRepositoryInterface):
         Get total count of properties matching search criteria
         """
         try:
-            # Build base query
-            base_query = select(Property.id).join(
-                PropertyAddress, Property.id == PropertyAddress.property_id
-            ).outerjoin(
-                PropertyImages, and_(
-                    Property.id == PropertyImages.property_id,
-                    PropertyImages.is_primary == True
-                )
-            )
-            
-            # Apply filters (same logic as search_properties but without sorting)
-            if not query.all:
-                filters = []
-                
-                # Filter by guest capacity (only if guests is provided)
-                if query.guests is not None:
-                    filters.append(Property.max_guests >= query.guests)
-                
-                # Apply geographic search if coordinates are provided
-                if query.latitude is not None and query.longitude is not None:
-                    # Convert coordinates to geography point
-                    search_point = self.convert_lat_lng_to_geography(query.latitude, query.longitude)
-                    
-                    # Add distance-based search (within 100km radius for better coverage)
-                    distance_filter = func.ST_DWithin(
-                        PropertyAddress.location,
-                        func.ST_GeogFromText(search_point),
-                        100000
-                    )
-                    filters.append(distance_filter)
-                
-                # Apply all filters and count
-                if filters:
-                    base_query = base_query.filter(and_(*filters))
-            
-            # Execute count query
-            count_result = await self.db.execute(select(func.count()).select_from(base_query.subquery()))
-            count = count_result.scalar()
-            logger.info(f"Total properties matching search criteria: {count}")
-            return count
+            destination_filter = await self._build_destination_filter(query)
+            return await self._count_properties(query, destination_filter)
             
         except Exception as e:
             logger.error(f"Error getting properties count: {str(e)}")
             raise
 
+    async def _count_properties(self, query: PropertySearchQueryEntity, destination_filter=None) -> int:
+        """
+        Count the properties matching the search filters, without sorting or paging
+        """
+        # Build base query
+        base_query = select(PropertySearchDoc.property_id)
+
+        # Apply filters (same logic as search_properties but without sorting)
+        filters, _, _ = self._build_property_filters(query, destination_filter)
+        if filters:
+            base_query = base_query.filter(and_(*filters))
+
+        # Execute count query
+        count_result = await self.read_db.execute(select(func.count()).select_from(base_query.subquery()))
+        count = count_result.scalar()
+        logger.info(f"Total properties matching search criteria: {count}")
+        return count
+
+    async def search_properties(
+        self, 
+        query: PropertySearchQueryEntity
+    ) -> List[PropertySearchEntity]:
+        """
+        Search properties, served from the search cache when possible
+        """
+        return await self._read_through_property_search(query, 'page', self._search_properties)
+
+    async def search_properties_with_count(
+        self, 
+        query: PropertySearchQueryEntity
+    ) -> Tuple[List[PropertySearchEntity], int]:
+        """
+        Search properties with the total count, served from the search cache when possible
+        """
+        return await self._read_through_property_search(query, 'page_with_count', self._search_properties_with_count)
+
+    async def get_properties_count(
+        self, 
+        query: PropertySearchQueryEntity
+    ) -> int:
+        """
+        Get total count of properties matching search criteria, served from the search cache when possible
+        """
+        return await self._read_through_property_search(query, 'count', self._get_properties_count)
+
+    def _property_search_cache_params(self, query: PropertySearchQueryEntity) -> dict:
+        """
+        Canonical form of the query fields that change property search results
+        """
+        params = {
+            'all': query.all,
+            'page': query.page,
+            'page_size': query.page_size,
+            'cursor': query.cursor
+        }
+        if not query.all:
+            params.update({
+                'guests': query.guests,
+                'children_onboard': query.children_onboard is True,
+                'latitude': query.latitude,
+                'longitude': query.longitude,
+                'radius_meters': self._get_search_radius_meters(query)
+            })
+            stay_dates = query.get_stay_dates()
+            params['stay_dates'] = [stay_date.isoformat() for stay_date in stay_dates] if stay_dates else None
+            if not self._has_coordinates(query):
+                params['destination'] = [
+                    self._normalize_location_name(part) for part in (query.destination or '').split(',')
+                ]
+        return params
+
+    def _property_search_cache_cells(self, query: PropertySearchQueryEntity) -> List[str]:
+        """
+        Invalidation cells whose property writes can change the results of this query
+        """
+        if query.all or query.latitude is None or query.longitude is None:
+            return [GLOBAL_CELL]
+        return cells_for_radius(query.latitude, query.longitude, self._get_search_radius_meters(query))
+
+    async def _read_through_property_search(self, query: PropertySearchQueryEntity, kind: str, load):
+        """
+        Serve a property search from Redis, running and caching it on a miss
+        """
+        if not self.redis_repo:
+            return await load(query)
+
+        # Snap the search point to the grid so every search inside a cell computes (and shares) the same results
+        if query.latitude is not None and query.longitude is not None:
+            grid_degrees = self.redis_repo.get_property_search_grid_degrees()
+            query = query.model_copy(update={
+                'latitude': snap_coordinate(query.latitude, grid_degrees),
+                'longitude': snap_coordinate(query.longitude, grid_degrees)
+            })
+
+        try:
+            cells = self._property_search_cache_cells(query)
+            versions = await self.redis_repo.get_property_search_versions(cells)
+            cache_key = build_search_key(kind, self._property_search_cache_params(query), cells, versions)
+            cached_search = await self.redis_repo.get_cached_property_search(cache_key)
+        except Exception as e:
+            logger.warning(f"Property search cache read failed: {str(e)}")
+            return await load(query)
+
+        if cached_search is not None:
+            logger.info(f"Property search cache hit for {kind}")
+            return self._decode_property_search(kind, cached_search)
+
+        result = await load(query)
+
+        try:
+            await self.redis_repo.cache_property_search(
+                cache_key, self._encode_property_search(kind, result), from_replica=self.reads_replica
+            )
+        except Exception as e:
+            logger.warning(f"Property search cache write failed: {str(e)}")
+
+        return result
+
+    def _encode_property_search(self, kind: str, result) -> dict:
+        """
+        Store properties as positional rows so the field names are not repeated for every property
+        """
+        fields = list(PropertySearchEntity.model_fields)
+        if kind == 'count':
+            return {'t': result}
+        properties, total_count = (result, None) if kind == 'page' else result
+        rows = []
+        for prop in properties:
+            prop_data = prop.model_dump(mode='json')
+            rows.append([prop_data[field] for field in fields])
+        return {'p': rows, 't': total_count}
+
+    def _decode_property_search(self, kind: str, cached_search: dict):
+        """
+        Rebuild the repository result from a cached search
+        """
+        if kind == 'count':
+            return cached_search['t']
+        fields = list(PropertySearchEntity.model_fields)
+        properties = [PropertySearchEntity.model_validate(dict(zip(fields, row))) for row in cached_search['p']]
+        if kind == 'page':
+            return properties
+        return properties, cached_search['t']
+
+    def _get_sort_mode(self, query: PropertySearchQueryEntity) -> str:
+        """
+        Resolve which ordering the property search uses for the given query
+        """
+        has_coordinates = query.latitude is not None and query.longitude is not None
+        if query.all or not has_coordinates:
+            return self.SORT_CHILD_FRIENDLY_CREATED_AT
+        if query.children_onboard is True:
+            return self.SORT_CHILD_FRIENDLY_DISTANCE
+        return self.SORT_DISTANCE_CHILD_FRIENDLY
+
+    def _uses_window_total(self, query: PropertySearchQueryEntity) -> bool:
+        """
+        Whether the total can ride on the page rows as a window count. Not for a keyset page, whose predicate
+        narrows the rows being counted, nor for a nearest-first ordering, where the window would read every match
+        and cancel the early stop of the KNN index walk
+        """
+        return not query.cursor and self._get_sort_mode(query) != self.SORT_DISTANCE_CHILD_FRIENDLY
+
+    def encode_cursor(
+        self,
+        query: PropertySearchQueryEntity,
+        last_property: PropertySearchEntity
+    ) -> str:
+        """
+        Encode the sort key of the last property in a page as an opaque cursor
+        """
+        sort_mode = self._get_sort_mode(query)
+        if sort_mode == self.SORT_CHILD_FRIENDLY_DISTANCE:
+            key = [last_property.child_friendly, last_property.knn_distance, last_property.id]
+        elif sort_mode == self.SORT_DISTANCE_CHILD_FRIENDLY:
+            key = [last_property.knn_distance, last_property.child_friendly, last_property.id]
+        else:
+            key = [last_property.child_friendly, last_property.created_at.isoformat(), last_property.id]
+
+        payload = json.dumps({'mode': sort_mode, 'key': key}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    def _decode_cursor(self, cursor: str, sort_mode: str) -> list:
+        """
+        Decode a cursor produced by encode_cursor and check it belongs to the current ordering
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            key = payload['key']
+            if payload['mode'] != sort_mode or len(key) != 3:
+                raise ValueError("Cursor does not match the search ordering")
+            if sort_mode == self.SORT_CHILD_FRIENDLY_CREATED_AT:
+                key[1] = datetime.fromisoformat(key[1])
+            return key
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Rejected property search cursor: {str(e)}")
+            raise ValueError("Invalid cursor")
+
+    def _child_friendly_after(self, child_friendly: bool):
+        """
+        Rows whose child_friendly sorts after the cursor value under child_friendly DESC. SQLAlchemy only allows
+        equality and IS against booleans, so the strict comparison is spelled out
+        """
+        if child_friendly:
+            return PropertySearchDoc.child_friendly.is_(False)
+        return false()
+
+    def _build_keyset_filter(self, sort_mode: str, cursor_key: list, knn_distance):
+        """
+        Build the predicate selecting rows that sort strictly after the cursor key
+        """
+        if sort_mode == self.SORT_CHILD_FRIENDLY_DISTANCE:
+            child_friendly, distance, property_id = cursor_key
+            return or_(
+                self._child_friendly_after(child_friendly),
+                and_(PropertySearchDoc.child_friendly == child_friendly, knn_distance > distance),
+                and_(PropertySearchDoc.child_friendly == child_friendly, knn_distance == distance, PropertySearchDoc.property_id > property_id)
+            )
+        if sort_mode == self.SORT_DISTANCE_CHILD_FRIENDLY:
+            distance, child_friendly, property_id = cursor_key
+            return or_(
+                knn_distance > distance,
+                and_(knn_distance == distance, self._child_friendly_after(child_friendly)),
+                and_(knn_distance == distance, PropertySearchDoc.child_friendly == child_friendly, PropertySearchDoc.property_id > property_id)
+            )
+        child_friendly, created_at, property_id = cursor_key
+        return or_(
+            self._child_friendly_after(child_friendly),
+            and_(PropertySearchDoc.child_friendly == child_friendly, PropertySearchDoc.created_at < created_at),
+            and_(PropertySearchDoc.child_friendly == child_friendly, PropertySearchDoc.created_at == created_at, PropertySearchDoc.property_id < property_id)
+        )
+
     def convert_lat_lng_to_geography(self, latitude: float, longitude: float) -> str:
         """
         Convert latitude and longitude to PostGIS geography point
@@ -285,6 +680,194 @@ class HomePageRepositoryImpl(TravellerHomePageRepositoryInterface):
         
         return coordinates
 
+    def _build_guide_filters(self, query: GuideSearchQueryEntity) -> list:
+        """
+        Build the WHERE predicates shared by the guide search and count queries
+        """
+        # Only non-blocked guides are ever returned
+        filters = [Guide.is_blocked == False]
+
+        # Apply filters only if not requesting all guides
+        if query.all:
+            return filters
+
+        # Filter by the most specific level of the destination hierarchy, served by the pg_trgm GIN indexes
+        destination_match = self._get_guide_destination_match(query)
+        if destination_match is not None:
+            column, term = destination_match
+            filters.append(column.ilike(f"%{self._escape_like(term)}%", escape='\\'))
+
+        # Apply geographic search if coordinates are provided
+        if query.latitude is not None and query.longitude is not None:
+            # Convert coordinates to geography point
+            search_point = self.convert_lat_lng_to_geography(query.latitude, query.longitude)
+
+            # Add distance-based search (within 100km radius for better coverage)
+            distance_filter = func.ST_DWithin(
+                Guide.location,
+                func.ST_GeogFromText(search_point),
+                100000
+            )
+            filters.append(distance_filter)
+
+        return filters
+
+    def _get_guide_destination_match(self, query: GuideSearchQueryEntity):
+        """
+        Pick the guide column and term to match the destination against, None when there is nothing to match
+        """
+        if query.all or not query.destination:
+            return None
+
+        # Parse destination to extract location hierarchy
+        location_hierarchy = self.parse_destination_hierarchy(query.destination)
+        if location_hierarchy.get('district'):
+            return Guide.district, location_hierarchy['district']
+        if location_hierarchy.get('state'):
+            return Guide.state, location_hierarchy['state']
+        if location_hierarchy.get('country'):
+            return Guide.country, location_hierarchy['country']
+        return None
+
+    def _escape_like(self, term: str) -> str:
+        """
+        Escape LIKE wildcards so user input is matched literally
+        """
+        return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+    def _build_guide_distance_expressions(self, query: GuideSearchQueryEntity):
+        """
+        Build the exact and KNN distance expressions for a guide search, None when there is no search point
+        """
+        if query.all or query.latitude is None or query.longitude is None:
+            return None, None
+
+        search_point = self.convert_lat_lng_to_geography(query.latitude, query.longitude)
+        distance_calc = func.ST_Distance(
+            Guide.location,
+            func.ST_GeogFromText(search_point)
+        )
+        # KNN distance operator, served nearest-first by idx_guide_location
+        knn_distance = Guide.location.op('<->', return_type=Float)(
+            func.ST_GeogFromText(search_point)
+        )
+        return distance_calc, knn_distance
+
+    def _build_guide_search_query(self, query: GuideSearchQueryEntity, include_total: bool = False):
+        """
+        Build the paginated guide search statement, optionally carrying the total match count on every row
+        """
+        # Build base query with user details
+        base_query = select(
+            Guide.id,
+            Guide.user_id,
+            Guide.bio,
+            Guide.profession,
+            Guide.expertise,
+            Guide.hourly_rate,
+            Guide.house_name,
+            Guide.landmark,
+            Guide.pincode,
+            Guide.district,
+            Guide.state,
+            Guide.country,
+            func.ST_AsText(Guide.location).label('location_wkt'),
+            Guide.created_at,
+            Guide.updated_at,
+            User.first_name,
+            User.last_name,
+            User.profile_image
+        ).join(
+            User, Guide.user_id == User.id
+        ).filter(
+            and_(*self._build_guide_filters(query))
+        )
+
+        if include_total:
+            # Window count is evaluated before LIMIT/OFFSET so each row carries the full total
+            base_query = base_query.add_columns(func.count().over().label('total_count'))
+
+        # Nearest guides first when searching around a point, best destination match or newest first otherwise.
+        # The exact distance is only evaluated for the rows that are returned
+        distance_calc, knn_distance = self._build_guide_distance_expressions(query)
+        destination_match = self._get_guide_destination_match(query)
+        if knn_distance is not None:
+            base_query = base_query.add_columns(distance_calc.label('distance')).order_by(
+                knn_distance.asc(),
+                Guide.id.asc()
+            )
+        elif destination_match is not None:
+            column, term = destination_match
+            base_query = base_query.order_by(
+                func.similarity(column, term).desc(),
+                Guide.created_at.desc(),
+                Guide.id.desc()
+            )
+        else:
+            base_query = base_query.order_by(
+                Guide.created_at.desc(),
+                Guide.id.desc()
+            )
+
+        # Add pagination
+        offset = (query.page - 1) * query.page_size
+        return base_query.offset(offset).limit(query.page_size)
+
+    async def _get_languages_by_user_ids(self, user_ids: List[int]) -> dict:
+        """
+        Get known languages for a batch of guides in a single query, keyed by user id
+        """
+        if not user_ids:
+            return {}
+
+        query = select(Languages.user_id, Languages.language).where(Languages.user_id.in_(user_ids))
+        result = await self.read_db.execute(query)
+        languages_dict = {}
+        for row in result.all():
+            if row.user_id not in languages_dict:
+                languages_dict[row.user_id] = []
+            languages_dict[row.user_id].append(row.language)
+        return languages_dict
+
+    async def _to_guide_search_entities(self, guides) -> List[GuideSearchEntity]:
+        """
+        Convert guide search rows into entities
+        """
+        # Get languages for the whole page at once instead of per guide
+        languages_dict = await self._get_languages_by_user_ids([guide.user_id for guide in guides])
+
+        result = []
+        for guide in guides:
+            # Extract coordinates from WKT string
+            coordinates = self._extract_coordinates_from_wkt(guide.location_wkt)
+            known_languages = languages_dict.get(guide.user_id, [])
+            
+            entity = GuideSearchEntity(
+                id=guide.id,
+                user_id=guide.user_id,
+                bio=guide.bio,
+                profession=guide.profession,
+                expertise=guide.expertise,
+                hourly_rate=guide.hourly_rate,
+                house_name=guide.house_name,
+                landmark=guide.landmark,
+                pincode=guide.pincode,
+                district=guide.district,
+                state=guide.state,
+                country=guide.country,
+                latitude=coordinates.get('latitude'),
+                longitude=coordinates.get('longitude'),
+                created_at=guide.created_at,
+                updated_at=guide.updated_at,
+                first_name=guide.first_name,
+                last_name=guide.last_name,
+                profile_image=guide.profile_image,
+                known_languages=known_languages,
+                distance=getattr(guide, 'distance', None)
+            )
+            result.append(entity)
+        return result
+
     async def search_guides(
         self, 
         query: GuideSearchQueryEntity
@@ -293,105 +876,12 @@ class HomePageRepositoryImpl(TravellerHomePageRepositoryInterface):
         Search guides based on query parameters
         """
         try:
-            # Build base query with user details and languages
-            base_query = select(
-                Guide.id,
-                Guide.user_id,
-                Guide.bio,
-                Guide.profession,
-                Guide.expertise,
-                Guide.hourly_rate,
-                Guide.house_name,
-                Guide.landmark,
-                Guide.pincode,
-                Guide.district,
-                Guide.state,
-                Guide.country,
-                func.ST_AsText(Guide.location).label('location_wkt'),
-                Guide.created_at,
-                Guide.updated_at,
-                User.first_name,
-                User.last_name,
-                User.profile_image
-            ).join(
-                User, Guide.user_id == User.id
-            ).where(
-                Guide.is_blocked == False  # Only get non-blocked guides
-            )
-            
-            # Apply filters only if not requesting all guides
-            if not query.all:
-                filters = []
-                
-                # Parse destination to extract location hierarchy (only if destination is provided)
-                if query.destination:
-                    location_hierarchy = self.parse_destination_hierarchy(query.destination)
-                    
-                    # Filter by location hierarchy if available
-                    if location_hierarchy.get('district'):
-                        filters.append(Guide.district.ilike(f"%{location_hierarchy['district']}%"))
-                    elif location_hierarchy.get('state'):
-                        filters.append(Guide.state.ilike(f"%{location_hierarchy['state']}%"))
-                    elif location_hierarchy.get('country'):
-                        filters.append(Guide.country.ilike(f"%{location_hierarchy['country']}%"))
-                
-                # Apply geographic search if coordinates are provided
-                if query.latitude is not None and query.longitude is not None:
-                    # Convert coordinates to geography point
-                    search_point = self.convert_lat_lng_to_geography(query.latitude, query.longitude)
-                    
-                    # Add distance-based search (within 100km radius for better coverage)
-                    distance_filter = func.ST_DWithin(
-                        Guide.location,
-                        func.ST_GeogFromText(search_point),
-                        100000
-                    )
-                    filters.append(distance_filter)
-                
-                # Apply all filters
-                if filters:
-                    base_query = base_query.filter(and_(*filters))
-            
-            # Add pagination
-            offset = (query.page - 1) * query.page_size
-            paginated_query = base_query.offset(offset).limit(query.page_size)
-            db_result = await self.db.execute(paginated_query)
+            paginated_query = self._build_guide_search_query(query)
+            db_result = await self.read_db.execute(paginated_query)
             guides = db_result.all()
             
             # Convert to entities
-            result = []
-            for guide in guides:
-                # Extract coordinates from WKT string
-                coordinates = self._extract_coordinates_from_wkt(guide.location_wkt)
-                
-                # Get languages for this guide
-                languages_query = select(Languages.language).where(Languages.user_id == guide.user_id)
-                languages_result = await self.db.execute(languages_query)
-                known_languages = [lang.language for lang in languages_result.all()]
-                
-                entity = GuideSearchEntity(
-                    id=guide.id,
-                    user_id=guide.user_id,
-                    bio=guide.bio,
-                    profession=guide.profession,
-                    expertise=guide.expertise,
-                    hourly_rate=guide.hourly_rate,
-                    house_name=guide.house_name,
-                    landmark=guide.landmark,
-                    pincode=guide.pincode,
-                    district=guide.district,
-                    state=guide.state,
-                    country=guide.country,
-                    latitude=coordinates.get('latitude'),
-                    longitude=coordinates.get('longitude'),
-                    created_at=guide.created_at,
-                    updated_at=guide.updated_at,
-                    first_name=guide.first_name,
-                    last_name=guide.last_name,
-                    profile_image=guide.profile_image,
-                    known_languages=known_languages
-                )
-                result.append(entity)
+            result = await self._to_guide_search_entities(guides)
             
             logger.info(f"Found {len(result)} guides matching search criteria")
             return result
@@ -400,6 +890,35 @@ class HomePageRepositoryImpl(TravellerHomePageRepositoryInterface):
             logger.error(f"Error searching guides: {str(e)}")
             raise
 
+    async def search_guides_with_count(
+        self, 
+        query: GuideSearchQueryEntity
+    ) -> Tuple[List[GuideSearchEntity], int]:
+        """
+        Search guides and get the total count of matches in a single statement
+        """
+        try:
+            paginated_query = self._build_guide_search_query(query, include_total=True)
+            db_result = await self.read_db.execute(paginated_query)
+            guides = db_result.all()
+
+            if guides:
+                total_count = guides[0].total_count
+            elif query.page > 1:
+                # A page past the last match has no rows to carry the total, count separately
+                total_count = await self.get_guides_count(query)
+            else:
+                total_count = 0
+
+            result = await self._to_guide_search_entities(guides)
+
+            logger.info(f"Found {len(result)} guides out of {total_count} matching search criteria")
+            return result, total_count
+
+        except Exception as e:
+            logger.error(f"Error searching guides with count: {str(e)}")
+            raise
+
     async def get_guides_count(
         self, 
         query: GuideSearchQueryEntity
@@ -411,45 +930,12 @@ class HomePageRepositoryImpl(TravellerHomePageRepositoryInterface):
             # Build base query
             base_query = select(Guide.id).join(
                 User, Guide.user_id == User.id
-            ).where(
-                Guide.is_blocked == False  # Only count non-blocked guides
+            ).filter(
+                and_(*self._build_guide_filters(query))
             )
             
-            # Apply filters only if not requesting all guides
-            if not query.all:
-                filters = []
-                
-                # Parse destination to extract location hierarchy (only if destination is provided)
-                if query.destination:
-                    location_hierarchy = self.parse_destination_hierarchy(query.destination)
-                    
-                    # Filter by location hierarchy if available
-                    if location_hierarchy.get('district'):
-                        filters.append(Guide.district.ilike(f"%{location_hierarchy['district']}%"))
-                    elif location_hierarchy.get('state'):
-                        filters.append(Guide.state.ilike(f"%{location_hierarchy['state']}%"))
-                    elif location_hierarchy.get('country'):
-                        filters.append(Guide.country.ilike(f"%{location_hierarchy['country']}%"))
-                
-                # Apply geographic search if coordinates are provided
-                if query.latitude is not None and query.longitude is not None:
-                    # Convert coordinates to geography point
-                    search_point = self.convert_lat_lng_to_geography(query.latitude, query.longitude)
-                    
-                    # Add distance-based search (within 100km radius for better coverage)
-                    distance_filter = func.ST_DWithin(
-                        Guide.location,
-                        func.ST_GeogFromText(search_point),
-                        100000
-                    )
-                    filters.append(distance_filter)
-                
-                # Apply all filters and count
-                if filters:
-                    base_query = base_query.filter(and_(*filters))
-            
             # Execute count query
-            count_result = await self.db.execute(select(func.count()).select_from(base_query.subquery()))
+            count_result = await self.read_db.execute(select(func.count()).select_from(base_query.subquery()))
             count = count_result.scalar()
             logger.info(f"Total guides matching search criteria: {count}")
             return count
@@ -457,3 +943,91 @@ class HomePageRepositoryImpl(TravellerHomePageRepositoryInterface):
         except Exception as e:
             logger.error(f"Error getting guides count: {str(e)}")
             raise
+
+    async def get_guide_by_id(self, guide_id: int) -> Optional[GuideSearchEntity]:
+        """
+        Get a single non-blocked guide by id, read through the guide cache when one is configured
+        """
+        if self.redis_repo:
+            try:
+                cached_guide = await self.redis_repo.get_cached_guide(guide_id)
+                if cached_guide:
+                    return GuideSearchEntity.model_validate(cached_guide)
+            except Exception as e:
+                logger.warning(f"Guide cache read failed for guide {guide_id}: {str(e)}")
+
+        try:
+            # Languages are aggregated in the same statement as the guide and user details
+            languages_subquery = (
+                select(func.array_agg(Languages.language))
+                .where(Languages.user_id == Guide.user_id)
+                .correlate(Guide)
+                .scalar_subquery()
+            )
+            guide_query = select(
+                Guide.id,
+                Guide.user_id,
+                Guide.bio,
+                Guide.profession,
+                Guide.expertise,
+                Guide.hourly_rate,
+                Guide.house_name,
+                Guide.landmark,
+                Guide.pincode,
+                Guide.district,
+                Guide.state,
+                Guide.country,
+                func.ST_AsText(Guide.location).label('location_wkt'),
+                Guide.created_at,
+                Guide.updated_at,
+                User.first_name,
+                User.last_name,
+                User.profile_image,
+                languages_subquery.label('known_languages')
+            ).join(
+                User, Guide.user_id == User.id
+            ).where(
+                Guide.id == guide_id,
+                Guide.is_blocked == False
+            )
+            db_result = await self.read_db.execute(guide_query)
+            guide = db_result.first()
+
+            if not guide:
+                return None
+
+            coordinates = self._extract_coordinates_from_wkt(guide.location_wkt)
+            entity = GuideSearchEntity(
+                id=guide.id,
+                user_id=guide.user_id,
+                bio=guide.bio,
+                profession=guide.profession,
+                expertise=guide.expertise,
+                hourly_rate=guide.hourly_rate,
+                house_name=guide.house_name,
+                landmark=guide.landmark,
+                pincode=guide.pincode,
+                district=guide.district,
+                state=guide.state,
+                country=guide.country,
+                latitude=coordinates.get('latitude'),
+                longitude=coordinates.get('longitude'),
+                created_at=guide.created_at,
+                updated_at=guide.updated_at,
+                first_name=guide.first_name,
+                last_name=guide.last_name,
+                profile_image=guide.profile_image,
+                known_languages=guide.known_languages or []
+            )
+
+        except Exception as e:
+            logger.error(f"Error getting guide {guide_id}: {str(e)}")
+            raise
+
+        if self.redis_repo:
+            try:
+                await self.redis_repo.cache_guide(guide_id, entity.model_dump(mode='json'), from_replica=self.reads_replica)
+            except Exception as e:
+                logger.warning(f"Guide cache write failed for guide {guide_id}: {str(e)}")
+
+        return entity
@@ -6,6 +6,8 @@ from app.infrastructure.database.models.onboard import Host, Languages
 from sqlalchemy.future import select
 from sqlalchemy import update, delete, insert
 from typing import Optional
+from app.core.redis.redis_repo import RedisRepoInterface
+from app.infrastructure.repositories.guide_profile_impl import invalidate_cached_guide_of_user
 
 import logging
 logger = logging.getLogger(__name__) 
@@ -13,19 +15,24 @@ logger = logging.getLogger(__name__)
 class HostProfileImpl(HostProfileInterface):
     def __init__(
             self,
-            session: AsyncSession
+            session: AsyncSession,
+            redis_repo: Optional[RedisRepoInterface] = None,
+            read_session: Optional[AsyncSession] = None
     ):
         self.session = session
+        self.redis_repo = redis_repo
+        #profile reads may be served by the read replica
+        self.read_session = read_session or session
     
     async def get(self, user_id: str)->Optional[HostProfileSchema]:
-        profile_data = await self.session.scalar(
+        profile_data = await self.read_session.scalar(
             select(Host).where(Host.user_id == int(user_id))
         )
 
         if not profile_data:
             return
 
-        languages_result = await self.session.scalars(
+        languages_result = await self.read_session.scalars(
             select(Languages.language).where(Languages.user_id == int(user_id))
         )
         known_languages = languages_result.all()
@@ -52,6 +59,9 @@ class HostProfileImpl(HostProfileInterface):
                 await self._update_host_languages(user_id_int, update_data.known_languages)
             
             await self.session.commit()
+            if update_data.has_languages_update():
+                #languages are shared with the user's guide profile
+                await invalidate_cached_guide_of_user(self.session, self.redis_repo, user_id)
             logger.info(f"Successfully updated host profile for user {user_id}")
             return True
             
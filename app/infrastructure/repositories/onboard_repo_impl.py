@@ -6,6 +6,10 @@ from sqlalchemy import update, delete, insert
 from sqlalchemy.future import select
 from app.infrastructure.database.models.onboard import Guide, Languages, Host, PropertyImages, Property, PropertyAddress, PropertyAmenities 
 from app.infrastructure.database.models.users.user import User as UserModel
+from app.core.redis.redis_repo import RedisRepoInterface
+from app.infrastructure.repositories.user_permission_roles_impl import invalidate_user_permissions
+from app.infrastructure.repositories.guide_profile_impl import invalidate_cached_guide_of_user
+from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,9 +18,11 @@ logger = logging.getLogger(__name__)
 class OnboardRepoImpl(OnboardRepo):
     def __init__(
             self,
-            session:AsyncSession
+            session:AsyncSession,
+            redis_repo: Optional[RedisRepoInterface] = None
         ):
         self.session = session
+        self.redis_repo = redis_repo
     
     async def onboard_guide(self, data: GuideOnboardEntity, user_id: str)->bool:
         try:
@@ -80,6 +86,7 @@ class OnboardRepoImpl(OnboardRepo):
             if result.rowcount>0:
                 logger.info("DEBUG: Update successfull, committing...")
                 await self.session.commit()
+                await invalidate_user_permissions(self.redis_repo, [user_id])
                 return True
             else:
                 await self.session.rollback()
@@ -130,6 +137,8 @@ class OnboardRepoImpl(OnboardRepo):
             
             # MANUAL COMMIT like in guide onboarding
             await self.session.commit()
+            #the rewritten languages are shared with the user's guide profile
+            await invalidate_cached_guide_of_user(self.session, self.redis_repo, user_id)
             return str(host_id)
 
         except Exception as e:
@@ -157,6 +166,7 @@ class OnboardRepoImpl(OnboardRepo):
                 logger.info("DEBUG: Update successful, committing...")
                 # MANUAL COMMIT
                 await self.session.commit()
+                await invalidate_user_permissions(self.redis_repo, [user_id])
                 return True
             else:
                 # MANUAL ROLLBACK
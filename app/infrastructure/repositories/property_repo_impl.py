@@ -1,9 +1,13 @@
 from app.core.repositories import PropertyRepo
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.entities import PropertyDetailsEntity, PropertyOnlyDetailsEntity, PropertyUpdateEntity, PropertyAddressEntity, PropertyDetailsWithTimestampsEntity
-from app.infrastructure.database.models.onboard import Property, PropertyAddress, PropertyAmenities, PropertyImages
+from app.infrastructure.database.models.onboard import Property, PropertyAddress, PropertyAmenities, PropertyImages, Location, PropertySearchDoc
 from app.infrastructure.database.models.onboard import Host
-from sqlalchemy import insert, func, update, delete
+from app.core.redis.redis_repo import RedisRepoInterface
+from app.infrastructure.redis.property_search_cache import cells_for_property_write
+from sqlalchemy import insert, func, update, delete, cast
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from geoalchemy2 import Geography, Geometry
 from sqlalchemy.future import select
 from typing import List, Optional
 import logging
@@ -15,10 +19,149 @@ logger = logging.getLogger(__name__)
 class PropertyRepoImpl(PropertyRepo):
     def __init__(
             self,
-            session: AsyncSession
+            session: AsyncSession,
+            redis_repo: Optional[RedisRepoInterface] = None
     ):
         self.session = session
+        self.redis_repo = redis_repo
+
+    async def _invalidate_property_search(self, *coordinates: dict | None):
+        """Bump the search cache cells covering the given locations so cached searches around them miss"""
+        if not self.redis_repo:
+            return
+        try:
+            await self.redis_repo.bump_property_search_versions(cells_for_property_write(*coordinates))
+        except Exception as e:
+            logger.warning(f"Failed to invalidate property search cache: {str(e)}")
     
+    async def _get_or_create_location(self, level: str, name: str, parent_id: int | None)->int:
+        """Id of the location with this name under the parent, created if it does not exist yet"""
+        normalized_name = name.strip().lower()
+        location_query = select(Location.id).where(
+            Location.level == level,
+            Location.normalized_name == normalized_name,
+            Location.parent_id == parent_id if parent_id is not None else Location.parent_id.is_(None)
+        )
+        location_id = (await self.session.execute(location_query)).scalar_one_or_none()
+        if location_id is not None:
+            return location_id
+
+        # A concurrent insert of the same location hits uq_locations_level_parent_name, read the winner back
+        location_insert_query = pg_insert(Location).values(
+            parent_id=parent_id,
+            level=level,
+            name=name.strip(),
+            normalized_name=normalized_name
+        ).on_conflict_do_nothing().returning(Location.id)
+        location_id = (await self.session.execute(location_insert_query)).scalar_one_or_none()
+        if location_id is None:
+            location_id = (await self.session.execute(location_query)).scalar_one()
+        return location_id
+
+    async def _resolve_address_locations(self, address: PropertyAddressEntity)->dict:
+        """Location ids linking an address to its country, state and district"""
+        country_id = await self._get_or_create_location('country', address.country, None)
+        state_id = await self._get_or_create_location('state', address.state, country_id)
+        district_id = await self._get_or_create_location('district', address.district, state_id)
+        return {
+            'country_location_id': country_id,
+            'state_location_id': state_id,
+            'district_location_id': district_id
+        }
+
+    async def _rebuild_location_centroids(self):
+        """Recompute the centroid of every location from the property addresses linked to it, one grouped
+        update per location level. Property writes leave centroids alone, they are refreshed by the rebuild"""
+        for column_name in ('country_location_id', 'state_location_id', 'district_location_id'):
+            column = getattr(PropertyAddress, column_name)
+            centroids = select(
+                column.label('location_id'),
+                cast(func.ST_Centroid(func.ST_Collect(cast(PropertyAddress.location, Geometry))), Geography).label('centroid')
+            ).where(column.isnot(None), PropertyAddress.location.isnot(None)).group_by(column).subquery()
+            await self.session.execute(
+                update(Location).where(Location.id == centroids.c.location_id).values(centroid=centroids.c.centroid)
+            )
+
+    def _property_search_doc_select(self):
+        """Columns of property_search_doc computed from the normalized property tables, in table column order"""
+        primary_image_url = select(PropertyImages.image_url).where(
+            PropertyImages.property_id == Property.id,
+            PropertyImages.is_primary == True
+        ).order_by(PropertyImages.id).limit(1).scalar_subquery()
+        point = cast(PropertyAddress.location, Geometry)
+
+        return select(
+            Property.id,
+            Property.host_id,
+            Property.property_name,
+            Property.property_description,
+            Property.property_type,
+            Property.child_friendly,
+            Property.max_guests,
+            Property.bedrooms,
+            Property.price_per_night,
+            PropertyAddress.house_name,
+            PropertyAddress.landmark,
+            PropertyAddress.pincode,
+            PropertyAddress.district,
+            PropertyAddress.state,
+            PropertyAddress.country,
+            PropertyAddress.country_location_id,
+            PropertyAddress.state_location_id,
+            PropertyAddress.district_location_id,
+            primary_image_url,
+            func.ST_Y(point),
+            func.ST_X(point),
+            PropertyAddress.location,
+            Property.created_at,
+            Property.updated_at
+        ).join(PropertyAddress, PropertyAddress.property_id == Property.id)
+
+    async def _sync_property_search_doc(self, property_id: int):
+        """Upsert the search document of a property within the current transaction"""
+        columns = [column.name for column in PropertySearchDoc.__table__.columns]
+        upsert_query = pg_insert(PropertySearchDoc).from_select(
+            columns,
+            self._property_search_doc_select().where(Property.id == property_id)
+        )
+        upsert_query = upsert_query.on_conflict_do_update(
+            index_elements=[PropertySearchDoc.property_id],
+            set_={column: upsert_query.excluded[column] for column in columns if column != 'property_id'}
+        )
+        await self.session.execute(upsert_query)
+
+    async def _property_search_doc_coordinates(self)->list[dict]:
+        """Distinct coordinates of the current property search documents"""
+        result = await self.session.execute(
+            select(PropertySearchDoc.latitude, PropertySearchDoc.longitude).where(
+                PropertySearchDoc.latitude.isnot(None),
+                PropertySearchDoc.longitude.isnot(None)
+            ).distinct()
+        )
+        return [{'latitude': latitude, 'longitude': longitude} for latitude, longitude in result.all()]
+
+    async def rebuild_property_search_docs(self)->int:
+        """Recreate every property search document and location centroid from the normalized tables"""
+        try:
+            columns = [column.name for column in PropertySearchDoc.__table__.columns]
+            #searches around both the replaced and the rebuilt documents may change
+            coordinates = await self._property_search_doc_coordinates()
+            await self.session.execute(delete(PropertySearchDoc))
+            await self.session.execute(
+                insert(PropertySearchDoc).from_select(columns, self._property_search_doc_select())
+            )
+            coordinates += await self._property_search_doc_coordinates()
+            await self._rebuild_location_centroids()
+            await self.session.commit()
+            count = (await self.session.execute(select(func.count()).select_from(PropertySearchDoc))).scalar()
+            logger.info(f"Rebuilt {count} property search documents")
+            await self._invalidate_property_search(*coordinates)
+            return count
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error rebuilding property search documents: {str(e)}")
+            raise
+
     #add property main implementation
     async def add_property(self, property_data: PropertyDetailsEntity)->str | None:
         try:
@@ -45,6 +188,7 @@ class PropertyRepoImpl(PropertyRepo):
                 point = f"POINT({coordinates['longitude']} {coordinates['latitude']})"
             
             logger.info(f"Creating address with the point: {point}")
+            location_ids = await self._resolve_address_locations(property_data.property_address)
             address_insert_query = insert(PropertyAddress).values(
                 property_id=property_id,
                 house_name=property_data.property_address.house_name,  
@@ -53,7 +197,8 @@ class PropertyRepoImpl(PropertyRepo):
                 district=property_data.property_address.district,
                 state=property_data.property_address.state,
                 country=property_data.property_address.country,
-                location=point
+                location=point,
+                **location_ids
             )
             await self.session.execute(address_insert_query)
             logger.info("Address created successfully")
@@ -77,7 +222,9 @@ class PropertyRepoImpl(PropertyRepo):
                 )
                 await self.session.execute(amenity_insert_query)
             logger.info("Amenities created successfully")
+            await self._sync_property_search_doc(property_id)
             await self.session.commit()
+            await self._invalidate_property_search(coordinates)
             return str(property_id)
         except Exception as e:
             await self.session.rollback()
@@ -293,6 +440,10 @@ class PropertyRepoImpl(PropertyRepo):
             if not await self._verify_property_ownership(property_id_int, host_id):
                 return False
             
+            # Keep the current location so searches around it are invalidated even if the property moves
+            addresses_data = await self._get_addresses_by_property_ids([property_id_int])
+            previous_coordinates = self._extract_coordinates(addresses_data.get(property_id_int))
+            
             # Update main property table using entity helper method
             await self._update_property_main_data(property_id_int, property_data)
             
@@ -307,9 +458,13 @@ class PropertyRepoImpl(PropertyRepo):
             # Update images if provided
             if property_data.has_images_update():
                 await self._update_property_images(property_id_int, property_data.property_images)
-            
+
+            await self._sync_property_search_doc(property_id_int)
             await self.session.commit()
             logger.info(f"Successfully updated property {property_id}")
+            
+            new_coordinates = property_data.property_address.coordinates if property_data.has_address_update() else None
+            await self._invalidate_property_search(previous_coordinates, new_coordinates)
             return True
             
         except Exception as e:
@@ -347,13 +502,15 @@ class PropertyRepoImpl(PropertyRepo):
 
     async def _update_property_address(self, property_id: int, address_data: PropertyAddressEntity):
         """Update property address"""
+        location_ids = await self._resolve_address_locations(address_data)
         address_update_data = {
             'house_name': address_data.house_name,
             'landmark': address_data.landmark or "",
             'pincode': address_data.pincode,
             'district': address_data.district,
             'state': address_data.state,
-            'country': address_data.country
+            'country': address_data.country,
+            **location_ids
         }
         
         # Handle coordinates
@@ -1,19 +1,17 @@
-import smtplib
 from email.message import EmailMessage
 from app.config.email_config import email_settings
+from app.infrastructure.smtp_pool import get_smtp_pool
 
 
 class SMTPEmail:
-    #Concrete implementation using SMTP
-    def send(self,email: str, otp: str) -> None:
+    #Concrete implementation using SMTP, sessions are reused from the worker process's pool
+    def _build_message(self, email: str, otp: str)->EmailMessage:
         msg = EmailMessage()
         msg.set_content(f"Your otp: {otp}")
         msg['Subject'] = "Verification Code for signing up to HopInn, This otp expires in 60 seconds"
         msg['From'] = email_settings.FROM_EMAIL
         msg['To'] = email
+        return msg
 
-
-        with smtplib.SMTP(email_settings.HOST, email_settings.PORT) as server:
-            server.starttls()
-            server.login(email_settings.USERNAME, email_settings.PASSWORD)
-            server.send_message(msg)
\ No newline at end of file
+    def send(self,email: str, otp: str) -> None:
+        get_smtp_pool().send_messages([self._build_message(email, otp)])
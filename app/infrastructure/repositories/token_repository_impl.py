@@ -4,16 +4,31 @@ from jose import jwt, JWTError
 from datetime import datetime
 from app.core.redis.redis_repo import RedisRepoInterface
 from typing import Optional
+from cachetools import TLRUCache
+import hashlib
+import time
+
+
+def _verified_token_expires_at(token_digest: bytes, payload: dict, now: float)->float:
+    """Keep a verified payload cached until the token itself expires"""
+    return payload['exp']
 
 
 class TokenRepositoryImpl(TokenRepository):
     def __init__(self, jwt_settings: JWTSettingsEntity, redis_client = RedisRepoInterface):
         self.jwt_settings = jwt_settings
         self.redis_client = redis_client
+        #verified access token payloads by token digest, so repeat requests skip the signature check
+        self._verified_tokens = TLRUCache(
+            maxsize=jwt_settings.VERIFIED_TOKEN_CACHE_SIZE,
+            ttu=_verified_token_expires_at,
+            timer=time.time
+        )
 
-    def generate_access_token(self, user_id: str)->str:
+    def generate_access_token(self, user_id: str, authz_claims: dict | None = None)->str:
         access_token = jwt.encode(
             claims = {
+                **(authz_claims or {}),
                 'user_id': user_id,
                 'type':"access",
                 "exp": datetime.utcnow() + self.jwt_settings.ACCESS_TOKEN_EXPIRE_MINUTES
@@ -36,6 +51,11 @@ class TokenRepositoryImpl(TokenRepository):
         return refresh_token
     
     def verify_access_token(self, token: str)->Optional[dict]:
+        token_digest = hashlib.sha256(token.encode('utf-8')).digest()
+        payload = self._verified_tokens.get(token_digest)
+        if payload is not None:
+            return payload
+
         try:
             payload = jwt.decode(token, self.jwt_settings.SECRET_KEY, algorithms=self.jwt_settings.ALGORITHM)
 
@@ -43,7 +63,10 @@ class TokenRepositoryImpl(TokenRepository):
             exp = payload.get('exp')
             if exp and datetime.utcfromtimestamp(exp) < datetime.utcnow():
                 return None
-            
+
+            #tokens without an expiry are not cached, there is nothing to bound how long they stay valid
+            if isinstance(exp, (int, float)):
+                self._verified_tokens[token_digest] = payload
             return payload
         except JWTError:
             return None
@@ -6,6 +6,8 @@ from sqlalchemy.future import select
 from sqlalchemy import update
 from sqlalchemy.exc import SQLAlchemyError
 from typing import Optional
+from app.core.redis.redis_repo import RedisRepoInterface
+from app.infrastructure.repositories.guide_profile_impl import invalidate_cached_guide_of_user
 
 import logging
 logger = logging.getLogger(__name__)
@@ -13,12 +15,17 @@ logger = logging.getLogger(__name__)
 class TravellerProfileImpl(TravellerProfileInterface):
     def __init__(
             self,
-            session: AsyncSession
+            session: AsyncSession,
+            redis_repo: Optional[RedisRepoInterface] = None,
+            read_session: Optional[AsyncSession] = None
     ):
         self.session = session
+        self.redis_repo = redis_repo
+        #profile reads may be served by the read replica
+        self.read_session = read_session or session
 
     async def get(self, user_id: str)->Optional[TravellerProfileSchema]:
-        profile_data = await self.session.scalar(
+        profile_data = await self.read_session.scalar(
             select(UserModel).where(UserModel.id == int(user_id))
         )
 
@@ -44,6 +51,8 @@ class TravellerProfileImpl(TravellerProfileInterface):
             logger.info(f'I am inside the profile implementation of update_profile, the result is: {result}')
 
             await self.session.commit()
+            #name and profile image are part of the cached guide details
+            await invalidate_cached_guide_of_user(self.session, self.redis_repo, user_id)
             return result.rowcount > 0
         except SQLAlchemyError:
             await self.session.rollback()
@@ -1,22 +1,28 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update
 from app.core.repositories.user_management_repo_interface import UserManagementRepoInterface
 from app.core.entities.user_management_entity import TravellerUserEntity, GuideUserEntity, HostUserEntity
+from app.core.redis.redis_repo import RedisRepoInterface
 from app.infrastructure.database.models.users.user import User
 from app.infrastructure.database.models.onboard import Guide, Host
+from app.infrastructure.repositories.user_permission_roles_impl import invalidate_user_permissions
+from app.infrastructure.repositories.guide_profile_impl import invalidate_cached_guides
 
 
 class UserManagementRepoImpl(UserManagementRepoInterface):
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, redis_repo: Optional[RedisRepoInterface] = None, read_db: Optional[AsyncSession] = None):
         self.db = db
+        self.redis_repo = redis_repo
+        #the admin listings may be served by the read replica
+        self.read_db = read_db or db
 
     async def get_travellers(self) -> List[TravellerUserEntity]:
         query = select(User).where(
             User.is_traveller == True,
             User.is_admin == False
         )
-        result = await self.db.execute(query)
+        result = await self.read_db.execute(query)
         users = result.scalars().all()
         
         return [
@@ -36,7 +42,7 @@ class UserManagementRepoImpl(UserManagementRepoInterface):
         query = select(User, Guide).join(Guide, User.id == Guide.user_id).where(
             User.is_guide == True
         )
-        result = await self.db.execute(query)
+        result = await self.read_db.execute(query)
         rows = result.all()
         
         return [
@@ -58,7 +64,7 @@ class UserManagementRepoImpl(UserManagementRepoInterface):
         query = select(User, Host).join(Host, User.id == Host.user_id).where(
             User.is_host == True
         )
-        result = await self.db.execute(query)
+        result = await self.read_db.execute(query)
         rows = result.all()
         
         return [
@@ -92,11 +98,13 @@ class UserManagementRepoImpl(UserManagementRepoInterface):
         await self.db.execute(user_update_query)
         
         # If blocking the user, also block their guide and host privileges
+        blocked_guide_ids = []
         if not is_active:
             # Block guide privileges if user is a guide
             if user.is_guide:
-                guide_update_query = update(Guide).where(Guide.user_id == user.id).values(is_blocked=True)
-                await self.db.execute(guide_update_query)
+                guide_update_query = update(Guide).where(Guide.user_id == user.id).values(is_blocked=True).returning(Guide.id)
+                guide_result = await self.db.execute(guide_update_query)
+                blocked_guide_ids = guide_result.scalars().all()
             
             # Block host privileges if user is a host
             if user.is_host:
@@ -104,6 +112,8 @@ class UserManagementRepoImpl(UserManagementRepoInterface):
                 await self.db.execute(host_update_query)
         
         await self.db.commit()
+        await invalidate_cached_guides(self.redis_repo, blocked_guide_ids)
+        await invalidate_user_permissions(self.redis_repo, [user.id])
         
         return {
             "email": email,
@@ -135,6 +145,8 @@ class UserManagementRepoImpl(UserManagementRepoInterface):
         await self.db.execute(guide_update_query)
         
         await self.db.commit()
+        await invalidate_cached_guides(self.redis_repo, [guide.id])
+        await invalidate_user_permissions(self.redis_repo, [user.id])
         
         return {
             "email": email,
@@ -166,6 +178,7 @@ class UserManagementRepoImpl(UserManagementRepoInterface):
         await self.db.execute(host_update_query)
         
         await self.db.commit()
+        await invalidate_user_permissions(self.redis_repo, [user.id])
         
         return {
             "email": email,
@@ -1,20 +1,98 @@
 from app.core.repositories import UserRolesPermissionsInterface
 from app.core.entities import UserRolesAndPermissionsEntity
+from app.core.redis.redis_repo import RedisRepoInterface
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.infrastructure.database.models.users.user import User as UserModel
 from app.infrastructure.database.models.onboard import Guide, Host
+from cachetools import TTLCache
+from typing import Iterable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+#Implementation that helps the route protection in the backend therefore entitiy is returned
+
+'''Roles and permissions are cached in two tiers, a short lived in-process cache in front of Redis. Writes that
+change a user's roles or blocked state call invalidate_user_permissions, which clears Redis and this process;
+other processes pick the change up once their local entry expires after LOCAL_CACHE_SECONDS. It also bumps the
+user's authz version so the role claims embedded in already issued access tokens stop being trusted.
+
+A cache miss reads the database after noting the authz version (and the local invalidation generation). The Redis
+entry is tagged with that version and ignored once the version moved on, and the local entry is only stored if no
+invalidation ran meanwhile, so a read that raced an invalidation cannot put the permissions it saw back.
+'''
+LOCAL_CACHE_SECONDS = 5
+LOCAL_CACHE_SIZE = 10000
+_local_permissions = TTLCache(maxsize=LOCAL_CACHE_SIZE, ttl=LOCAL_CACHE_SECONDS)
+_local_generation = 0
+
+
+async def invalidate_user_permissions(redis_repo: Optional[RedisRepoInterface], user_ids: Iterable)->None:
+    """Drop the cached roles and permissions of the given users and the role claims in their tokens"""
+    global _local_generation
+    user_ids = [str(user_id) for user_id in user_ids]
+    _local_generation += 1
+    for user_id in user_ids:
+        _local_permissions.pop(user_id, None)
+    if not redis_repo or not user_ids:
+        return
+    try:
+        await redis_repo.bump_authz_versions(user_ids)
+    except Exception as e:
+        logger.warning(f"Failed to bump authz versions for users {user_ids}: {str(e)}")
+    try:
+        await redis_repo.invalidate_cached_permissions(user_ids)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate cached permissions for users {user_ids}: {str(e)}")
 
-#Implementation that helps the route protection in the backend therefore entitiy is returned 
 
 class UserRolesPermissionsImpl(UserRolesPermissionsInterface):
     def __init__(
             self,
-            session: AsyncSession
+            session: AsyncSession,
+            redis_repo: Optional[RedisRepoInterface] = None
             ):
         self.session = session
-    
-    async def get_user_roles_and_permissions(self, user_id: str)->UserRolesAndPermissionsEntity:
+        self.redis_repo = redis_repo
+
+    async def get_user_roles_and_permissions(self, user_id: str, use_cache: bool = True)->UserRolesAndPermissionsEntity:
+        cache_key = str(user_id)
+        permissions = _local_permissions.get(cache_key) if use_cache else None
+        if permissions is not None:
+            return permissions
+
+        if self.redis_repo and use_cache:
+            try:
+                cached_permissions = await self.redis_repo.get_cached_permissions(cache_key)
+                if cached_permissions is not None:
+                    permissions = UserRolesAndPermissionsEntity.model_validate(cached_permissions)
+                    _local_permissions[cache_key] = permissions
+                    return permissions
+            except Exception as e:
+                logger.warning(f"Permissions cache read failed for user {user_id}: {str(e)}")
+
+        #noted before the database read, an invalidation committed after it makes what is read below stale
+        local_generation = _local_generation
+        authz_version = None
+        if self.redis_repo:
+            try:
+                authz_version = await self.redis_repo.ensure_authz_version(cache_key)
+            except Exception as e:
+                logger.warning(f"Authz version read failed for user {user_id}: {str(e)}")
+
+        permissions = await self._get_user_roles_and_permissions_from_db(user_id)
+
+        if local_generation == _local_generation:
+            _local_permissions[cache_key] = permissions
+        if authz_version is not None:
+            try:
+                await self.redis_repo.cache_permissions(cache_key, permissions.model_dump(), authz_version)
+            except Exception as e:
+                logger.warning(f"Permissions cache write failed for user {user_id}: {str(e)}")
+        return permissions
+
+    async def _get_user_roles_and_permissions_from_db(self, user_id: str)->UserRolesAndPermissionsEntity:
         query = (
             select(UserModel, Guide.is_blocked.label('guide_is_blocked'), Host.is_blocked.label('host_is_blocked'))
             .outerjoin(Guide, Guide.user_id == UserModel.id)
@@ -23,7 +101,7 @@ class UserRolesPermissionsImpl(UserRolesPermissionsInterface):
         )
         result = await self.session.execute(query)
         row = result.first()
-        user_data, guide_is_blocked, host_is_blocked = row 
+        user_data, guide_is_blocked, host_is_blocked = row
 
         return UserRolesAndPermissionsEntity(
             is_traveller=user_data.is_traveller,
@@ -33,4 +111,4 @@ class UserRolesPermissionsImpl(UserRolesPermissionsInterface):
             is_active=user_data.is_active,
             is_guide_blocked=guide_is_blocked,
             is_host_blocked=host_is_blocked
-        )
\ No newline at end of file
+        )
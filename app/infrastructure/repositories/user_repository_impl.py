@@ -5,10 +5,10 @@ from app.infrastructure.database.models.onboard import Guide,Host
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from passlib.context import CryptContext
+from app.infrastructure.password_hashing import PasswordHashingExecutor
 from app.api.schemas import UserRegisterSchema, UserRolesSchema
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from google.oauth2 import id_token
-from google.auth.transport import requests
+from app.infrastructure.google_id_token import get_google_id_token_verifier
 from typing import Optional
 import logging
 
@@ -20,21 +20,29 @@ class SQLAlchemyUserRepository(UserRepository):
     def __init__(
             self, 
             session: AsyncSession,
-            google_client:Optional[GoogleSettingsEntity] = None
+            google_client:Optional[GoogleSettingsEntity] = None,
+            password_hasher: Optional[PasswordHashingExecutor] = None
         ):
         self.session = session
         self.google_client = google_client
+        self.password_hasher = password_hasher
+
+    async def __run_bcrypt(self, func, *args):
+        #bcrypt is CPU bound, it runs on the hashing executor so the event loop is not blocked
+        if self.password_hasher is None:
+            return func(*args)
+        return await self.password_hasher.run(func, *args)
     
-    def __hash_password(self, password: str):
+    async def __hash_password(self, password: str):
         # Truncate password to 72 bytes to avoid bcrypt error
         password_bytes = password.encode('utf-8')
         if len(password_bytes) > 72:
             # Truncate to 72 bytes, not 72 characters
             password = password_bytes[:72].decode('utf-8', errors='ignore')
-        return pwd_context.hash(password)
+        return await self.__run_bcrypt(pwd_context.hash, password)
 
     async def create_user(self, user_data: UserRegisterSchema) -> bool:
-        hashed_password = self.__hash_password(user_data.password)
+        hashed_password = await self.__hash_password(user_data.password)
 
         try:
             db_user = UserModel(
@@ -56,9 +64,10 @@ class SQLAlchemyUserRepository(UserRepository):
             log.warning("User already exists: %s", user_data.email)
             return False
         except SQLAlchemyError as e:
+            #raised rather than reported as an existing user, the signup can be retried
             await self.session.rollback()
             log.exception("Database error occured while creating user")
-            return False
+            raise
     
     async def get_user_by_email(self, email: str)-> UserEntity | None:
         result = await self.session.execute(
@@ -97,7 +106,7 @@ class SQLAlchemyUserRepository(UserRepository):
             password = password_bytes[:72].decode('utf-8', errors='ignore')
             log.info(f"Password truncated from {original_length} bytes to {len(password.encode('utf-8'))} bytes")
         
-        return pwd_context.verify(password, hashed_password)
+        return await self.__run_bcrypt(pwd_context.verify, password, hashed_password)
 
     async def get_user_roles(self, user_id: str)->UserRolesSchema:
         query = (
@@ -130,7 +139,7 @@ class SQLAlchemyUserRepository(UserRepository):
         )
     
     async def create_admin_user(self, admin_data: AdminCreationEntity)->bool:
-        hashed_password = self.__hash_password(admin_data.password)
+        hashed_password = await self.__hash_password(admin_data.password)
 
         try:
             db_admin_user = UserModel(
@@ -162,12 +171,8 @@ class SQLAlchemyUserRepository(UserRepository):
         return result is not None
     
     async def verify_google_token(self, google_token: str)-> dict:
-        idinfo = id_token.verify_oauth2_token(
-            google_token,
-            requests.Request(),
-            self.google_client.CLIENT_ID
-        )
-        return idinfo
+        #keys come from the process wide JWKS cache, no certificate fetch per call
+        return await get_google_id_token_verifier(self.google_client).verify(google_token)
     
     async def update_google_user_info(self, email: str, google_id: str, picture: str)->bool:
         """Update user's google information"""
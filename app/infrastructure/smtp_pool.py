@@ -0,0 +1,142 @@
+import os
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
+from typing import Iterable, Optional
+from app.config.email_config import email_settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+'''Per process pool of authenticated SMTP sessions for the email worker.
+
+Opening a session costs a TCP connect, STARTTLS and a login, so sessions are kept open and reused across tasks.
+A session idle for longer than MAX_IDLE_SECONDS is closed instead of reused, since servers drop idle clients.
+When a pooled session turns out to be dead the messages not sent yet are retried once over a fresh session.
+The pool is tied to the process that created it, a forked worker child builds its own rather than sharing the
+parent's sockets.
+'''
+
+#errors that mean the session is unusable, anything else (e.g. a refused recipient) is a problem with the message
+_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, TimeoutError)
+
+
+class SMTPConnectionPool:
+    def __init__(self, host: str, port: int, username: str, password: str, max_size: int, max_idle_seconds: float, timeout: float):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.timeout = timeout
+        self._idle: list[tuple[smtplib.SMTP, float]] = []  # session, monotonic time it was released
+        self._lock = threading.Lock()
+
+    def _connect(self)->smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            server.starttls()
+            server.login(self.username, self.password)
+        except Exception:
+            self._close(server)
+            raise
+        logger.info(f"Opened SMTP session to {self.host}:{self.port}")
+        return server
+
+    @staticmethod
+    def _close(server: smtplib.SMTP)->None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def acquire(self)->smtplib.SMTP:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                server, released_at = self._idle.pop()
+            if time.monotonic() - released_at < self.max_idle_seconds:
+                return server
+            self._close(server)
+        return self._connect()
+
+    def release(self, server: smtplib.SMTP)->None:
+        with self._lock:
+            if len(self._idle) < self.max_size:
+                self._idle.append((server, time.monotonic()))
+                return
+        self._close(server)
+
+    def send_messages(self, messages: Iterable[EmailMessage])->None:
+        """Send the messages over one session, reconnecting once if the session drops midway"""
+        pending = list(messages)
+        reconnected = False
+        while pending:
+            server = self.acquire()
+            try:
+                while pending:
+                    server.send_message(pending[0])
+                    pending.pop(0)
+            except _CONNECTION_ERRORS as e:
+                self._close(server)
+                if reconnected:
+                    raise
+                logger.warning(f"SMTP session failed, reconnecting: {str(e)}")
+                reconnected = True
+                continue
+            except smtplib.SMTPRecipientsRefused:
+                #a bad address, smtplib has already reset the transaction so the session goes back to the pool
+                self.release(server)
+                raise
+            except smtplib.SMTPResponseException as e:
+                if e.smtp_code != 421:
+                    #the message was rejected, the session itself is still usable
+                    self.release(server)
+                    raise
+                #421 is the server closing the session
+                self._close(server)
+                if reconnected:
+                    raise
+                reconnected = True
+                continue
+            except Exception:
+                self._close(server)
+                raise
+            self.release(server)
+
+    def close(self)->None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            self._close(server)
+
+
+_pool: Optional[SMTPConnectionPool] = None
+_pool_pid: Optional[int] = None
+
+
+def get_smtp_pool()->SMTPConnectionPool:
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        _pool = SMTPConnectionPool(
+            host=email_settings.HOST,
+            port=email_settings.PORT,
+            username=email_settings.USERNAME,
+            password=email_settings.PASSWORD,
+            max_size=email_settings.POOL_SIZE,
+            max_idle_seconds=email_settings.MAX_IDLE_SECONDS,
+            timeout=email_settings.TIMEOUT_SECONDS
+        )
+        _pool_pid = os.getpid()
+    return _pool
+
+
+def close_smtp_pool()->None:
+    global _pool, _pool_pid
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.close()
+    _pool = None
+    _pool_pid = None
@@ -1,14 +1,64 @@
+import smtplib
 from celery import Celery
+from celery.signals import worker_process_shutdown
+from celery.utils.time import get_exponential_backoff_interval
+from kombu import Queue
 from app.config.redis import redis_settings
 from app.infrastructure.repositories import SMTPEmail
+from app.infrastructure.smtp_pool import close_smtp_pool
+
+'''Time critical OTP mail has its own queue so it never waits behind background work. Run a worker per queue so
+each gets its own concurrency, e.g.
+
+    celery -A app.infrastructure.task_queues.celery worker -Q otp -c 4 -n otp@%h
+    celery -A app.infrastructure.task_queues.celery worker -Q background -c 2 -n background@%h
+
+Workers prefetch one task per process, a long task cannot hold back others already reserved by the same process.
+Nothing reads task results, so there is no result backend and results are ignored.
+'''
+
+OTP_QUEUE = 'otp'
+BACKGROUND_QUEUE = 'background'
+
+RETRY_BACKOFF_SECONDS = 2
+RETRY_BACKOFF_MAX_SECONDS = 60
+MAX_EMAIL_RETRIES = 5
 
 celery = Celery(
     'tasks',
-    broker = f'redis://{redis_settings.HOST}:{redis_settings.PORT}/{redis_settings.DB}',
-    backend = f'redis://{redis_settings.HOST}:{redis_settings.PORT}/{redis_settings.DB}'
+    broker = f'redis://{redis_settings.HOST}:{redis_settings.PORT}/{redis_settings.DB}'
 )
 
-@celery.task
-def send_otp_email(email: str, otp: str):
+celery.conf.update(
+    task_queues=(Queue(OTP_QUEUE), Queue(BACKGROUND_QUEUE)),
+    task_default_queue=BACKGROUND_QUEUE,
+    task_ignore_result=True,
+    worker_prefetch_multiplier=1
+)
+
+@worker_process_shutdown.connect
+def close_smtp_sessions(**kwargs):
+    close_smtp_pool()
+
+#4xx replies and dropped connections are worth retrying, 5xx replies (e.g. a refused address) are not
+def _is_transient_smtp_error(error: Exception)->bool:
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code < 500
+    return isinstance(error, (smtplib.SMTPServerDisconnected, OSError))
+
+#an otp mail is useless once the otp has expired, so it is neither delivered nor retried after that
+@celery.task(bind=True, queue=OTP_QUEUE, max_retries=MAX_EMAIL_RETRIES, expires=redis_settings.OTP_EXPIRE_SECONDS)
+def send_otp_email(self, email: str, otp: str):
     email_repo = SMTPEmail()
-    email_repo.send(email, otp)
\ No newline at end of file
+    try:
+        email_repo.send(email, otp)
+    except Exception as e:
+        if not _is_transient_smtp_error(e):
+            raise
+        countdown = get_exponential_backoff_interval(
+            factor=RETRY_BACKOFF_SECONDS,
+            retries=self.request.retries,
+            maximum=RETRY_BACKOFF_MAX_SECONDS,
+            full_jitter=True
+        )
+        raise self.retry(exc=e, countdown=countdown)
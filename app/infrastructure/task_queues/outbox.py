@@ -0,0 +1,141 @@
+import asyncio
+import time
+from typing import Optional
+from celery import Task
+from app.core.exceptions import TaskOutboxFullError
+from app.infrastructure.metrics import register_metrics, unregister_metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+'''Bounded in-process outbox for publishing Celery tasks from async code.
+
+Publishing a task is a blocking round trip to the broker, request handlers only put the task in this outbox and
+return. A single background publisher drains it in batches of up to PUBLISH_BATCH_SIZE, publishing each batch in a
+worker thread over one producer connection, so request latency does not depend on broker latency. A batch the
+broker refuses is retried up to PUBLISH_ATTEMPTS times with exponential backoff, resending only the tasks not yet
+published, before it is given up on. The outbox holds at most MAX_SIZE tasks, once the broker falls that far behind
+enqueue raises TaskOutboxFullError instead of letting memory grow.
+'''
+
+MAX_SIZE = 1000
+PUBLISH_BATCH_SIZE = 50
+PUBLISH_ATTEMPTS = 5
+RETRY_DELAY_SECONDS = 0.5
+MAX_RETRY_DELAY_SECONDS = 10
+SHUTDOWN_FLUSH_TIMEOUT_SECONDS = 5
+
+
+class TaskOutbox:
+    def __init__(self, max_size: int = MAX_SIZE, batch_size: int = PUBLISH_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self._publisher: Optional[asyncio.Task] = None
+        self._published = 0
+        self._failed = 0
+        self._retries = 0
+        self._rejected = 0
+        self._batches = 0
+        self._total_publish_seconds = 0.0
+
+    def enqueue(self, task: Task, *args, **kwargs)->None:
+        try:
+            self._queue.put_nowait((task, args, kwargs))
+        except asyncio.QueueFull:
+            self._rejected += 1
+            raise TaskOutboxFullError("Too many pending background tasks, please try again shortly")
+        self.start()
+
+    @staticmethod
+    def _publish_batch(batch: list)->None:
+        """Publish the batch in order, each task leaves the list once the broker has it"""
+        task = batch[0][0]
+        #one producer, and so one broker connection, for the whole batch
+        with task.app.producer_or_acquire() as producer:
+            while batch:
+                task, args, kwargs = batch[0]
+                task.apply_async(args=args, kwargs=kwargs, producer=producer)
+                batch.pop(0)
+
+    async def _publish_with_retries(self, batch: list)->None:
+        pending = list(batch)
+        delay = RETRY_DELAY_SECONDS
+        for attempt in range(1, PUBLISH_ATTEMPTS + 1):
+            try:
+                await asyncio.to_thread(self._publish_batch, pending)
+                break
+            except Exception as e:
+                if attempt == PUBLISH_ATTEMPTS:
+                    logger.error(f"Giving up on {len(pending)} tasks after {attempt} publish attempts: {str(e)}")
+                    break
+                self._retries += 1
+                logger.warning(f"Failed to publish {len(pending)} tasks, retrying in {delay}s: {str(e)}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY_SECONDS)
+        self._published += len(batch) - len(pending)
+        self._failed += len(pending)
+
+    async def _publish(self)->None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            started = time.perf_counter()
+            try:
+                await self._publish_with_retries(batch)
+            finally:
+                self._batches += 1
+                self._total_publish_seconds += time.perf_counter() - started
+                for _ in batch:
+                    self._queue.task_done()
+
+    def start(self)->None:
+        if self._publisher is None or self._publisher.done():
+            self._publisher = asyncio.create_task(self._publish())
+
+    async def stop(self)->None:
+        """Give the queued tasks a chance to be published, then stop the publisher"""
+        if self._publisher is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), SHUTDOWN_FLUSH_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning(f"Stopping the task outbox with {self._queue.qsize()} tasks unpublished")
+        self._publisher.cancel()
+        try:
+            await self._publisher
+        except asyncio.CancelledError:
+            pass
+        self._publisher = None
+
+    def metrics(self)->dict:
+        return {
+            'depth': self._queue.qsize(),
+            'max_size': self._queue.maxsize,
+            'published': self._published,
+            'failed': self._failed,
+            'retries': self._retries,
+            'rejected': self._rejected,
+            'batches': self._batches,
+            'avg_batch_publish_ms': (self._total_publish_seconds / self._batches) * 1000 if self._batches else 0.0
+        }
+
+
+_outbox: Optional[TaskOutbox] = None
+
+
+def get_task_outbox()->TaskOutbox:
+    global _outbox
+    if _outbox is None:
+        _outbox = TaskOutbox()
+        register_metrics('task_outbox', _outbox.metrics)
+    return _outbox
+
+
+async def close_task_outbox()->None:
+    global _outbox
+    if _outbox is not None:
+        await _outbox.stop()
+        unregister_metrics('task_outbox')
+        _outbox = None
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routers import auth_router, profile_router, role_router, cloudinary_router, kyc_router, onboard_router, guide_profile_router, host_profile_router, property_router, admin_router, home_page_filter_router
@@ -5,6 +6,12 @@ from app.api.middlewares.jwt_middleware import JWTMiddleware
 from app.api.dependencies import get_token_repository, get_redis_client
 from app.infrastructure.config.jwt_settings_adaptor import get_core_jwt_settings
 from app.infrastructure.config.redis_settings_adaptor import get_core_redis_settings
+from app.infrastructure.redis.token_revocation_filter import TokenRevocationFilter
+from app.infrastructure.redis.pool import open_redis_pool, close_redis_pool
+from app.infrastructure.password_hashing import shutdown_password_hashing_executor
+from app.infrastructure.google_id_token import close_google_id_token_verifier
+from app.infrastructure.task_queues.outbox import close_task_outbox
+from app.infrastructure.metrics import register_metrics
 import os
 from dotenv import load_dotenv
 from app.core.logging_setup import setup_logging
@@ -12,8 +19,6 @@ from app.core.logging_setup import setup_logging
 load_dotenv()
 setup_logging()
 
-app = FastAPI()
-
 
 allowed_origins = os.getenv("CORS_ALLOWED_ORIGINS", "http://localhost:5173").split(',')
 
@@ -26,13 +31,31 @@ doesnt work with annotated dependencies for middlewares
 '''
 redis_repo = get_redis_client(redis_settings=redis_client)
 token_repo = get_token_repository(jwt_settings=jwt_settings, redis_client=redis_client)
+revocation_filter = TokenRevocationFilter(redis_repo)
+register_metrics('token_revocation_filter', revocation_filter.metrics)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await open_redis_pool(redis_client)
+    revocation_filter.start()
+    yield
+    await close_task_outbox()
+    await revocation_filter.stop()
+    await close_redis_pool()
+    shutdown_password_hashing_executor()
+    await close_google_id_token_verifier()
+
+
+app = FastAPI(lifespan=lifespan)
 
 #Add JWT middleware with exempt paths
 app.add_middleware(
     JWTMiddleware,
     token_repo = token_repo,
     redis_repo= redis_repo,
-    exempt_paths=['/auth','/docs', '/openapi.json']
+    exempt_paths=['/auth','/docs', '/openapi.json'],
+    revocation_filter=revocation_filter
 )
 
 
@@ -0,0 +1,151 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+from app.infrastructure.google_id_token import GoogleIdTokenVerifier
+
+CLIENT_ID = 'hopinn-test-client'
+
+
+def signing_key(key_id: str):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    public_jwk = jwk.construct(public_pem, 'RS256').to_dict()
+    public_jwk.update(kid=key_id, alg='RS256', use='sig')
+    return private_pem, public_jwk
+
+
+def id_token(private_pem: str, key_id: str, issuer: str = 'https://accounts.google.com')->str:
+    now = int(time.time())
+    claims = {'iss': issuer, 'aud': CLIENT_ID, 'sub': '1234', 'email': 'asha@example.com', 'iat': now, 'exp': now + 600}
+    return jwt.encode(claims, private_pem, algorithm='RS256', headers={'kid': key_id})
+
+
+class FakeGoogleCerts:
+    '''Serves a JWKS document on localhost the way Google's certs endpoint does, counting the fetches'''
+    def __init__(self):
+        self.keys = []
+        self.max_age = 3600
+        self.fetches = 0
+        certs = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                certs.fetches += 1
+                body = json.dumps({'keys': certs.keys}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Cache-Control', f'public, max-age={certs.max_age}, must-revalidate')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/oauth2/v3/certs'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def certs():
+    certs = FakeGoogleCerts()
+    yield certs
+    certs.close()
+
+
+def verify(certs: FakeGoogleCerts, *tokens: str, settle: float = 0.0):
+    '''Verify the tokens in turn with one verifier, results are claims or the raised ValueError'''
+    async def run():
+        verifier = GoogleIdTokenVerifier(client_id=CLIENT_ID, jwks_url=certs.url)
+        results = []
+        try:
+            for token in tokens:
+                try:
+                    results.append(await verifier.verify(token))
+                except ValueError as e:
+                    results.append(e)
+            #gives a background refresh the chance to run
+            await asyncio.sleep(settle)
+        finally:
+            await verifier.close()
+        return results
+    return asyncio.run(run())
+
+
+def test_valid_token_is_verified(certs):
+    private_pem, public_jwk = signing_key('key-1')
+    certs.keys = [public_jwk]
+
+    [claims] = verify(certs, id_token(private_pem, 'key-1'))
+
+    assert claims['email'] == 'asha@example.com'
+    assert claims['aud'] == CLIENT_ID
+
+
+def test_token_from_another_issuer_is_rejected(certs):
+    private_pem, public_jwk = signing_key('key-1')
+    certs.keys = [public_jwk]
+
+    [error] = verify(certs, id_token(private_pem, 'key-1', issuer='https://evil.example.com'))
+
+    assert isinstance(error, ValueError)
+    assert 'Invalid Google token' in str(error)
+
+
+def test_unknown_key_id_refreshes_the_keys(certs):
+    old_pem, old_jwk = signing_key('key-1')
+    new_pem, new_jwk = signing_key('key-2')
+    certs.keys = [old_jwk]
+
+    async def run():
+        verifier = GoogleIdTokenVerifier(client_id=CLIENT_ID, jwks_url=certs.url)
+        try:
+            await verifier.verify(id_token(old_pem, 'key-1'))
+            #Google rotates its keys while the cached set is still fresh
+            certs.keys = [old_jwk, new_jwk]
+            return await verifier.verify(id_token(new_pem, 'key-2'))
+        finally:
+            await verifier.close()
+
+    claims = asyncio.run(run())
+
+    assert claims['sub'] == '1234'
+    assert certs.fetches == 2
+
+
+def test_keys_are_cached_for_their_max_age(certs):
+    private_pem, public_jwk = signing_key('key-1')
+    certs.keys = [public_jwk]
+    token = id_token(private_pem, 'key-1')
+
+    results = verify(certs, token, token, token)
+
+    assert all(not isinstance(result, ValueError) for result in results)
+    assert certs.fetches == 1
+
+
+def test_short_max_age_is_not_refreshed_on_every_call(certs):
+    private_pem, public_jwk = signing_key('key-1')
+    certs.keys = [public_jwk]
+    certs.max_age = 120  # shorter than the usual refresh-ahead margin
+    token = id_token(private_pem, 'key-1')
+
+    verify(certs, token, token, token, settle=0.2)
+
+    assert certs.fetches == 1
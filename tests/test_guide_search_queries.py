@@ -0,0 +1,69 @@
+import asyncio
+from datetime import datetime
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from conftest import make_row
+from app.infrastructure.database.models.onboard import Languages
+from app.infrastructure.repositories.home_page_repo_impl import HomePageRepositoryImpl
+
+
+def guide_row(guide_id: int):
+    return make_row(
+        id=guide_id,
+        user_id=100 + guide_id,
+        bio='Local guide',
+        profession='Teacher',
+        expertise='Backwaters',
+        hourly_rate='500',
+        house_name='Lake View',
+        landmark=None,
+        pincode='688001',
+        district='Alappuzha',
+        state='Kerala',
+        country='India',
+        location_wkt='POINT(76.33 9.49)',
+        created_at=datetime(2025, 1, 1),
+        updated_at=datetime(2025, 1, 1),
+        first_name='Guide',
+        last_name=str(guide_id),
+        profile_image=None
+    )
+
+
+async def convert_page(page_size: int):
+    '''Convert a page of guide rows against a real database, counting the statements the conversion runs'''
+    engine = create_async_engine('sqlite+aiosqlite://')
+    async with engine.begin() as connection:
+        await connection.run_sync(Languages.__table__.create)
+        rows = [
+            {'user_id': 100 + guide_id, 'language': language}
+            for guide_id in range(1, page_size + 1)
+            for language in ('English', 'Malayalam')
+        ]
+        if rows:
+            await connection.execute(Languages.__table__.insert(), rows)
+
+    statements = []
+    event.listen(engine.sync_engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+    async with async_sessionmaker(engine)() as session:
+        repo = HomePageRepositoryImpl(session)
+        guides = await repo._to_guide_search_entities([guide_row(guide_id) for guide_id in range(1, page_size + 1)])
+    await engine.dispose()
+    return guides, statements
+
+
+@pytest.mark.parametrize('page_size', [1, 10, 50])
+def test_guide_languages_are_loaded_with_one_query_per_page(page_size):
+    guides, statements = asyncio.run(convert_page(page_size))
+
+    assert len(statements) == 1
+    assert len(guides) == page_size
+    assert all(sorted(guide.known_languages) == ['English', 'Malayalam'] for guide in guides)
+
+
+def test_empty_page_runs_no_language_query():
+    guides, statements = asyncio.run(convert_page(0))
+
+    assert guides == []
+    assert statements == []
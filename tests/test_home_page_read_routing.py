@@ -0,0 +1,99 @@
+import asyncio
+from conftest import RecordingSession
+from app.core.entities.traveller.home_page import PropertySearchQueryEntity, GuideSearchQueryEntity
+from app.infrastructure.config.redis_settings_adaptor import get_core_redis_settings
+from app.infrastructure.redis.redis_client import RedisClient
+from app.infrastructure.repositories.home_page_repo_impl import HomePageRepositoryImpl
+
+
+class EmptySearchCache:
+    '''Guide and property search cache commands of RedisClient, always missing and recording what is written'''
+    def __init__(self):
+        self.written = []
+
+    async def get_cached_guide(self, guide_id):
+        return None
+
+    async def cache_guide(self, guide_id, guide_data, from_replica=False):
+        self.written.append(('guide', from_replica))
+
+    def get_property_search_grid_degrees(self):
+        return 0.1
+
+    async def get_property_search_versions(self, cells):
+        return [0 for _ in cells]
+
+    async def get_cached_property_search(self, key):
+        return None
+
+    async def cache_property_search(self, key, search_data, from_replica=False):
+        self.written.append(('search', from_replica))
+
+
+def test_cached_reads_run_on_the_replica_and_are_cached_briefly():
+    primary, replica = RecordingSession(), RecordingSession(results=[[], []])
+    cache = EmptySearchCache()
+    repo = HomePageRepositoryImpl(primary, cache, replica)
+
+    asyncio.run(repo.get_guide_by_id(1))
+    asyncio.run(repo.search_properties(PropertySearchQueryEntity(all=True)))
+
+    assert primary.statements == []
+    assert len(replica.statements) == 2
+    assert cache.written == [('search', True)]
+
+
+def test_reads_on_the_primary_are_cached_for_the_full_ttl():
+    #get_read_db hands out the primary inside the user's read-your-writes window
+    primary = RecordingSession(results=[[]])
+    cache = EmptySearchCache()
+    repo = HomePageRepositoryImpl(primary, cache, primary)
+
+    asyncio.run(repo.search_properties(PropertySearchQueryEntity(all=True)))
+
+    assert len(primary.statements) == 1
+    assert cache.written == [('search', False)]
+
+
+def test_uncached_reads_stay_on_the_replica():
+    primary, replica = RecordingSession(), RecordingSession(results=[[]])
+    repo = HomePageRepositoryImpl(primary, EmptySearchCache(), replica)
+
+    asyncio.run(repo.search_guides(GuideSearchQueryEntity(destination='Kochi')))
+
+    assert primary.statements == []
+    assert len(replica.statements) == 1
+
+
+def test_without_a_cache_everything_reads_the_replica():
+    primary, replica = RecordingSession(), RecordingSession(results=[[]])
+    repo = HomePageRepositoryImpl(primary, None, replica)
+
+    asyncio.run(repo.search_properties(PropertySearchQueryEntity(all=True)))
+
+    assert primary.statements == []
+    assert len(replica.statements) == 1
+
+
+class RecordedExpiry:
+    def __init__(self):
+        self.expiry = {}
+
+    async def setex(self, key, seconds, value):
+        self.expiry[key] = seconds
+
+
+def test_replica_reads_are_cached_only_for_the_replica_ttl():
+    settings = get_core_redis_settings()
+    redis_client = RedisClient(settings)
+    redis_client._client = RecordedExpiry()
+
+    asyncio.run(redis_client.cache_property_search('primary', {}))
+    asyncio.run(redis_client.cache_property_search('replica', {}, from_replica=True))
+    asyncio.run(redis_client.cache_guide(1, {}, from_replica=True))
+
+    assert redis_client._client.expiry == {
+        'primary': settings.PROPERTY_SEARCH_CACHE_EXPIRE_SECONDS,
+        'replica': settings.REPLICA_READ_CACHE_EXPIRE_SECONDS,
+        'guide:1': settings.REPLICA_READ_CACHE_EXPIRE_SECONDS
+    }
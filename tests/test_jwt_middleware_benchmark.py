@@ -0,0 +1,123 @@
+'''In-process comparison of JWTMiddleware with the BaseHTTPMiddleware implementation it replaced.
+
+Requests are driven as raw ASGI calls against a one route Starlette app, so the numbers are the middleware stack
+alone. Under pytest a short run checks both stacks answer the same way; run the module directly for the timings:
+
+    PYTHONPATH=. python tests/test_jwt_middleware_benchmark.py 20000
+'''
+import asyncio
+import sys
+import time
+from typing import Callable
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+from app.api.middlewares.jwt_middleware import JWTMiddleware
+
+EXEMPT_PATHS = ['/auth/', '/docs', '/openapi.json', '/admin/metrics']
+
+
+class StaticTokens:
+    async def is_token_blacklisted(self, token):
+        return False
+
+    def verify_access_token(self, token):
+        return {'user_id': '7'} if token == 'valid' else None
+
+    def decode_token(self, token):
+        return self.verify_access_token(token)
+
+
+class BaseHTTPJWTMiddleware(BaseHTTPMiddleware):
+    '''JWTMiddleware as it was before the pure ASGI rewrite'''
+    def __init__(self, app, token_repo, redis_repo, exempt_paths=None):
+        super().__init__(app)
+        self.token_repo = token_repo
+        self.redis_repo = redis_repo
+        self.exempt_paths = exempt_paths or []
+
+    async def dispatch(self, request: Request, call_next: Callable):
+        if any(request.url.path.startswith(exempt_path) for exempt_path in self.exempt_paths):
+            return await call_next(request)
+        token = request.cookies.get('access_token')
+        if not token or await self.redis_repo.is_token_blacklisted(token):
+            return JSONResponse(status_code=401, content={'status': 'error', 'message': 'Invalid Token, Log in again'})
+        payload = self.token_repo.verify_access_token(token)
+        payload = payload and self.token_repo.decode_token(token)
+        if not payload or 'user_id' not in payload:
+            return JSONResponse(status_code=401, content={'status': 'error', 'message': 'Invalid Token, Log in again'})
+        request.state.user_id = payload['user_id']
+        request.state.token_payload = payload
+        request.state.token = token
+        return await call_next(request)
+
+
+def build_app(middleware_class):
+    async def profile(request: Request):
+        return PlainTextResponse(request.state.user_id)
+
+    app = Starlette(routes=[Route('/traveller/profile', profile)])
+    tokens = StaticTokens()
+    app.add_middleware(middleware_class, token_repo=tokens, redis_repo=tokens, exempt_paths=EXEMPT_PATHS)
+    return app
+
+
+async def call(app, token: str)->tuple[int, bytes]:
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': '/traveller/profile', 'raw_path': b'/traveller/profile', 'root_path': '', 'query_string': b'',
+        'headers': [(b'host', b'testserver'), (b'cookie', f'access_token={token}'.encode())],
+        'client': ('127.0.0.1', 50000), 'server': ('testserver', 80)
+    }
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    status = next(message['status'] for message in sent if message['type'] == 'http.response.start')
+    body = b''.join(message.get('body', b'') for message in sent if message['type'] == 'http.response.body')
+    return status, body
+
+
+async def time_requests(app, requests: int)->float:
+    '''Mean microseconds per authenticated request'''
+    await call(app, 'valid')  # builds the middleware stack outside the timing
+    started = time.perf_counter()
+    for _ in range(requests):
+        await call(app, 'valid')
+    return (time.perf_counter() - started) / requests * 1_000_000
+
+
+def run_benchmark(requests: int)->dict:
+    async def run():
+        return {
+            name: await time_requests(build_app(middleware_class), requests)
+            for name, middleware_class in (('BaseHTTPMiddleware', BaseHTTPJWTMiddleware), ('pure ASGI', JWTMiddleware))
+        }
+    return asyncio.run(run())
+
+
+def test_both_middlewares_answer_the_same():
+    async def responses(middleware_class):
+        app = build_app(middleware_class)
+        return [await call(app, token) for token in ('valid', 'forged')]
+
+    assert asyncio.run(responses(JWTMiddleware)) == asyncio.run(responses(BaseHTTPJWTMiddleware))
+    assert asyncio.run(responses(JWTMiddleware))[0] == (200, b'7')
+
+
+def test_benchmark_runs():
+    timings = run_benchmark(requests=200)
+    assert all(microseconds > 0 for microseconds in timings.values())
+
+
+if __name__ == '__main__':
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    for name, microseconds in run_benchmark(requests).items():
+        print(f"{name:<20}{microseconds:8.1f} us/request")
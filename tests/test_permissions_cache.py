@@ -0,0 +1,59 @@
+import asyncio
+from app.core.entities import UserRolesAndPermissionsEntity
+from app.infrastructure.repositories import user_permission_roles_impl
+from app.infrastructure.repositories.user_permission_roles_impl import UserRolesPermissionsImpl, invalidate_user_permissions
+
+
+class InMemoryPermissionsCache:
+    '''The permissions and authz version commands of RedisClient, kept in dicts'''
+    def __init__(self):
+        self.entries = {}
+        self.versions = {}
+
+    async def get_cached_permissions(self, user_id):
+        cached = self.entries.get(user_id)
+        if cached is None or cached['authz_version'] != self.versions.get(user_id):
+            return None
+        return cached['permissions']
+
+    async def cache_permissions(self, user_id, permissions, authz_version):
+        self.entries[user_id] = {'authz_version': authz_version, 'permissions': permissions}
+
+    async def invalidate_cached_permissions(self, user_ids):
+        for user_id in user_ids:
+            self.entries.pop(user_id, None)
+
+    async def ensure_authz_version(self, user_id):
+        return self.versions.setdefault(user_id, 0)
+
+    async def bump_authz_versions(self, user_ids):
+        for user_id in user_ids:
+            self.versions[user_id] = self.versions.setdefault(user_id, 0) + 1
+
+
+class RacingPermissionsRepo(UserRolesPermissionsImpl):
+    '''Reads the database row, then lets the user get blocked before the read is cached'''
+    def __init__(self, redis_repo, blocked):
+        super().__init__(session=None, redis_repo=redis_repo)
+        self.blocked = blocked
+        self.reads = 0
+
+    async def _get_user_roles_and_permissions_from_db(self, user_id):
+        self.reads += 1
+        permissions = UserRolesAndPermissionsEntity(is_traveller=True, is_guide=False, is_host=False, is_admin=False, is_active=not self.blocked)
+        if not self.blocked:
+            self.blocked = True
+            await invalidate_user_permissions(self.redis_repo, [user_id])
+        return permissions
+
+
+def test_read_racing_an_invalidation_is_not_served_from_the_cache():
+    user_permission_roles_impl._local_permissions.clear()
+    repo = RacingPermissionsRepo(InMemoryPermissionsCache(), blocked=False)
+
+    stale = asyncio.run(repo.get_user_roles_and_permissions('7'))
+    fresh = asyncio.run(repo.get_user_roles_and_permissions('7'))
+
+    assert stale.is_active is True
+    assert fresh.is_active is False
+    assert repo.reads == 2
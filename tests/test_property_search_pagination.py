@@ -0,0 +1,116 @@
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+import pytest
+from conftest import RecordingSession, make_row
+from app.core.entities.traveller.home_page import PropertySearchQueryEntity
+from app.core.use_cases.traveller.home_page import TravellerHomePageUseCase
+from app.infrastructure.repositories.home_page_repo_impl import HomePageRepositoryImpl
+
+PAGE_SIZE = 2
+
+
+def property_row(property_id: int, child_friendly: bool, knn_distance=None):
+    created_at = datetime(2025, 1, 1) + timedelta(days=property_id)
+    return make_row(
+        id=property_id,
+        property_name=f'Property {property_id}',
+        property_description='A place to stay',
+        child_friendly=child_friendly,
+        max_guests=4,
+        bedrooms=2,
+        price_per_night=Decimal('1500.00'),
+        property_type='homestay',
+        created_at=created_at,
+        updated_at=created_at,
+        host_id=1,
+        house_name='Green House',
+        landmark=None,
+        pincode='682001',
+        district='Ernakulam',
+        state='Kerala',
+        country='India',
+        latitude=9.98,
+        longitude=76.28,
+        primary_image_url=None,
+        distance=knn_distance,
+        knn_distance=knn_distance
+    )
+
+
+QUERIES = {
+    'child_friendly_created_at': dict(all=True),
+    'child_friendly_distance': dict(destination='Kochi', latitude=9.98, longitude=76.28, children_onboard=True),
+    'distance_child_friendly': dict(destination='Kochi', latitude=9.98, longitude=76.28, children_onboard=False),
+}
+
+
+@pytest.mark.parametrize('sort_mode', list(QUERIES))
+@pytest.mark.parametrize('last_child_friendly', [True, False])
+def test_second_page_is_fetched_with_the_returned_cursor(sort_mode, last_child_friendly):
+    first_page = [property_row(1, True, 120.5), property_row(2, last_child_friendly, 340.25)]
+    session = RecordingSession(results=[first_page, [property_row(3, False, 800.0)]])
+    use_case = TravellerHomePageUseCase(HomePageRepositoryImpl(session))
+
+    query = PropertySearchQueryEntity(page_size=PAGE_SIZE, include_total=False, **QUERIES[sort_mode])
+    page_one = asyncio.run(use_case.search_properties(query))
+    assert page_one.next_cursor is not None
+
+    next_query = query.model_copy(update={'cursor': page_one.next_cursor})
+    page_two = asyncio.run(use_case.search_properties(next_query))
+
+    assert [prop.id for prop in page_two.properties] == [3]
+    assert len(session.statements) == 2
+    # the keyset predicate replaces OFFSET on the second page
+    assert 'OFFSET' not in session.statements[1]
+    assert 'property_search_doc.property_id' in session.statements[1].split('WHERE', 1)[1]
+
+
+def test_cursor_from_another_ordering_is_rejected():
+    repo = HomePageRepositoryImpl(RecordingSession())
+    cursor = repo.encode_cursor(PropertySearchQueryEntity(all=True), property_row(1, True))
+    query = PropertySearchQueryEntity(cursor=cursor, **QUERIES['distance_child_friendly'])
+    with pytest.raises(ValueError):
+        repo._build_property_search_query(query)
+
+
+def test_nearest_first_total_is_counted_apart_from_the_page():
+    session = RecordingSession(results=[[property_row(1, True, 120.5)], [7]])
+    repo = HomePageRepositoryImpl(session)
+
+    query = PropertySearchQueryEntity(page_size=PAGE_SIZE, **QUERIES['distance_child_friendly'])
+    properties, total_count = asyncio.run(repo.search_properties_with_count(query))
+
+    assert [prop.id for prop in properties] == [1]
+    assert total_count == 7
+    # a window count on the page would read every match and cancel the KNN early stop
+    assert 'OVER' not in session.statements[0]
+    assert session.statements[1].startswith('SELECT count(*)')
+
+
+def test_total_rides_on_the_page_rows_for_other_orderings():
+    row = property_row(1, True, 0.0)
+    row.total_count = 5
+    session = RecordingSession(results=[[row]])
+    repo = HomePageRepositoryImpl(session)
+
+    query = PropertySearchQueryEntity(page_size=PAGE_SIZE, **QUERIES['child_friendly_created_at'])
+    _, total_count = asyncio.run(repo.search_properties_with_count(query))
+
+    assert total_count == 5
+    assert len(session.statements) == 1
+    assert 'count(*) OVER ()' in session.statements[0]
+
+
+def test_text_only_search_sorts_without_a_distance():
+    locations = [
+        make_row(id=1, parent_id=None, level='country', normalized_name='india'),
+        make_row(id=2, parent_id=1, level='state', normalized_name='kerala'),
+    ]
+    session = RecordingSession(results=[locations, [property_row(1, True, 0.0)]])
+    repo = HomePageRepositoryImpl(session)
+
+    properties = asyncio.run(repo.search_properties(PropertySearchQueryEntity(destination='Kerala, India')))
+
+    assert [prop.id for prop in properties] == [1]
+    assert 'property_search_doc.state_location_id' in session.statements[1]
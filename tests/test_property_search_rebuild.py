@@ -0,0 +1,28 @@
+import asyncio
+from conftest import RecordingSession
+from app.infrastructure.redis.property_search_cache import GLOBAL_CELL, cell_for_point
+from app.infrastructure.repositories.property_repo_impl import PropertyRepoImpl
+
+
+class SearchVersions:
+    def __init__(self):
+        self.bumped = []
+
+    async def bump_property_search_versions(self, cells):
+        self.bumped.extend(cells)
+
+
+def test_rebuild_invalidates_searches_around_old_and_new_documents():
+    session = RecordingSession(results=[
+        [(9.98, 76.28)],       # documents being replaced
+        [], [],                # delete and insert
+        [(12.97, 77.59)],      # rebuilt documents
+        [], [], [],            # centroid updates
+        [1]                    # count
+    ])
+    versions = SearchVersions()
+
+    count = asyncio.run(PropertyRepoImpl(session, versions).rebuild_property_search_docs())
+
+    assert count == 1
+    assert versions.bumped == [GLOBAL_CELL, cell_for_point(9.98, 76.28), cell_for_point(12.97, 77.59)]
@@ -0,0 +1,55 @@
+import asyncio
+from types import SimpleNamespace
+from app.core.entities import UserRolesAndPermissionsEntity
+from app.core.route_protection_validations.route_protection_dependencies import get_request_roles_permissions
+from app.infrastructure.redis.redis_client import RedisClient
+
+TOKEN_ROLES = dict(is_traveller=True, is_guide=True, is_host=False, is_admin=False, is_active=True, is_guide_blocked=False)
+
+
+class StoredKeys:
+    '''The GET command of a Redis connection, over a dict of the keys it holds'''
+    def __init__(self, keys: dict):
+        self.keys = keys
+
+    async def get(self, key):
+        return self.keys.get(key)
+
+
+def redis_with_keys(keys: dict)->RedisClient:
+    redis_client = RedisClient(redis_settings=None)
+    redis_client._client = StoredKeys(keys)
+    return redis_client
+
+
+class DatabaseRoles:
+    '''Roles as they are now, the guide was blocked after the token was issued'''
+    def __init__(self):
+        self.lookups = 0
+
+    async def get_user_roles_and_permissions(self, user_id):
+        self.lookups += 1
+        return UserRolesAndPermissionsEntity(**{**TOKEN_ROLES, 'is_guide_blocked': True})
+
+
+def request_with_claims(authz_version: int):
+    return SimpleNamespace(state=SimpleNamespace(token_payload={'roles': TOKEN_ROLES, 'authz_version': authz_version}))
+
+
+def authorize(keys: dict):
+    database = DatabaseRoles()
+    roles = asyncio.run(get_request_roles_permissions(request_with_claims(0), '7', database, redis_with_keys(keys)))
+    return roles, database.lookups
+
+
+def test_current_token_claims_are_trusted():
+    roles, lookups = authorize({'authz_version:7': '0'})
+    assert roles.is_guide_blocked is False
+    assert lookups == 0
+
+
+def test_missing_authz_version_falls_back_to_the_database():
+    # the version key is gone after a Redis flush or eviction, the token's version 0 must not match it
+    roles, lookups = authorize({})
+    assert roles.is_guide_blocked is True
+    assert lookups == 1
@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+from sqlalchemy.exc import OperationalError
+from app.api.schemas import UserRegisterSchema
+from app.core.exceptions import PasswordHashingBusyError
+from app.core.use_cases import SignUpUseCases
+
+SIGNUP = dict(firstName='Asha', lastName='Nair', phoneNumber='9876543210', email='asha@example.com', password='Str0ng!Pass')
+
+
+class ClaimedSignups:
+    '''The claimed signup commands of RedisClient, recording what happened to the claim'''
+    def __init__(self):
+        self.restored = []
+        self.deleted = []
+
+    async def restore_claimed_signup(self, email):
+        self.restored.append(email)
+        return True
+
+    async def delete_claimed_signup(self, email):
+        self.deleted.append(email)
+
+
+class UserRepoFailingWith:
+    '''create_user raising the given error, or returning the given result'''
+    def __init__(self, error: Exception | None = None, created: bool = True):
+        self.error = error
+        self.created = created
+
+    async def create_user(self, user_data):
+        if self.error is not None:
+            raise self.error
+        return self.created
+
+
+@pytest.mark.parametrize('error', [
+    PasswordHashingBusyError("Too many password checks in progress, please try again shortly"),
+    OperationalError('INSERT INTO users', {}, ConnectionError('connection reset')),
+])
+def test_signup_is_handed_back_when_creating_the_user_fails(error):
+    signups = ClaimedSignups()
+    use_case = SignUpUseCases(UserRepoFailingWith(error), signups, email_repo=None)
+
+    with pytest.raises(type(error)):
+        asyncio.run(use_case.create_user(UserRegisterSchema(**SIGNUP)))
+
+    assert signups.restored == [SIGNUP['email']]
+    assert signups.deleted == []
+
+
+@pytest.mark.parametrize('created', [True, False])
+def test_claimed_signup_is_dropped_once_the_user_exists(created):
+    signups = ClaimedSignups()
+    use_case = SignUpUseCases(UserRepoFailingWith(created=created), signups, email_repo=None)
+
+    assert asyncio.run(use_case.create_user(UserRegisterSchema(**SIGNUP))) is created
+    assert signups.restored == []
+    assert signups.deleted == [SIGNUP['email']]
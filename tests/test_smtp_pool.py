@@ -0,0 +1,167 @@
+'''SMTP session pool against a local aiosmtpd server with STARTTLS and AUTH, like the real mail provider.
+
+Under pytest a short run checks the pool reuses its session; run the module directly to compare sending every OTP
+mail over a fresh session, as the email worker did before the pool, with sending over pooled sessions:
+
+    PYTHONPATH=. python tests/test_smtp_pool.py 200
+'''
+import datetime
+import smtplib
+import socket
+import ssl
+import sys
+import tempfile
+import time
+from email.message import EmailMessage
+import pytest
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from app.infrastructure.smtp_pool import SMTPConnectionPool
+
+USERNAME = 'hopinn'
+PASSWORD = 'hopinn'
+REFUSED_ADDRESS = 'nobody@hopinn.test'
+
+
+def self_signed_tls_context()->ssl.SSLContext:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, '127.0.0.1')])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(key.public_key())
+        .serial_number(x509.random_serial_number()).not_valid_before(now).not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    with tempfile.NamedTemporaryFile(suffix='.pem') as cert_file, tempfile.NamedTemporaryFile(suffix='.pem') as key_file:
+        cert_file.write(certificate.public_bytes(serialization.Encoding.PEM))
+        key_file.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()))
+        cert_file.flush()
+        key_file.flush()
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_file.name, key_file.name)
+    return context
+
+
+class MailServer:
+    '''Accepts mail for every address but REFUSED_ADDRESS, counting logins and delivered messages'''
+    def __init__(self):
+        self.logins = 0
+        self.delivered = 0
+
+    def authenticate(self, server, session, envelope, mechanism, auth_data):
+        self.logins += 1
+        return AuthResult(success=auth_data.login == USERNAME.encode() and auth_data.password == PASSWORD.encode())
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address == REFUSED_ADDRESS:
+            return '550 5.1.1 No such user'
+        envelope.rcpt_tos.append(address)
+        return '250 OK'
+
+    async def handle_DATA(self, server, session, envelope):
+        self.delivered += 1
+        return '250 OK'
+
+
+def free_port()->int:
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def start_server()->tuple[Controller, MailServer]:
+    mail_server = MailServer()
+    controller = Controller(
+        mail_server, hostname='127.0.0.1', port=free_port(), tls_context=self_signed_tls_context(),
+        require_starttls=True, authenticator=mail_server.authenticate, auth_require_tls=True
+    )
+    controller.start()
+    return controller, mail_server
+
+
+def otp_mail(address: str)->EmailMessage:
+    msg = EmailMessage()
+    msg.set_content("Your otp: 123456")
+    msg['Subject'] = "Verification Code for signing up to HopInn"
+    msg['From'] = 'noreply@hopinn.test'
+    msg['To'] = address
+    return msg
+
+
+def new_pool(controller: Controller)->SMTPConnectionPool:
+    return SMTPConnectionPool(
+        controller.hostname, controller.port, USERNAME, PASSWORD, max_size=2, max_idle_seconds=60, timeout=5
+    )
+
+
+def send_over_new_session(controller: Controller, msg: EmailMessage)->None:
+    '''How SMTPEmail.send delivered every mail before the pool'''
+    with smtplib.SMTP(controller.hostname, controller.port, timeout=5) as server:
+        server.starttls()
+        server.login(USERNAME, PASSWORD)
+        server.send_message(msg)
+
+
+@pytest.fixture
+def mail_server():
+    controller, mail_server = start_server()
+    yield controller, mail_server
+    controller.stop()
+
+
+def test_pooled_session_is_reused_across_mails(mail_server):
+    controller, server = mail_server
+    pool = new_pool(controller)
+    for number in range(3):
+        pool.send_messages([otp_mail(f'traveller{number}@hopinn.test')])
+    pool.close()
+
+    assert server.delivered == 3
+    assert server.logins == 1
+
+
+def test_refused_recipient_keeps_the_session(mail_server):
+    controller, server = mail_server
+    pool = new_pool(controller)
+
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        pool.send_messages([otp_mail(REFUSED_ADDRESS)])
+    pool.send_messages([otp_mail('traveller@hopinn.test')])
+    pool.close()
+
+    assert server.delivered == 1
+    assert server.logins == 1
+
+
+def run_benchmark(mails: int)->dict:
+    controller, _ = start_server()
+    try:
+        started = time.perf_counter()
+        for number in range(mails):
+            send_over_new_session(controller, otp_mail(f'traveller{number}@hopinn.test'))
+        new_session_ms = (time.perf_counter() - started) / mails * 1000
+
+        pool = new_pool(controller)
+        started = time.perf_counter()
+        for number in range(mails):
+            pool.send_messages([otp_mail(f'traveller{number}@hopinn.test')])
+        pooled_ms = (time.perf_counter() - started) / mails * 1000
+        pool.close()
+    finally:
+        controller.stop()
+    return {'session per mail': new_session_ms, 'pooled session': pooled_ms}
+
+
+def test_benchmark_runs():
+    timings = run_benchmark(mails=5)
+    assert all(milliseconds > 0 for milliseconds in timings.values())
+
+
+if __name__ == '__main__':
+    mails = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    for name, milliseconds in run_benchmark(mails).items():
+        print(f"{name:<20}{milliseconds:8.2f} ms/mail")
@@ -0,0 +1,58 @@
+import asyncio
+from contextlib import contextmanager
+from types import SimpleNamespace
+from app.infrastructure.task_queues import outbox
+from app.infrastructure.task_queues.outbox import TaskOutbox
+
+
+class FlakyBroker:
+    '''Celery task stand-in whose broker refuses the given publish calls, counted from 1'''
+    def __init__(self, failing_calls):
+        self.failing_calls = set(failing_calls)
+        self.calls = 0
+        self.published = []
+        self.app = SimpleNamespace(producer_or_acquire=self.producer_or_acquire)
+
+    @contextmanager
+    def producer_or_acquire(self):
+        yield object()
+
+    def apply_async(self, args, kwargs, producer):
+        self.calls += 1
+        if self.calls in self.failing_calls:
+            raise ConnectionError("broker unavailable")
+        self.published.append(args)
+
+
+def publish(task: FlakyBroker, count: int)->TaskOutbox:
+    async def run():
+        task_outbox = TaskOutbox()
+        for number in range(count):
+            task_outbox.enqueue(task, number)
+        await task_outbox.stop()
+        return task_outbox
+    return asyncio.run(run())
+
+
+def test_failed_batch_is_retried_without_republishing(monkeypatch):
+    monkeypatch.setattr(outbox, 'RETRY_DELAY_SECONDS', 0.01)
+    #the second task of the batch fails twice, the first one must not be sent again
+    task = FlakyBroker(failing_calls=[2, 3])
+
+    task_outbox = publish(task, 3)
+
+    assert task.published == [(0,), (1,), (2,)]
+    assert task_outbox.metrics()['published'] == 3
+    assert task_outbox.metrics()['retries'] == 2
+    assert task_outbox.metrics()['failed'] == 0
+
+
+def test_batch_is_given_up_on_after_the_last_attempt(monkeypatch):
+    monkeypatch.setattr(outbox, 'RETRY_DELAY_SECONDS', 0.01)
+    task = FlakyBroker(failing_calls=range(1, outbox.PUBLISH_ATTEMPTS + 1))
+
+    task_outbox = publish(task, 2)
+
+    assert task.published == []
+    assert task_outbox.metrics()['failed'] == 2
+    assert task_outbox.metrics()['retries'] == outbox.PUBLISH_ATTEMPTS - 1
@@ -0,0 +1,28 @@
+import asyncio
+import json
+from app.infrastructure.redis.redis_client import RedisClient, PUBSUB_POLL_SECONDS
+
+
+class IdlePubSub:
+    '''Answers a few polls with nothing, as an idle channel does, before a revocation is published'''
+    def __init__(self, idle_polls: int):
+        self.idle_polls = idle_polls
+        self.timeouts = []
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        self.timeouts.append(timeout)
+        if len(self.timeouts) <= self.idle_polls:
+            return None
+        return {'type': 'message', 'data': json.dumps({'id': 'abc', 'exp': 1900000000})}
+
+
+def test_idle_subscription_keeps_waiting_for_revocations():
+    client = RedisClient(redis_settings=None)
+    pubsub = IdlePubSub(idle_polls=3)
+
+    async def first_revocation():
+        return await anext(client._iter_token_revocations(pubsub))
+
+    assert asyncio.run(first_revocation()) == ('abc', 1900000000.0)
+    # every read carries its own timeout, the pool's socket_timeout never applies to the subscription
+    assert pubsub.timeouts == [PUBSUB_POLL_SECONDS] * 4